@@ -0,0 +1,106 @@
+"""Microseconds per load_contract call, and on-chain getAmountsOut calls saved by the reserve cache.
+
+"reparse" repeats what load_contract did before the registry: read and parse the ABI file and
+build a new contract class on every call. "registry" is load_contract as it is now.
+
+The quote half prices LineaSwap swaps over several blocks against a local mock node, once
+through getAmountsOut on every quote and once from the reserve cache, and counts what the
+node was asked for.
+
+    python bench/abi_registry.py [calls per ABI] [quotes per block] [blocks]
+"""
+import json
+import sys
+from time import perf_counter
+
+from asyncio import (
+    sleep,
+    run,
+)
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+from mock_rpc import (
+    use_mock,
+    MockRPC,
+)
+
+from src.modules.swaps.linea_swap.utils import transaction_data
+from src.modules.swaps.tokens import (
+    routers,
+    tokens,
+)
+from src.utils.reserves import reserve_cache
+from src.utils.chains import LINEA
+
+from src.utils.data import (
+    ABI_FRAGMENTS,
+    load_contract,
+)
+
+
+async def load_contract_reparsing(address: str, web3: AsyncWeb3, abi_name: str):
+    with open(f'./assets/abi/{abi_name}.json') as f:
+        abi = json.load(f)
+    return web3.eth.contract(address=web3.to_checksum_address(address), abi=abi)
+
+
+async def time_calls(load, abi_name: str, calls: int) -> float:
+    start = perf_counter()
+    for _ in range(calls):
+        await load(routers['LineaSwap'], LINEA.w3, abi_name)
+    return (perf_counter() - start) / calls * 1e6
+
+
+async def bench_load_contract(calls: int) -> None:
+    print(f'load_contract, {calls} calls per ABI')
+    print('abi          | reparse µs | registry µs | speedup')
+    for abi_name in ABI_FRAGMENTS:
+        before = await time_calls(load_contract_reparsing, abi_name, calls)
+        after = await time_calls(load_contract, abi_name, calls)
+        print(f'{abi_name:12} | {before:10.1f} | {after:11.2f} | {before / after:6.0f}x')
+
+
+async def quote(node: MockRPC, local_quotes: bool, quotes: int, blocks: int) -> None:
+    transaction_data.LOCAL_QUOTES = local_quotes
+    contract = await load_contract(routers['LineaSwap'], LINEA.w3, 'linea_swap')
+    node.reset()
+    start = perf_counter()
+    for block in range(blocks):
+        for amount in range(1, quotes + 1):
+            await transaction_data.get_swap_amount_out(contract, amount * 10 ** 15, tokens['ETH'], tokens['BUSD'])
+        if block + 1 < blocks:
+            await sleep(LINEA.block_time)
+    elapsed = perf_counter() - start - (blocks - 1) * LINEA.block_time
+    print(f'{"reserve cache" if local_quotes else "getAmountsOut":13} | {quotes * blocks:6} | '
+          f'{node.selectors["getAmountsOut"]:13} | {node.selectors["getReserves"]:11} | {node.requests:13} | '
+          f'{elapsed / (quotes * blocks) * 1e6:8.0f}')
+
+
+async def bench_quotes(node: MockRPC, quotes: int, blocks: int) -> None:
+    await reserve_cache.discover()
+
+    print(f'\nLineaSwap ETH => BUSD quotes, {quotes} per block over {blocks} blocks, 20ms per request')
+    print('quoted from   | quotes | getAmountsOut | getReserves | HTTP requests | µs/quote')
+    await quote(node, False, quotes, blocks)
+    await quote(node, True, quotes, blocks)
+    print(f'reserve cache | {reserve_cache}')
+
+
+async def main(calls: int, quotes: int, blocks: int) -> None:
+    logger.remove()
+    logger.add(sys.stderr, level='ERROR')
+    node = MockRPC(delay=0.02, block_time=LINEA.block_time)
+    # LINEA.w3 is built on first use, so it has to point at the mock before anything touches it
+    use_mock(await node.start())
+    await bench_load_contract(calls)
+    await bench_quotes(node, quotes, blocks)
+    await LINEA.close()
+    await node.stop()
+
+
+if __name__ == '__main__':
+    run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+             int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+             int(sys.argv[3]) if len(sys.argv) > 3 else 3))
@@ -0,0 +1,64 @@
+"""Wall-clock scaling of the wallet scheduler with NUM_THREADS against a local mock node.
+
+Every wallet runs the configured LineaSwap swap once per row. With the AsyncWeb3 path the
+RPC calls of NUM_THREADS wallets are in flight at once, so the wall clock should fall roughly
+with NUM_THREADS until the block time dominates.
+
+    python bench/async_rpc.py [wallets] [latency ms]
+"""
+import sys
+from time import perf_counter
+
+from asyncio import run
+
+from loguru import logger
+from tqdm import tqdm
+
+from mock_rpc import (
+    wallet_keys,
+    use_mock,
+    MockRPC,
+)
+
+from src.utils.rpc import ConnectionStats
+from src.utils.scheduler import WalletScheduler
+from src.utils.chains import LINEA
+
+THREADS = (1, 5, 10, 25, 50)
+
+
+async def run_wallets(keys: list[str], num_threads: int) -> float:
+    LINEA.pool.stats = ConnectionStats()
+    with tqdm(total=len(keys), disable=True) as pbar:
+        scheduler = WalletScheduler(keys, ['linea_swap'], pbar, num_threads, 0, 0, False, False)
+        start = perf_counter()
+        await scheduler.run()
+        return perf_counter() - start
+
+
+async def main(wallets: int, latency: float) -> None:
+    logger.remove()
+    logger.add(sys.stderr, level='ERROR')
+    node = MockRPC(delay=latency)
+    use_mock(await node.start())
+    keys = wallet_keys(wallets)
+    # Discovery, token metadata and gas profiles are warmed first so every row measures the same work
+    await run_wallets(keys, wallets)
+
+    print(f'{wallets} wallets, {latency * 1000:.0f}ms per request')
+    print('threads | wall clock | speedup | peak requests in flight | connection reuse')
+    baseline = None
+    for num_threads in (threads for threads in THREADS if threads <= wallets):
+        node.reset()
+        elapsed = await run_wallets(keys, num_threads)
+        baseline = baseline or elapsed
+        print(f'{num_threads:7} | {elapsed:9.2f}s | {baseline / elapsed:6.1f}x | {node.peak_in_flight:23} | '
+              f'{LINEA.stats.reuse_ratio:.0%} ({LINEA.stats})')
+
+    await LINEA.close()
+    await node.stop()
+
+
+if __name__ == '__main__':
+    run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+             float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.05))
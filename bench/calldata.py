@@ -0,0 +1,145 @@
+"""Swap calldata builds per second per DEX, and the RPC traffic of a batched portfolio snapshot.
+
+"encodeABI" is web3's ABI dispatch, the calldata step of contract.functions.X(...).build_transaction
+that the encoders used before the templates. Every template build is checked against it first.
+
+The snapshot half runs take_snapshot for the wallets against a local mock node, once with one
+eth_call per balance and allowance and once through Multicall3 in batched requests.
+
+    python bench/calldata.py [builds per DEX] [wallets]
+"""
+import json
+import sys
+from time import perf_counter
+from typing import Callable
+
+from asyncio import (
+    gather,
+    run,
+)
+
+from eth_account import Account
+from loguru import logger
+from web3 import Web3
+
+from mock_rpc import (
+    wallet_keys,
+    use_mock,
+    MockRPC,
+)
+
+from src.modules.swaps.linea_swap.utils import transaction_data as linea_swap
+from src.modules.swaps.echodex.utils import transaction_data as echo_dex
+from src.modules.swaps.horizondex.utils import transaction_data as horizon_dex
+from src.modules.swaps.sync_swap.utils import transaction_data as sync_swap
+from src.modules.swaps.tokens import tokens
+from src.utils.chains import LINEA
+
+from src.utils import portfolio
+
+from src.utils.multicall import (
+    CALLS_PER_MULTICALL,
+    MULTICALLS_PER_BATCH,
+    multicall,
+)
+
+ETH, BUSD = tokens['ETH'], tokens['BUSD']
+RECIPIENT = Web3.to_checksum_address('0x' + '42' * 20)
+POOL = Web3.to_checksum_address('0x5ec5b1e9b1bd5198343abb6e55fb695d2f7bb308')
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+
+
+def contract(abi_name: str):
+    with open(f'./assets/abi/{abi_name}.json') as f:
+        return Web3().eth.contract(abi=json.load(f))
+
+
+def sync_swap_data(router, amount: int, amount_out_min: int, deadline: int) -> str:
+    swap_data = router.w3.codec.encode(['address', 'address', 'uint8'], [BUSD, RECIPIENT, 1])
+    return router.encodeABI('swap', [[([(POOL, swap_data, ZERO_ADDRESS, b'')], BUSD, amount)],
+                                     amount_out_min, deadline])
+
+
+def encoders() -> dict[str, tuple[Callable[..., bytes], Callable[..., str]]]:
+    linea_router, echo_router = contract('linea_swap'), contract('echo_dex')
+    horizon_router, sync_router = contract('horizon_dex'), contract('syncswap')
+    return {
+        'LineaSwap': (
+            lambda amount, amount_out_min, deadline: linea_swap.swap_template('BUSD', [BUSD, ETH]).encode(
+                amount=amount, amount_out_min=amount_out_min, to=RECIPIENT, deadline=deadline),
+            lambda amount, amount_out_min, deadline: linea_router.encodeABI('swapExactTokensForETH', [
+                amount, amount_out_min, [BUSD, ETH], RECIPIENT, deadline]),
+        ),
+        'EchoDex': (
+            lambda amount, amount_out_min, deadline: echo_dex.swap_template('BUSD', [BUSD, ETH]).encode(
+                amount=amount, amount_out_min=amount_out_min, to=RECIPIENT, deadline=deadline),
+            lambda amount, amount_out_min, deadline: echo_router.encodeABI('swapExactTokensForETH', [
+                amount, amount_out_min, [BUSD, ETH], RECIPIENT, deadline]),
+        ),
+        'HorizonDex': (
+            lambda amount, amount_out_min, deadline: horizon_dex.swap_template('ETH', ETH, BUSD).encode(
+                recipient=RECIPIENT, deadline=deadline, amount=amount, amount_out_min=amount_out_min),
+            lambda amount, amount_out_min, deadline: horizon_router.encodeABI('swapExactInputSingle', [
+                (ETH, BUSD, 300, RECIPIENT, deadline, amount, amount_out_min, 0)]),
+        ),
+        'SyncSwap': (
+            lambda amount, amount_out_min, deadline: sync_swap.swap_template('BUSD', BUSD, ETH, POOL).encode(
+                recipient=RECIPIENT, amount=amount, amount_out_min=amount_out_min, deadline=deadline),
+            lambda amount, amount_out_min, deadline: sync_swap_data(sync_router, amount, amount_out_min, deadline),
+        ),
+    }
+
+
+def builds_per_second(build: Callable, builds: int) -> float:
+    start = perf_counter()
+    for amount in range(1, builds + 1):
+        build(amount * 10 ** 12, amount * 10 ** 9, 1_700_000_000 + amount)
+    return builds / (perf_counter() - start)
+
+
+def bench_calldata(builds: int) -> None:
+    print(f'swap calldata, {builds} builds per DEX')
+    print('dex        | encodeABI/s | template/s | speedup')
+    for dex, (template, encode_abi) in encoders().items():
+        assert '0x' + template(10 ** 18, 10 ** 15, 1_700_000_000).hex() == encode_abi(10 ** 18, 10 ** 15,
+                                                                                    1_700_000_000), dex
+        before = builds_per_second(encode_abi, builds)
+        after = builds_per_second(template, builds)
+        print(f'{dex:10} | {before:11.0f} | {after:10.0f} | {after / before:6.1f}x')
+
+
+async def call_one_by_one(web3, calls: list[tuple[str, bytes]]) -> list[bytes | None]:
+    return list(await gather(*[web3.eth.call({'to': Web3.to_checksum_address(target), 'data': '0x' + data.hex()})
+                               for target, data in calls]))
+
+
+async def bench_snapshot(node: MockRPC, wallets: int) -> None:
+    addresses = [Account.from_key(key).address for key in wallet_keys(wallets)]
+    print(f'\nportfolio snapshot of {wallets} wallets, 20ms per request, {CALLS_PER_MULTICALL} calls per '
+          f'multicall, {MULTICALLS_PER_BATCH} multicalls per batch')
+    print('reads               | values | HTTP requests | eth_calls | wall clock')
+    for name, aggregate in (('one eth_call each', call_one_by_one), ('multicall batches', multicall)):
+        portfolio.multicall = aggregate
+        node.reset()
+        start = perf_counter()
+        await portfolio.take_snapshot(addresses)
+        elapsed = perf_counter() - start
+        values = sum(count for function, count in node.selectors.items() if function != 'aggregate3')
+        print(f'{name:19} | {values:6} | {node.requests:13} | {node.methods["eth_call"]:9} | {elapsed:9.2f}s')
+
+
+async def main(builds: int, wallets: int) -> None:
+    logger.remove()
+    logger.add(sys.stderr, level='ERROR')
+    bench_calldata(builds)
+
+    node = MockRPC(delay=0.02)
+    use_mock(await node.start())
+    await bench_snapshot(node, wallets)
+    await LINEA.close()
+    await node.stop()
+
+
+if __name__ == '__main__':
+    run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+             int(sys.argv[2]) if len(sys.argv) > 2 else 50))
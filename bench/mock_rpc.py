@@ -0,0 +1,225 @@
+import os
+import sys
+from collections import Counter
+from time import time
+from typing import Any
+
+from asyncio import sleep
+
+from aiohttp import web
+from eth_abi import encode, decode
+from eth_utils import (
+    function_signature_to_4byte_selector,
+    keccak,
+)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.rpc import EndpointPool  # noqa: E402
+
+
+def selector(signature: str) -> str:
+    return '0x' + function_signature_to_4byte_selector(signature).hex()
+
+
+AGGREGATE3 = selector('aggregate3((address,bool,bytes)[])')
+GET_AMOUNTS_OUT = selector('getAmountsOut(uint256,address[])')
+GET_RESERVES = selector('getReserves()')
+SELECTOR_NAMES = {
+    AGGREGATE3: 'aggregate3',
+    GET_AMOUNTS_OUT: 'getAmountsOut',
+    GET_RESERVES: 'getReserves',
+    selector('balanceOf(address)'): 'balanceOf',
+    selector('allowance(address,address)'): 'allowance',
+    selector('factory()'): 'factory',
+    selector('getPair(address,address)'): 'getPair',
+    selector('getPool(address,address)'): 'getPool',
+    selector('decimals()'): 'decimals',
+    selector('symbol()'): 'symbol',
+}
+
+RESERVE_IN = 10 ** 21
+RESERVE_OUT = 2 * 10 ** 24
+
+
+def word(types: list[str], values: list) -> str:
+    return '0x' + encode(types, values).hex()
+
+
+def pair_reserves(token_a: str, token_b: str) -> tuple[int, int]:
+    return (RESERVE_IN, RESERVE_OUT) if token_a.lower() < token_b.lower() else (RESERVE_OUT, RESERVE_IN)
+
+
+class MockRPC:
+    """Local Linea JSON-RPC node answering the calls the modules make, with a fixed latency per request."""
+
+    def __init__(self, delay: float = 0.0, block_time: float = 0.5, chain_id: int = 59144) -> None:
+        self.delay = delay
+        self.block_time = block_time
+        self.chain_id = chain_id
+        self.started = time()
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.methods = Counter()
+        self.selectors = Counter()
+        self.sent: dict[str, int] = {}
+        self.runner: web.AppRunner | None = None
+        self.uri = ''
+
+    @property
+    def calls(self) -> int:
+        return sum(self.methods.values())
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.peak_in_flight = 0
+        self.methods.clear()
+        self.selectors.clear()
+
+    def block_number(self) -> int:
+        return 100 + int((time() - self.started) / self.block_time)
+
+    def block(self, number: int) -> dict:
+        zero = '0x' + '00' * 32
+        return {'number': hex(number), 'hash': '0x' + keccak(text=str(number)).hex(), 'parentHash': zero,
+                'timestamp': hex(int(time())), 'baseFeePerGas': hex(7), 'gasLimit': hex(30_000_000),
+                'gasUsed': hex(0), 'miner': '0x' + '00' * 20, 'extraData': '0x' + '00' * 97, 'transactions': [],
+                'logsBloom': '0x' + '00' * 256, 'difficulty': '0x2', 'nonce': '0x' + '00' * 8,
+                'sha3Uncles': zero, 'stateRoot': zero, 'receiptsRoot': zero, 'transactionsRoot': zero,
+                'size': '0x1', 'totalDifficulty': '0x1', 'uncles': [], 'mixHash': zero}
+
+    def call(self, data: str) -> str:
+        function = data[:10]
+        self.selectors[SELECTOR_NAMES.get(function, function)] += 1
+        args = bytes.fromhex(data[10:])
+        if function == AGGREGATE3:
+            results = [(True, bytes.fromhex(self.call('0x' + call_data.hex())[2:]))
+                       for _, _, call_data in decode(['(address,bool,bytes)[]'], args)[0]]
+            return word(['(bool,bytes)[]'], [results])
+        if function == GET_AMOUNTS_OUT:
+            amount, path = decode(['uint256', 'address[]'], args)
+            amounts = [amount]
+            for token_a, token_b in zip(path, path[1:]):
+                reserve_in, reserve_out = pair_reserves(token_a, token_b)
+                amount_in_with_fee = amounts[-1] * 997
+                amounts.append(amount_in_with_fee * reserve_out // (reserve_in * 1000 + amount_in_with_fee))
+            return word(['uint256[]'], [amounts])
+        if function == GET_RESERVES:
+            return word(['uint112', 'uint112', 'uint32'], [RESERVE_IN, RESERVE_OUT, 0])
+        name = SELECTOR_NAMES.get(function)
+        if name in ('getPair', 'getPool', 'factory'):
+            return word(['address'], ['0x' + keccak(bytes.fromhex(data[2:]))[:20].hex()])
+        if name == 'balanceOf':
+            return word(['uint256'], [10 ** 21])
+        if name == 'allowance':
+            return word(['uint256'], [2 ** 255])
+        if name == 'decimals':
+            return word(['uint8'], [18])
+        if name == 'symbol':
+            return word(['string'], ['TKN'])
+        return word(['uint256'], [0])
+
+    def result(self, method: str, params: list) -> Any:
+        if method == 'eth_chainId':
+            return hex(self.chain_id)
+        if method == 'net_version':
+            return str(self.chain_id)
+        if method == 'eth_call':
+            return self.call(params[0].get('data') or params[0].get('input'))
+        if method == 'eth_blockNumber':
+            return hex(self.block_number())
+        if method == 'eth_getBlockByNumber':
+            number = self.block_number() if params[0] in ('latest', 'pending') else int(params[0], 16)
+            return self.block(number)
+        if method == 'eth_gasPrice':
+            return hex(10 ** 9)
+        if method == 'eth_maxPriorityFeePerGas':
+            return hex(10 ** 8)
+        if method == 'eth_feeHistory':
+            count = int(params[0], 16) if isinstance(params[0], str) else params[0]
+            return {'oldestBlock': hex(self.block_number() - count), 'baseFeePerGas': [hex(7)] * (count + 1),
+                    'gasUsedRatio': [0.5] * count, 'reward': [[hex(10 ** 8)] * len(params[2])] * count}
+        if method == 'eth_estimateGas':
+            return hex(150_000)
+        if method == 'linea_estimateGas':
+            return {'gasLimit': hex(140_000), 'baseFeePerGas': hex(7), 'priorityFeePerGas': hex(5 * 10 ** 7)}
+        if method == 'eth_getTransactionCount':
+            return hex(0)
+        if method == 'eth_getBalance':
+            return hex(10 ** 20)
+        if method == 'eth_sendRawTransaction':
+            tx_hash = '0x' + keccak(hexstr=params[0]).hex()
+            self.sent[tx_hash] = self.block_number()
+            return tx_hash
+        if method == 'eth_getTransactionReceipt':
+            sent_block = self.sent.get(params[0])
+            if sent_block is None or self.block_number() <= sent_block:
+                return None
+            return {'transactionHash': params[0], 'blockNumber': hex(sent_block + 1), 'blockHash': '0x' + '11' * 32,
+                    'status': '0x1', 'gasUsed': hex(120_000), 'cumulativeGasUsed': hex(120_000), 'logs': [],
+                    'from': '0x' + '00' * 20, 'to': '0x' + '00' * 20, 'transactionIndex': '0x0',
+                    'contractAddress': None, 'logsBloom': '0x' + '00' * 256, 'effectiveGasPrice': hex(10 ** 9),
+                    'type': '0x2'}
+        if method == 'eth_getTransactionByHash':
+            return None
+        raise KeyError(method)
+
+    def answer(self, request: dict) -> dict:
+        self.methods[request['method']] += 1
+        try:
+            return {'jsonrpc': '2.0', 'id': request['id'],
+                    'result': self.result(request['method'], request.get('params', []))}
+        except KeyError:
+            return {'jsonrpc': '2.0', 'id': request['id'],
+                    'error': {'code': -32601, 'message': f'the method {request["method"]} does not exist'}}
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            body = await request.json()
+            if self.delay:
+                await sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if isinstance(body, list):
+            return web.json_response([self.answer(call) for call in body])
+        return web.json_response(self.answer(body))
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post('/', self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        host, port = self.runner.addresses[0][:2]
+        self.uri = f'http://{host}:{port}/'
+        return self.uri
+
+    async def stop(self) -> None:
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+
+def use_mock(uri: str) -> None:
+    """Point every chain at the mock node and keep the benchmarks away from the persistent caches."""
+    from src.utils import token_registry
+    from src.utils.allowances import allowance_cache
+    from src.utils.gas_profiles import gas_profiles
+    from src.utils.reserves import syncswap_pools
+    from src.utils.chains import chain_mapping
+
+    for chain in chain_mapping.values():
+        chain.endpoints = EndpointPool([uri])
+        chain._w3 = None
+    token_registry.TOKEN_CACHE_PATH = ''
+    allowance_cache.path = ''
+    gas_profiles.path = ''
+    syncswap_pools.path = ''
+
+
+def wallet_keys(count: int) -> list[str]:
+    return [f'0x{index:064x}' for index in range(1, count + 1)]
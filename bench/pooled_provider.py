@@ -0,0 +1,92 @@
+"""Connections opened per wallet run and RPC round trips per transaction, against a local mock node.
+
+"per run" gives every wallet x module run its own connection pool, as the per-instance
+Web3.HTTPProvider did. "shared" borrows the one pool LINEA owns, so a connection is opened
+only the first time and then reused across runs. Runs are sequential here so each one owns
+the provider's pool while it runs.
+
+    python bench/pooled_provider.py [runs] [threads for the round trip count]
+"""
+import sys
+
+from asyncio import run
+
+from loguru import logger
+from tqdm import tqdm
+
+from mock_rpc import (
+    wallet_keys,
+    use_mock,
+    MockRPC,
+)
+
+from src.utils.scheduler import WalletScheduler
+from src.utils.chains import LINEA
+
+from src.utils.rpc import (
+    ConnectionStats,
+    ConnectionPool,
+    round_trip_stats,
+)
+
+
+async def run_wallets(keys: list[str], num_threads: int, fresh_pools: bool = False) -> ConnectionStats:
+    provider = LINEA.w3.provider
+    shared_pool = provider.pool
+    shared_pool.stats = stats = ConnectionStats()
+    scheduler = WalletScheduler(keys, ['linea_swap'], tqdm(disable=True), num_threads, 0, 0, False, False)
+    run_module = scheduler.run_module
+
+    async def run_module_with_own_pool(address: str, private_key: str, pattern: str) -> bool:
+        provider.pool = pool = ConnectionPool(shared_pool.pool_size, shared_pool.limit_per_host)
+        try:
+            return await run_module(address, private_key, pattern)
+        finally:
+            await pool.close()
+            provider.pool = shared_pool
+            stats.created += pool.stats.created
+            stats.reused += pool.stats.reused
+            stats.requests += pool.stats.requests
+
+    if fresh_pools:
+        scheduler.run_module = run_module_with_own_pool
+    await scheduler.run()
+    return stats
+
+
+async def main(runs: int, num_threads: int) -> None:
+    logger.remove()
+    logger.add(sys.stderr, level='ERROR')
+    node = MockRPC()
+    use_mock(await node.start())
+    keys = wallet_keys(runs)
+    await run_wallets(keys, num_threads)
+
+    print(f'{runs} LineaSwap runs')
+    print('pool    | connections opened | per run | reused | requests')
+    for name, fresh_pools in (('per run', True), ('shared', False)):
+        await LINEA.close()
+        stats = await run_wallets(keys, 1, fresh_pools)
+        print(f'{name:7} | {stats.created:18} | {stats.created / runs:7.2f} | {stats.reuse_ratio:6.0%} | '
+              f'{stats.requests}')
+
+    round_trip_stats.round_trips.clear()
+    round_trip_stats.transactions.clear()
+    node.reset()
+    await run_wallets(keys, num_threads)
+    sent = node.methods['eth_sendRawTransaction']
+    print(f'\nround trips per transaction, {num_threads} runs at a time')
+    for line in round_trip_stats.report():
+        print(f'client | {line}')
+    print(f'node   | HTTP requests: {node.requests}, JSON-RPC calls: {node.calls}, transactions: {sent}, '
+          f'HTTP requests per tx: {node.requests / sent:.1f}')
+    for method, calls in node.methods.most_common():
+        print(f'       | {method}: {calls}')
+
+    await LINEA.close()
+    await node.stop()
+
+
+if __name__ == '__main__':
+    run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+             int(sys.argv[2]) if len(sys.argv) > 2 else 10))
@@ -5,6 +5,19 @@ SLIPPAGE = 0.03
 MIN_PAUSE = 60
 MAX_PAUSE = 120
 
+# --- RPC --- #
+RPC_POOL_SIZE = 100
+RPC_LIMIT_PER_HOST = 50
+RPC_HEDGE_READS = True
+PREFLIGHT_SNAPSHOT = True
+JOURNAL_PATH = 'journal.db'  # '' to disable resume
+SYNCSWAP_POOLS_PATH = 'syncswap_pools.json'  # '' to look pools up on every run
+TOKEN_CACHE_PATH = 'token_metadata.json'  # '' to fetch decimals and symbols on every run
+ALLOWANCE_CACHE_PATH = 'allowances.json'  # '' to check allowances on-chain on every run
+GAS_PROFILE_PATH = 'gas_profiles.json'  # '' to estimate gas for every transaction
+LOCAL_QUOTES = True
+QUOTE_VALIDATION = False  # compare local quotes with on-chain getAmountsOut
+
 # -------------------------------------Модули--------------------------------#
 
 # --- Bridges --- #
@@ -16,6 +29,7 @@ linea_swap = False
 echo_dex_swap = False
 sync_swap = False
 horizon_dex_swap = False
+best_swap = False  # routes to the venue with the best output after gas
 
 # --- Liquidity --- #
 linea_liq = False
@@ -76,6 +90,14 @@ class HorizonDexSwapConfig:
     swap_all_balance = True
 
 
+class BestSwapConfig:
+    from_token = 'BUSD'
+    to_token = 'ETH'
+    amount_from = 0.001
+    amount_to = 0.001
+    swap_all_balance = True
+
+
 # --- Liquidity --- #
 class LineaLiqConfig:
     token = 'ETH'  # ETH
@@ -104,11 +126,14 @@ class EchoDexLiqRemoveConfig:
 
 
 class SyncSwapLiqConfig:
-    token = 'ETH'  # ETH/BUSD
+    token = 'ETH'
+    token2 = 'BUSD'
     amount_from = 0.001
     amount_to = 0.001
 
 
 class SyncSwapLiqRemoveConfig:
+    token = 'ETH'
+    token2 = 'BUSD'
     remove_all = True
     removing_percentage = 0.5
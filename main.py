@@ -1,6 +1,4 @@
 from typing import Awaitable
-import random
-import copy
 
 from loguru import logger
 from tqdm import tqdm
@@ -8,13 +6,25 @@ from tqdm import tqdm
 from asyncio import (
     AbstractEventLoop,
     get_event_loop,
-    create_task,
-    Semaphore,
-    gather,
-    sleep,
 )
 
-from src.utils.mappings import module_handlers
+from src.utils.scheduler import WalletScheduler
+from src.utils.chains import close_chains
+from src.utils.portfolio import preflight
+from src.utils.journal import open_journal
+from src.utils.reserves import (
+    syncswap_pools,
+    reserve_cache,
+)
+from src.utils.allowances import allowance_cache
+from src.utils.gas_profiles import gas_profiles
+from src.utils.fees import fee_strategy
+from src.utils.executor import stage_timings
+from src.utils.retry import retry_stats
+from src.utils.supervisor import pending_supervisor
+from src.utils.routing import path_finder
+from src.utils.ticks import tick_cache
+from src.modules.swaps.best_swap.best_swap import venue_stats
 from config import *
 
 from src.utils.helper import (
@@ -23,47 +33,55 @@ from src.utils.helper import (
 )
 
 
-async def process_private_key(private_key: str, pbar: tqdm, thread_num: int, semaphore: Semaphore) -> bool:
-    tasks = []
-    if RANDOMIZE is True:
-        modules = copy.copy(active_module)
-        random.shuffle(modules)
-    else:
-        modules = active_module
-    async with semaphore:
-        for pattern in modules:
-            task = create_task(module_handlers[pattern](private_key, pbar))
-            tasks.append(task)
-            time_to_sleep = random.randint(MIN_PAUSE, MAX_PAUSE)
-            logger.info(f'Thread {thread_num}: Sleeping {time_to_sleep} seconds...')
-            await sleep(time_to_sleep)
-            await task
-        await gather(*tasks)
-    return all(task.done() for task in tasks)
-
-
-async def main(loop: AbstractEventLoop) -> None:
-    num_threads = min(NUM_THREADS, len(private_keys))
-    semaphore = Semaphore(num_threads)
-    if not RUN_FOREVER:
-        tasks = []
-        thread_num = 1
-        for private_key in private_keys:
-            task = loop.create_task(process_private_key(private_key, pbar, thread_num, semaphore))
-            tasks.append(task)
-            thread_num += 1
-        await gather(*tasks)
-        completed = {private_key: task_result for private_key, task_result in zip(private_keys, tasks)}
-        if all(completed.values()):
-            return
-    while RUN_FOREVER:
-        tasks = []
-        thread_num = 1
-        for private_key in private_keys:
-            task = loop.create_task(process_private_key(private_key, pbar, thread_num, semaphore))
-            tasks.append(task)
-            thread_num += 1
-        await gather(*tasks)
+async def main() -> None:
+    wallets = await preflight(private_keys, active_module) if PREFLIGHT_SNAPSHOT else private_keys
+    if not wallets:
+        return
+    journal = open_journal(JOURNAL_PATH)
+    scheduler = WalletScheduler(
+        private_keys=wallets,
+        modules=active_module,
+        pbar=pbar,
+        num_threads=min(NUM_THREADS, len(wallets)),
+        min_pause=MIN_PAUSE,
+        max_pause=MAX_PAUSE,
+        randomize=RANDOMIZE,
+        run_forever=RUN_FOREVER,
+        journal=journal,
+    )
+    await scheduler.run()
+    allowance_cache.flush()
+    gas_profiles.flush()
+    if reserve_cache.refreshes:
+        logger.info(f'Reserve cache | {reserve_cache}')
+    if allowance_cache.hits or allowance_cache.misses:
+        logger.info(f'Allowance cache | {allowance_cache}')
+    if fee_strategy.linea_quotes or fee_strategy.history_quotes:
+        logger.info(f'Fee strategy | {fee_strategy}')
+    for line in stage_timings.report():
+        logger.info(f'Tx stage | {line}')
+    for line in retry_stats.report():
+        logger.info(f'Tx retries | {line}')
+    if pending_supervisor.history:
+        logger.info(f'Pending supervisor | {pending_supervisor}')
+        for line in pending_supervisor.report():
+            logger.info(f'Fee bump | {line}')
+    if gas_profiles.served or gas_profiles.estimated:
+        logger.info(f'Gas profiles | {gas_profiles}')
+        for line in gas_profiles.report():
+            logger.info(f'Gas profile | {line}')
+    if path_finder.misses:
+        logger.info(f'Path finder | {path_finder}')
+    if syncswap_pools.refreshes:
+        logger.info(f'SyncSwap pools | {syncswap_pools}')
+    if tick_cache.refreshes:
+        logger.info(f'Tick cache | {tick_cache}')
+    if venue_stats.routed:
+        for line in venue_stats.report():
+            logger.info(f'Best swap | {line}')
+    if journal is not None:
+        journal.finish()
+        journal.close()
 
 
 def start_event_loop(awaitable: Awaitable[object], loop: AbstractEventLoop) -> None:
@@ -73,6 +91,7 @@ def start_event_loop(awaitable: Awaitable[object], loop: AbstractEventLoop) -> N
 if __name__ == '__main__':
     with tqdm(total=len(private_keys)) as pbar:
         async def tracked_main():
-            await main(get_event_loop())
+            await main()
+            await close_chains()
         start_event_loop(tracked_main(), get_event_loop())
         pbar.close()
@@ -1,4 +1,5 @@
 from src.modules.bridges.orbiter_bridge.utils.orbiter_limits import transfer_limit
+from src.utils.token_registry import get_registry
 from src.utils.chains import *
 from src.modules.bridges.orbiter_bridge.utils.config import (
     contract_orbiter_router,
@@ -32,7 +33,8 @@ async def check_eligibility(from_chain: str, to_chain: str, token: str, amount:
     if token.lower() == 'eth':
         amount = amount / 10 ** 18
     else:
-        amount = amount / 10 ** 6
+        token_address = contract_stable[from_chain.lower()][token.lower()]
+        amount = (await get_registry(from_chain).get(token_address)).from_wei(amount)
 
     limits = transfer_limit[from_chain.lower()][to_chain.lower()][token.lower()]
 
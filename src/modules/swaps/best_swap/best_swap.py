@@ -0,0 +1,111 @@
+from time import monotonic
+
+from asyncio import gather
+
+from loguru import logger
+
+from src.modules.swaps.horizondex.horizondex import HorizonDexSwap
+from src.modules.swaps.linea_swap.linea_swap import LineaSwap
+from src.modules.swaps.sync_swap.sync_swap import SyncSwap
+from src.modules.swaps.echodex.echodex import EchoDexSwap
+from src.utils.block_cache import get_gas_price
+from src.utils.reserves import reserve_cache
+from src.utils.base_swap import BaseSwap
+
+from src.modules.swaps.tokens import (
+    routers,
+    tokens,
+)
+
+VENUES = {
+    'LineaSwap': LineaSwap,
+    'EchoDex': EchoDexSwap,
+    'SyncSwap': SyncSwap,
+    'HorizonDex': HorizonDexSwap,
+}
+
+SWAP_GAS = {
+    'LineaSwap': 150000,
+    'EchoDex': 150000,
+    'SyncSwap': 200000,
+    'HorizonDex': 180000,
+}
+
+
+class VenueStats:
+    def __init__(self) -> None:
+        self.quotes: dict[str, list[float]] = {venue: [] for venue in VENUES}
+        self.failures = {venue: 0 for venue in VENUES}
+        self.wins = {venue: 0 for venue in VENUES}
+        self.routed = 0
+
+    def record_quote(self, venue: str, latency: float, ok: bool) -> None:
+        if ok:
+            self.quotes[venue].append(latency)
+        else:
+            self.failures[venue] += 1
+
+    def record_win(self, venue: str) -> None:
+        self.wins[venue] += 1
+        self.routed += 1
+
+    def report(self) -> list[str]:
+        lines = []
+        for venue, latencies in self.quotes.items():
+            latencies = sorted(latencies)
+            p50 = f'{latencies[len(latencies) // 2] * 1000:.1f}ms' if latencies else 'n/a'
+            win_rate = f'{self.wins[venue] / self.routed:.0%}' if self.routed else 'n/a'
+            lines.append(f'{venue} | quotes: {len(latencies)}, failed: {self.failures[venue]}, '
+                         f'p50 latency: {p50}, wins: {self.wins[venue]} ({win_rate})')
+        return lines
+
+
+venue_stats = VenueStats()
+
+
+class BestSwap(BaseSwap):
+    def venue(self, name: str) -> BaseSwap:
+        return VENUES[name](self.private_key, self.from_token, self.to_token, self.amount, self.amount,
+                            self.swap_all_balance)
+
+    async def quote_venue(self, name: str, amount: int) -> int | None:
+        started = monotonic()
+        try:
+            amount_out = await self.venue(name).quote(amount)
+        except Exception as ex:
+            logger.debug(f'{name} quote failed | {ex}')
+            amount_out = None
+        venue_stats.record_quote(name, monotonic() - started, amount_out is not None)
+        return amount_out
+
+    async def gas_in_output(self, gas_cost: int, amount: int, amount_out: int) -> int:
+        if self.to_token.upper() == 'ETH':
+            return gas_cost
+        if self.from_token.upper() == 'ETH':
+            return gas_cost * amount_out // amount
+        return await reserve_cache.quote(routers['LineaSwap'], gas_cost, tokens['ETH'],
+                                         tokens[self.to_token.upper()]) or 0
+
+    async def swap(self) -> str | None:
+        amount = await self.get_swap_amount()
+        if amount is None:
+            return
+
+        names = list(VENUES)
+        quotes, gas_price = await gather(
+            gather(*[self.quote_venue(name, amount) for name in names]),
+            get_gas_price(self.web3),
+        )
+        net = {}
+        for name, amount_out in zip(names, quotes):
+            if amount_out:
+                net[name] = amount_out - await self.gas_in_output(SWAP_GAS[name] * gas_price, amount, amount_out)
+        if not net:
+            logger.error(f'No venue could quote {self.from_token} => {self.to_token}')
+            return
+
+        best = max(net, key=net.get)
+        venue_stats.record_win(best)
+        logger.info(f'Routing {self.from_token} => {self.to_token} through {best} | ' +
+                    ', '.join(f'{name}: {value}' for name, value in sorted(net.items(), key=lambda item: -item[1])))
+        return await self.venue(best).swap_amount(amount)
@@ -1,8 +1,8 @@
 from typing import Any
 
-from web3.contract import Contract
+from web3.contract import AsyncContract
 from eth_typing import Address
-from web3 import Web3
+from web3 import AsyncWeb3
 
 from src.utils.base_liquidity_remove import BaseLiquidityRemove
 from src.utils.base_liquidity import BaseLiquidity
@@ -11,6 +11,7 @@ from src.utils.base_swap import BaseSwap
 from src.modules.swaps.echodex.utils.transaction_data import (
     create_liquidity_remove_tx,
     create_liquidity_tx,
+    get_swap_amount_out,
     get_amount_out,
     create_swap_tx,
 )
@@ -23,14 +24,16 @@ class EchoDexSwap(BaseSwap):
     async def get_abi_name(self) -> str:
         return 'echo_dex'
 
-    async def get_amount_out(self, contract: Contract, amount: int, from_token_address: Address,
+    async def get_amount_out(self, contract: AsyncContract, amount: int, from_token_address: Address,
                              to_token_address: Address) -> int:
-        return await get_amount_out(contract, amount, from_token_address, to_token_address)
+        amount_out, self.quoted_path = await get_swap_amount_out(contract, amount, from_token_address,
+                                                                 to_token_address)
+        return amount_out
 
-    async def create_swap_tx(self, from_token: str, contract: Contract, amount_out: int, from_token_address: str,
-                             to_token_address: str, account_address: Address, amount: int, web3: Web3) -> Any:
-        return await create_swap_tx(from_token, contract, amount_out, from_token_address, to_token_address,
-                                    account_address, amount, web3)
+    async def create_swap_tx(self, from_token: str, contract: AsyncContract, amount_out: int, from_token_address: str,
+                             to_token_address: str, account_address: Address, amount: int, web3: AsyncWeb3) -> Any:
+        path = self.quoted_path or [from_token_address, to_token_address]
+        return await create_swap_tx(from_token, contract, amount_out, path, account_address, amount, web3)
 
 
 class EchoDexLiquidity(BaseLiquidity):
@@ -40,12 +43,12 @@ class EchoDexLiquidity(BaseLiquidity):
     async def get_abi_name(self) -> str:
         return 'echo_dex'
 
-    async def get_amount_out(self, contract: Contract, amount: int, from_token_address: Address,
+    async def get_amount_out(self, contract: AsyncContract, amount: int, from_token_address: Address,
                              to_token_address: Address) -> int:
         return await get_amount_out(contract, amount, from_token_address, to_token_address)
 
-    async def create_liquidity_tx(self, from_token: str, contract: Contract, amount_out: int, from_token_address: str,
-                                  to_token_address: str, account_address: Address, amount: int, web3: Web3) -> Any:
+    async def create_liquidity_tx(self, from_token: str, contract: AsyncContract, amount_out: int, from_token_address: str,
+                                  to_token_address: str, account_address: Address, amount: int, web3: AsyncWeb3) -> Any:
         return await create_liquidity_tx(from_token, contract, amount_out, to_token_address,
                                          account_address, amount, web3)
 
@@ -61,7 +64,7 @@ class EchoDexLiquidityRemove(BaseLiquidityRemove):
     async def get_abi_name(self) -> str:
         return 'echo_dex'
 
-    async def create_liquidity_remove_tx(self, web3: Web3, contract: Contract, from_token_pair_address: str,
+    async def create_liquidity_remove_tx(self, web3: AsyncWeb3, contract: AsyncContract, from_token_pair_address: str,
                                          amount: int, account_address: Address) -> None:
         return await create_liquidity_remove_tx(web3, contract, from_token_pair_address, amount, account_address)
 
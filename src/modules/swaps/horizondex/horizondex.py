@@ -1,8 +1,8 @@
 from typing import Any
 
-from web3.contract import Contract
+from web3.contract import AsyncContract
 from eth_typing import Address
-from web3 import Web3
+from web3 import AsyncWeb3
 
 from src.utils.base_swap import BaseSwap
 
@@ -19,12 +19,11 @@ class HorizonDexSwap(BaseSwap):
     async def get_abi_name(self) -> str:
         return 'horizon_dex'
 
-    async def get_amount_out(self, contract: Contract, amount: int, from_token_address: Address,
-                             to_token_address: Address) -> int:
-        return await get_amount_out('0x3228d205a96409a07a44d39916b6ea7b765d61f4',
-                                    amount, from_token_address, to_token_address, self.web3)
+    async def get_amount_out(self, contract: AsyncContract, amount: int, from_token_address: Address,
+                             to_token_address: Address) -> int | None:
+        return await get_amount_out(amount, from_token_address, to_token_address)
 
-    async def create_swap_tx(self, from_token: str, contract: Contract, amount_out: int, from_token_address: str,
-                             to_token_address: str, account_address: Address, amount: int, web3: Web3) -> Any:
+    async def create_swap_tx(self, from_token: str, contract: AsyncContract, amount_out: int, from_token_address: str,
+                             to_token_address: str, account_address: Address, amount: int, web3: AsyncWeb3) -> Any:
         return await create_swap_tx(from_token, contract, amount_out, from_token_address, to_token_address,
                                     account_address, amount, web3)
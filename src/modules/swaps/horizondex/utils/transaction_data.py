@@ -1,66 +1,67 @@
 from time import time
 
-from web3.contract import Contract
+from web3.contract import AsyncContract
 from eth_typing import Address
-from hexbytes import HexBytes
 from config import SLIPPAGE
-from eth_abi import encode
-from web3 import Web3
+from loguru import logger
+from web3 import AsyncWeb3
 
-from src.utils.data import load_contract
+from src.utils.ticks import tick_cache
+from src.utils.nonce import nonces
 
+from src.utils.calldata import (
+    CalldataTemplate,
+    get_template,
+    encode_call,
+    build_tx,
+)
 
-async def get_amount_out(contract_address: str, amount: int, from_token_address: Address,
-                         to_token_address: Address, web3: Web3) -> int:
-    contract = await load_contract(contract_address, web3, 'linea_swap')
-    amount_out = contract.functions.getAmountsOut(
-        amount,
-        [from_token_address, to_token_address]
-    ).call()
-    return amount_out[1]
+SWAP_EXACT_INPUT_SINGLE = 'swapExactInputSingle((address,address,uint24,address,uint256,uint256,uint256,uint160))'
+UNWRAP_WETH = 'unwrapWeth(uint256,address)'
+MULTICALL = 'multicall(bytes[])'
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
 
 
-async def create_swap_tx(from_token: str, contract: Contract, amount_out: int, from_token_address: str,
-                         to_token_address: str, account_address: Address, amount: int, web3: Web3) -> dict:
+def swap_template(from_token: str, from_token_address: str, to_token_address: str) -> CalldataTemplate:
     if from_token.lower() == 'eth':
-        tx_data = [Web3.to_checksum_address(from_token_address),
-                   Web3.to_checksum_address(to_token_address),
-                   300,
-                   account_address,
-                   int(time() + 1200),
-                   amount,
-                   int(amount_out * (1 - SLIPPAGE)),
-                   0]
-        tx = contract.functions.swapExactInputSingle(tx_data).build_transaction({
-            'value': amount if from_token.lower() == 'eth' else 0,
-            'nonce': web3.eth.get_transaction_count(account_address),
-            'from': account_address,
-            'maxFeePerGas': 0,
-            'maxPriorityFeePerGas': 0,
-            'gas': 0
-        })
-    else:
-        swap_data = encode(['address', 'address', 'uint24', 'address', 'uint256', 'uint256', 'uint256', 'uint160'],
-                           [Web3.to_checksum_address(from_token_address),
-                            Web3.to_checksum_address(to_token_address),
-                            300,
-                            Web3.to_checksum_address('0x0000000000000000000000000000000000000000'),
-                            int(time() + 1200),
-                            amount,
-                            int(amount_out * (1 - SLIPPAGE)),
-                            0]).hex()
+        return get_template(
+            (SWAP_EXACT_INPUT_SINGLE, from_token_address, to_token_address),
+            lambda recipient, deadline, amount, amount_out_min: encode_call(SWAP_EXACT_INPUT_SINGLE, [
+                (from_token_address, to_token_address, 300, recipient, deadline, amount, amount_out_min, 0)
+            ]),
+            {'recipient': 'address', 'deadline': 'uint', 'amount': 'uint', 'amount_out_min': 'uint'}
+        )
+    return get_template(
+        (MULTICALL, from_token_address, to_token_address),
+        lambda recipient, deadline, amount, amount_out_min: encode_call(MULTICALL, [[
+            encode_call(SWAP_EXACT_INPUT_SINGLE, [
+                (from_token_address, to_token_address, 300, ZERO_ADDRESS, deadline, amount, amount_out_min, 0)
+            ]),
+            encode_call(UNWRAP_WETH, [amount_out_min, recipient]),
+        ]]),
+        {'recipient': 'address', 'deadline': 'uint', 'amount': 'uint', 'amount_out_min': 'uint'}
+    )
 
-        unwrap_data = encode(['uint256', 'address'],
-                             [int(amount_out * (1 - SLIPPAGE)), account_address]).hex()
-        tx = contract.functions.multicall(
-            [HexBytes('0xa8c9ed67' + swap_data), HexBytes('0xbac37ef7' + unwrap_data)]
-        ).build_transaction({
-            'value': amount if from_token.lower() == 'eth' else 0,
-            'nonce': web3.eth.get_transaction_count(account_address),
-            'from': account_address,
-            'maxFeePerGas': 0,
-            'maxPriorityFeePerGas': 0,
-            'gas': 0
-        })
 
-    return tx
+async def get_amount_out(amount: int, from_token_address: Address, to_token_address: Address) -> int | None:
+    amount_out = await tick_cache.quote(amount, from_token_address, to_token_address)
+    if amount_out is None:
+        # Another venue's price says nothing about this pool, so there is no safe minimum output
+        logger.warning('HorizonDex pool state unavailable, not quoting the swap')
+    return amount_out
+
+
+async def create_swap_tx(from_token: str, contract: AsyncContract, amount_out: int, from_token_address: str,
+                         to_token_address: str, account_address: Address, amount: int, web3: AsyncWeb3) -> dict:
+    template = swap_template(from_token, AsyncWeb3.to_checksum_address(from_token_address),
+                             AsyncWeb3.to_checksum_address(to_token_address))
+    data = template.encode(recipient=account_address, deadline=int(time() + 1200), amount=amount,
+                           amount_out_min=int(amount_out * (1 - SLIPPAGE)))
+    return await build_tx(web3, contract.address, data, {
+        'value': amount if from_token.lower() == 'eth' else 0,
+        'nonce': await nonces.next_nonce(web3, account_address),
+        'from': account_address,
+        'maxFeePerGas': 0,
+        'maxPriorityFeePerGas': 0,
+        'gas': 0
+    })
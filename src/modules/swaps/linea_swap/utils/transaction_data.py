@@ -1,90 +1,149 @@
 from time import time
 
-from web3.contract import Contract
+from web3.contract import AsyncContract
 from eth_typing import Address
-from config import SLIPPAGE
-from web3 import Web3
+from web3 import AsyncWeb3
 
+from src.modules.swaps.tokens import tokens
+from src.utils.reserves import reserve_cache
+from src.utils.routing import path_finder
+from src.utils.nonce import nonces
 
-async def get_amount_out(contract: Contract, amount: int, from_token_address: Address,
+from src.utils.calldata import (
+    CalldataTemplate,
+    get_template,
+    encode_call,
+    build_tx,
+)
+
+from config import (
+    QUOTE_VALIDATION,
+    LOCAL_QUOTES,
+    SLIPPAGE,
+)
+
+SWAP_ETH_FOR_TOKENS = 'swapExactETHForTokens(uint256,address[],address,uint256)'
+SWAP_TOKENS_FOR_ETH = 'swapExactTokensForETH(uint256,uint256,address[],address,uint256)'
+SWAP_TOKENS_FOR_TOKENS = 'swapExactTokensForTokens(uint256,uint256,address[],address,uint256)'
+ADD_LIQUIDITY_ETH = 'addLiquidityETH(address,uint256,uint256,uint256,address,uint256)'
+REMOVE_LIQUIDITY_ETH = 'removeLiquidityETH(address,uint256,uint256,uint256,address,uint256)'
+
+
+def swap_template(from_token: str, path: list[str]) -> CalldataTemplate:
+    if from_token.lower() == 'eth':
+        return get_template(
+            (SWAP_ETH_FOR_TOKENS, *path),
+            lambda amount_out_min, to, deadline: encode_call(SWAP_ETH_FOR_TOKENS,
+                                                             [amount_out_min, path, to, deadline]),
+            {'amount_out_min': 'uint', 'to': 'address', 'deadline': 'uint'}
+        )
+    signature = SWAP_TOKENS_FOR_ETH if path[-1].lower() == tokens['ETH'].lower() else SWAP_TOKENS_FOR_TOKENS
+    return get_template(
+        (signature, *path),
+        lambda amount, amount_out_min, to, deadline: encode_call(signature,
+                                                                 [amount, amount_out_min, path, to, deadline]),
+        {'amount': 'uint', 'amount_out_min': 'uint', 'to': 'address', 'deadline': 'uint'}
+    )
+
+
+def liquidity_template(signature: str, token_address: str) -> CalldataTemplate:
+    return get_template(
+        (signature, token_address),
+        lambda amount, amount_token_min, amount_eth_min, to, deadline: encode_call(
+            signature, [token_address, amount, amount_token_min, amount_eth_min, to, deadline]
+        ),
+        {'amount': 'uint', 'amount_token_min': 'uint', 'amount_eth_min': 'uint', 'to': 'address', 'deadline': 'uint'}
+    )
+
+
+async def get_amount_out(contract: AsyncContract, amount: int, from_token_address: Address,
                          to_token_address: Address) -> int:
-    amount_out = contract.functions.getAmountsOut(
+    local_amount_out = await reserve_cache.quote(contract.address, amount, from_token_address, to_token_address) \
+        if LOCAL_QUOTES else None
+    if local_amount_out is not None and not QUOTE_VALIDATION:
+        return local_amount_out
+
+    amount_out = await contract.functions.getAmountsOut(
         amount,
         [from_token_address, to_token_address]
     ).call()
+    if local_amount_out is not None:
+        reserve_cache.validate(local_amount_out, amount_out[1])
     return amount_out[1]
 
 
-async def create_swap_tx(from_token: str, contract: Contract, amount_out: int, from_token_address: str,
-                         to_token_address: str, account_address: Address, amount: int, web3: Web3) -> dict:
-    if from_token.lower() == 'eth':
-        tx = contract.functions.swapExactETHForTokens(
-            int(amount_out * (1 - SLIPPAGE)), [from_token_address, to_token_address], account_address,
-            int(time() + 1200)). \
-            build_transaction({
-            'value': amount if from_token.lower() == 'eth' else 0,
-            'nonce': web3.eth.get_transaction_count(account_address),
-            'from': account_address,
-            'maxFeePerGas': 0,
-            'maxPriorityFeePerGas': 0,
-            'gas': 0
-        })
-    else:
-        tx = contract.functions.swapExactTokensForETH(
+async def get_path(contract: AsyncContract, amount: int, from_token_address: str,
+                   to_token_address: str) -> tuple[list[str], int] | None:
+    if not LOCAL_QUOTES:
+        return None
+    return await path_finder.best_path(contract.address, amount, from_token_address, to_token_address)
+
+
+async def get_swap_amount_out(contract: AsyncContract, amount: int, from_token_address: Address,
+                              to_token_address: Address) -> tuple[int, list[str]]:
+    route = await get_path(contract, amount, from_token_address, to_token_address)
+    if route is None:
+        amount_out = await get_amount_out(contract, amount, from_token_address, to_token_address)
+        return amount_out, [from_token_address, to_token_address]
+
+    path, local_amount_out = route
+    if QUOTE_VALIDATION:
+        amount_out = await contract.functions.getAmountsOut(
             amount,
-            int(amount_out * (1 - SLIPPAGE)),
-            [from_token_address, to_token_address],
-            account_address,
-            int(time() + 1200)
-        ).build_transaction({
-            'value': amount if from_token.lower() == 'eth' else 0,
-            'nonce': web3.eth.get_transaction_count(account_address),
-            'from': account_address,
-            'maxFeePerGas': 0,
-            'maxPriorityFeePerGas': 0,
-            'gas': 0
-        })
-
-    return tx
-
-
-async def create_liquidity_tx(from_token: str, contract: Contract, amount_out: int,
-                              to_token_address: str, account_address: Address, amount: int, web3: Web3) -> dict:
-    tx = contract.functions.addLiquidityETH(
-        to_token_address,
-        amount_out,
-        int(amount_out * (1 - SLIPPAGE)),
-        int(amount * (1 - SLIPPAGE)),
-        account_address,
-        int(time() + 1200)
-    ).build_transaction({
+            [AsyncWeb3.to_checksum_address(token) for token in path]
+        ).call()
+        reserve_cache.validate(local_amount_out, amount_out[-1])
+    return local_amount_out, path
+
+
+async def create_swap_tx(from_token: str, contract: AsyncContract, amount_out: int, path: list[str],
+                         account_address: Address, amount: int, web3: AsyncWeb3) -> dict:
+    template = swap_template(from_token, [AsyncWeb3.to_checksum_address(token) for token in path])
+    data = template.encode(amount=amount, amount_out_min=int(amount_out * (1 - SLIPPAGE)), to=account_address,
+                           deadline=int(time() + 1200))
+    return await build_tx(web3, contract.address, data, {
         'value': amount if from_token.lower() == 'eth' else 0,
-        'nonce': web3.eth.get_transaction_count(account_address),
+        'nonce': await nonces.next_nonce(web3, account_address),
         'from': account_address,
         'maxFeePerGas': 0,
         'maxPriorityFeePerGas': 0,
         'gas': 0
     })
 
-    return tx
+
+async def create_liquidity_tx(from_token: str, contract: AsyncContract, amount_out: int,
+                              to_token_address: str, account_address: Address, amount: int, web3: AsyncWeb3) -> dict:
+    data = liquidity_template(ADD_LIQUIDITY_ETH, AsyncWeb3.to_checksum_address(to_token_address)).encode(
+        amount=amount_out,
+        amount_token_min=int(amount_out * (1 - SLIPPAGE)),
+        amount_eth_min=int(amount * (1 - SLIPPAGE)),
+        to=account_address,
+        deadline=int(time() + 1200)
+    )
+    return await build_tx(web3, contract.address, data, {
+        'value': amount if from_token.lower() == 'eth' else 0,
+        'nonce': await nonces.next_nonce(web3, account_address),
+        'from': account_address,
+        'maxFeePerGas': 0,
+        'maxPriorityFeePerGas': 0,
+        'gas': 0
+    })
 
 
-async def create_liquidity_remove_tx(web3: Web3, contract: Contract, from_token_pair_address: str, amount: int,
+async def create_liquidity_remove_tx(web3: AsyncWeb3, contract: AsyncContract, from_token_pair_address: str, amount: int,
                                      account_address: Address) -> dict:
-    tx = contract.functions.removeLiquidityETH(
-        from_token_pair_address,
-        amount,
-        0,
-        0,
-        account_address,
-        int(time() + 1200)
-    ).build_transaction({
+    data = liquidity_template(REMOVE_LIQUIDITY_ETH, AsyncWeb3.to_checksum_address(from_token_pair_address)).encode(
+        amount=amount,
+        amount_token_min=0,
+        amount_eth_min=0,
+        to=account_address,
+        deadline=int(time() + 1200)
+    )
+    return await build_tx(web3, contract.address, data, {
         'value': 0,
-        'nonce': web3.eth.get_transaction_count(account_address),
+        'nonce': await nonces.next_nonce(web3, account_address),
         'from': account_address,
         'maxFeePerGas': 0,
         'maxPriorityFeePerGas': 0,
         'gas': 0
     })
-
-    return tx
@@ -1,67 +1,94 @@
-from web3.middleware import geth_poa_middleware
-from web3.contract import Contract
+from asyncio import gather
+
+from web3.contract import AsyncContract
 from eth_typing import Address
 from eth_abi import encode
-from web3 import Web3
+from web3 import AsyncWeb3
 
 from src.modules.swaps.tokens import tokens
-from src.utils.data import load_contract
-from config import SLIPPAGE
-
-
-async def get_amount_out(contract_address: str, amount: int, from_token_address: Address,
-                         to_token_address: Address, web3: Web3) -> int:
-    contract = await load_contract(contract_address, web3, 'linea_swap')
-    amount_out = contract.functions.getAmountsOut(
-        amount,
-        [from_token_address, to_token_address]
-    ).call()
-    return amount_out[1]
-
-
-async def create_swap_tx(from_token: str, contract: Contract, amount_out: int, from_token_address: str,
-                         to_token_address: str, account_address: Address, amount: int, web3: Web3) -> dict:
-    web3.middleware_onion.inject(geth_poa_middleware, layer=0)
-    swap_data = encode(
-        ["address", "address", "uint8"],
-        [Web3.to_checksum_address(from_token_address), account_address, 1 if from_token.upper() == 'BUSD' else 2]
+from src.utils.reserves import syncswap_pools
+from src.utils.block_cache import get_block_cache
+from src.utils.nonce import nonces
+from config import (
+    QUOTE_VALIDATION,
+    LOCAL_QUOTES,
+    SLIPPAGE,
+)
+
+from src.utils.calldata import (
+    CalldataTemplate,
+    get_template,
+    encode_call,
+    build_tx,
+)
+
+SWAP = 'swap(((address,bytes,address,bytes)[],address,uint256)[],uint256,uint256)'
+GET_AMOUNT_OUT = 'getAmountOut(address,uint256,address)'
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+
+
+def swap_template(from_token: str, from_token_address: str, to_token_address: str, pool: str) -> CalldataTemplate:
+    withdraw_mode = 1 if to_token_address.lower() == tokens['ETH'].lower() else 2
+    token_in = from_token_address if from_token.lower() != 'eth' else ZERO_ADDRESS
+
+    def build(recipient: str, amount: int, amount_out_min: int, deadline: int) -> bytes:
+        swap_data = encode(["address", "address", "uint8"], [from_token_address, recipient, withdraw_mode])
+        steps = [(pool, swap_data, ZERO_ADDRESS, b'')]
+        return encode_call(SWAP, [[(steps, token_in, amount)], amount_out_min, deadline])
+
+    return get_template((SWAP, pool, from_token_address, withdraw_mode, token_in), build,
+                        {'recipient': 'address', 'amount': 'uint', 'amount_out_min': 'uint', 'deadline': 'uint'})
+
+
+async def get_pool(from_token_address: str, to_token_address: str) -> str:
+    pool = await syncswap_pools.get_pool_address(from_token_address, to_token_address)
+    if pool is None:
+        raise ValueError(f'SyncSwap has no classic pool for {from_token_address} and {to_token_address}')
+    return AsyncWeb3.to_checksum_address(pool)
+
+
+async def get_amount_out(amount: int, from_token_address: Address, to_token_address: Address,
+                         web3: AsyncWeb3) -> int:
+    local_amount_out = await syncswap_pools.quote(syncswap_pools.router, amount, from_token_address,
+                                                  to_token_address) if LOCAL_QUOTES else None
+    if local_amount_out is not None and not QUOTE_VALIDATION:
+        return local_amount_out
+
+    pool = await get_pool(from_token_address, to_token_address)
+    data = encode_call(GET_AMOUNT_OUT, [AsyncWeb3.to_checksum_address(from_token_address), amount, ZERO_ADDRESS])
+    amount_out = int.from_bytes(await web3.eth.call({'to': pool, 'data': '0x' + data.hex()}), 'big')
+    if local_amount_out is not None:
+        syncswap_pools.validate(local_amount_out, amount_out)
+    return amount_out
+
+
+async def create_swap_tx(from_token: str, contract: AsyncContract, amount_out: int, from_token_address: str,
+                         to_token_address: str, account_address: Address, amount: int, web3: AsyncWeb3) -> dict:
+    pool = await get_pool(from_token_address, to_token_address)
+    nonce, block = await gather(
+        nonces.next_nonce(web3, account_address),
+        get_block_cache(web3).get(),
+    )
+    data = swap_template(from_token, AsyncWeb3.to_checksum_address(from_token_address), to_token_address,
+                         pool).encode(
+        recipient=account_address,
+        amount=amount,
+        amount_out_min=int(amount_out * (1 - SLIPPAGE)),
+        deadline=block.timestamp + 1200
     )
-    native_eth_address = "0x0000000000000000000000000000000000000000"
-    steps = [{
-        "pool": '0x7f72E0D8e9AbF9133A92322b8B50BD8e0F9dcFCB',
-        "data": swap_data,
-        "callback": native_eth_address,
-        "callbackData": '0x'
-    }]
-    paths = [{
-        "steps": steps,
-        "tokenIn": Web3.to_checksum_address(
-            from_token_address) if from_token.lower() != 'eth' else Web3.to_checksum_address(
-            native_eth_address),
-        "amountIn": amount,
-    }]
-
-    tx = contract.functions.swap(
-        paths,
-        int(amount_out * (1 - SLIPPAGE)),
-        int(web3.eth.get_block('latest').timestamp) + 1200
-    ).build_transaction({
+    return await build_tx(web3, contract.address, data, {
         'from': account_address,
         'value': amount if from_token.lower() == 'eth' else 0,
-        'nonce': web3.eth.get_transaction_count(account_address),
+        'nonce': nonce,
         'maxFeePerGas': 0,
         'maxPriorityFeePerGas': 0,
         'gas': 0
     })
-    return tx
 
 
-async def setup_for_liquidity(token: str) -> tuple[str, str]:
-    if token.lower() == 'busd':
-        from_token_address = tokens[token.upper()]
-        to_token_address = tokens['ETH']
-    else:
-        from_token_address = tokens[token.upper()]
-        to_token_address = tokens['BUSD']
+async def setup_for_liquidity(token: str, token2: str) -> tuple[str, str, str]:
+    from_token_address = tokens[token.upper()]
+    to_token_address = tokens[token2.upper()]
+    pool = await get_pool(from_token_address, to_token_address)
 
-    return to_token_address, from_token_address
+    return to_token_address, from_token_address, pool
@@ -16,5 +16,17 @@ liquidity_tokens = {
         'ETH': {
             'BUSD': '0x7de2b2b6ad99d83f97ad3ea24bb36d2f5b800e00'
         }
+    },
+    'SyncSwap': {
+        'ETH': {
+            'BUSD': '0x7f72e0d8e9abf9133a92322b8b50bd8e0f9dcfcb'
+        }
     }
 }
+
+routers = {
+    'LineaSwap': '0x3228d205a96409a07a44d39916b6ea7b765d61f4',
+    'EchoDex': '0xc66149996d0263C0B42D3bC05e50Db88658106cE',
+    'SyncSwap': '0x80e38291e06339d10AAB483C65695D004dBD5C69',
+    'HorizonDex': '0x272e156df8da513c69cb41cc7a99185d53f926bb',
+}
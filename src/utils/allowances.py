@@ -0,0 +1,81 @@
+import json
+import os
+
+from eth_utils import keccak
+
+from src.utils.receipts import receipt_listeners
+from config import ALLOWANCE_CACHE_PATH
+
+APPROVAL_TOPIC = '0x' + keccak(text='Approval(address,address,uint256)').hex()
+ALLOWANCE_ERRORS = ('exceeds allowance', 'insufficient allowance', 'transfer_from_failed')
+
+
+class AllowanceCache:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.allowances: dict[tuple[str, str, str], int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.observed = 0
+        self.dirty = False
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for entry in json.load(f):
+                    self.allowances[(entry['wallet'], entry['token'], entry['spender'])] = int(entry['allowance'])
+
+    @staticmethod
+    def key(wallet: str, token: str, spender: str) -> tuple[str, str, str]:
+        return wallet.lower(), token.lower(), spender.lower()
+
+    def flush(self) -> None:
+        if not self.path or not self.dirty:
+            return
+        # Written to a temporary file first so a crash mid-write cannot truncate the cache
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump([{'wallet': wallet, 'token': token, 'spender': spender, 'allowance': str(allowance)}
+                       for (wallet, token, spender), allowance in self.allowances.items()], f, indent=2)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+    def get(self, wallet: str, token: str, spender: str) -> int | None:
+        allowance = self.allowances.get(self.key(wallet, token, spender))
+        if allowance is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return allowance
+
+    def set(self, wallet: str, token: str, spender: str, allowance: int) -> None:
+        key = self.key(wallet, token, spender)
+        if self.allowances.get(key) != allowance:
+            self.allowances[key] = allowance
+            self.dirty = True
+
+    def invalidate(self, wallet: str, token: str, spender: str) -> bool:
+        if self.allowances.pop(self.key(wallet, token, spender), None) is None:
+            return False
+        self.dirty = True
+        return True
+
+    def observe_receipt(self, _: str, receipt: dict) -> None:
+        if receipt.get('status') != 1:
+            return
+        sender = (receipt.get('from') or '').lower()
+        for log in receipt.get('logs') or []:
+            topics = log.get('topics') or []
+            if len(topics) != 3 or topics[0].lower() != APPROVAL_TOPIC:
+                continue
+            owner, spender = '0x' + topics[1][-40:], '0x' + topics[2][-40:]
+            if owner.lower() != sender and self.key(owner, log['address'], spender) not in self.allowances:
+                continue
+            self.set(owner, log['address'], spender, int(log['data'], 16))
+            self.observed += 1
+
+    def __str__(self) -> str:
+        return (f'cached: {len(self.allowances)}, hits: {self.hits}, misses: {self.misses}, '
+                f'approvals observed: {self.observed}')
+
+
+allowance_cache = AllowanceCache(ALLOWANCE_CACHE_PATH)
+receipt_listeners.append(allowance_cache.observe_receipt)
@@ -2,17 +2,19 @@ from asyncio import sleep
 from typing import Any
 import random
 
-from web3.contract import Contract
+from web3.contract import AsyncContract
 from eth_typing import Address
 from loguru import logger
-from web3 import Web3
+from web3 import AsyncWeb3
 
+from src.utils.token_registry import get_registry
 from src.modules.swaps.tokens import tokens
+from src.utils.executor import TxExecutor
 from src.utils.chains import LINEA
+
 from src.utils.data import (
     load_contract,
     get_wallet_balance,
-    approve_token,
 )
 
 
@@ -28,17 +30,18 @@ class BaseLiquidity:
         self.token = token
         self.token2 = token2
         self.amount = round(random.uniform(amount_from, amount_to), 7)
-        self.web3 = Web3(Web3.HTTPProvider(LINEA.rpc))
+        self.web3 = LINEA.w3
         self.account = self.web3.eth.account.from_key(private_key)
         self.account_address = self.account.address
+        self.executor = TxExecutor(self.web3, private_key)
 
-    async def add_liquidity(self) -> None:
+    async def add_liquidity(self) -> str | None:
         abi_name = await self.get_abi_name()
         contract_address = await self.get_contract_address()
         from_token_address, to_token_address = tokens[self.token.upper()], tokens[self.token2.upper()]
         contract = await load_contract(contract_address, self.web3, abi_name)
-        decimals = 18
-        amount = int(self.amount * 10 ** decimals)
+        registry = get_registry(LINEA)
+        amount = (await registry.get(from_token_address)).to_wei(self.amount)
         balance = await get_wallet_balance(self.token, self.web3, self.account_address, from_token_address,
                                            'linea')
 
@@ -46,19 +49,13 @@ class BaseLiquidity:
             logger.error(f'Not enough balance for wallet {self.account_address}')
             return
 
-        await approve_token(amount,
-                            self.private_key,
-                            'linea',
-                            to_token_address,
-                            contract_address,
-                            self.account_address,
-                            self.web3)
+        await self.executor.approve(to_token_address, contract_address, amount)
 
         while True:
             stable_balance = await get_wallet_balance(self.token2, self.web3, self.account_address, to_token_address,
                                                       'linea')
-            amount_out = await self.get_amount_out(contract, amount, Web3.to_checksum_address(from_token_address),
-                                                   Web3.to_checksum_address(to_token_address))
+            amount_out = await self.get_amount_out(contract, amount, AsyncWeb3.to_checksum_address(from_token_address),
+                                                   AsyncWeb3.to_checksum_address(to_token_address))
             if amount_out > stable_balance:
                 logger.error(f'Not enough {self.token2.upper()} balance for wallet {self.account_address}')
                 logger.info(f'Swapping {self.amount} ETH => {self.token2.upper()}')
@@ -70,34 +67,16 @@ class BaseLiquidity:
                 continue
             break
 
-        tx = await self.create_liquidity_tx(self.token, contract, amount_out, from_token_address, to_token_address,
-                                            self.account_address, amount, self.web3)
-
-        retries = 0
-        while retries < 3:
-            try:
-                tx.update({'maxFeePerGas': self.web3.eth.gas_price})
-                tx.update({'maxPriorityFeePerGas': self.web3.eth.max_priority_fee})
-
-                gasLimit = self.web3.eth.estimate_gas(tx)
-                tx.update({'gas': gasLimit})
-
-                signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
-                raw_tx_hash = self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-                tx_hash = self.web3.to_hex(raw_tx_hash)
-                logger.success(
-                    f'Successfully added liquidity with {self.amount} ETH, {amount_out / 10 ** 18} {self.token2.upper()} | TX: https://lineascan.build/tx/{tx_hash}'
-                )
-                break
-            except Exception as ex:
-                if 'exceeds allowance' in str(ex):
-                    logger.error('Not enough money for transaction')
-                    return
-                logger.error(f'Something went wrong {ex}')
-                await sleep(random.randint(15, 20))
-                logger.debug('Trying one more time')
-                retries += 1
-                continue
+        async def build() -> dict:
+            return await self.create_liquidity_tx(self.token, contract, amount_out, from_token_address,
+                                                  to_token_address, self.account_address, amount, self.web3)
+
+        tx_hash = await self.executor.execute(await build(), build, (to_token_address, contract_address, amount))
+        if tx_hash:
+            logger.success(
+                f'Successfully added liquidity with {self.amount} ETH, {(await registry.get(to_token_address)).from_wei(amount_out)} {self.token2.upper()} | TX: https://lineascan.build/tx/{tx_hash}'
+            )
+        return tx_hash
 
     async def get_abi_name(self) -> None:
         raise NotImplementedError("Subclasses must implement get_abi_name()")
@@ -105,12 +84,12 @@ class BaseLiquidity:
     async def get_contract_address(self) -> None:
         raise NotImplementedError("Subclasses must implement get_contract_address()")
 
-    async def get_amount_out(self, contract: Contract, amount: int, from_token_address: Address,
+    async def get_amount_out(self, contract: AsyncContract, amount: int, from_token_address: Address,
                              to_token_address: Address) -> int:
         raise NotImplementedError("Subclasses must implement get_amount_out()")
 
-    async def create_liquidity_tx(self, from_token: str, contract: Contract, amount_out: int, from_token_address: str,
-                                  to_token_address: str, account_address: Address, amount: int, web3: Web3) -> Any:
+    async def create_liquidity_tx(self, from_token: str, contract: AsyncContract, amount_out: int, from_token_address: str,
+                                  to_token_address: str, account_address: Address, amount: int, web3: AsyncWeb3) -> Any:
         raise NotImplementedError("Subclasses must implement create_liquidity_tx()")
 
     async def get_swap_instance(self, private_key: str, token: str, token2: str, amount_from: float,
@@ -1,10 +1,11 @@
 from typing import Any
 
-from web3.contract import Contract
+from web3.contract import AsyncContract
 from eth_typing import Address
 from loguru import logger
-from web3 import Web3
+from web3 import AsyncWeb3
 
+from src.utils.executor import TxExecutor
 from src.utils.chains import LINEA
 
 from src.modules.swaps.tokens import (
@@ -15,7 +16,6 @@ from src.modules.swaps.tokens import (
 from src.utils.data import (
     load_contract,
     get_wallet_balance,
-    approve_token,
 )
 
 
@@ -30,11 +30,12 @@ class BaseLiquidityRemove:
         self.from_token_pair = from_token_pair
         self.remove_all = remove_all
         self.removing_percentage = removing_percentage
-        self.web3 = Web3(Web3.HTTPProvider(LINEA.rpc))
+        self.web3 = LINEA.w3
         self.account = self.web3.eth.account.from_key(private_key)
         self.account_address = self.account.address
+        self.executor = TxExecutor(self.web3, private_key)
 
-    async def remove_liquidity(self) -> None:
+    async def remove_liquidity(self) -> str | None:
         abi_name = await self.get_abi_name()
         contract_address = await self.get_contract_address()
         pool_name = await self.get_pool_name()
@@ -52,33 +53,17 @@ class BaseLiquidityRemove:
         else:
             amount = int(balance * self.removing_percentage)
 
-        await approve_token(amount,
-                            self.private_key,
-                            'linea',
-                            liquidity_token_address,
-                            contract_address,
-                            self.account_address,
-                            self.web3)
+        await self.executor.approve(liquidity_token_address, contract_address, amount)
 
         tx = await self.create_liquidity_remove_tx(self.web3, contract, tokens[self.from_token_pair.upper()],
                                                    amount, self.account_address)
 
-        try:
-            tx.update({'maxFeePerGas': self.web3.eth.gas_price})
-            tx.update({'maxPriorityFeePerGas': self.web3.eth.max_priority_fee})
-
-            gasLimit = self.web3.eth.estimate_gas(tx)
-            tx.update({'gas': gasLimit})
-
-            signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
-            raw_tx_hash = self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            tx_hash = self.web3.to_hex(raw_tx_hash)
+        tx_hash = await self.executor.execute(tx)
+        if tx_hash:
             logger.success(
                 f'Removed {"all" if self.remove_all else f"{self.removing_percentage * 100}%"} tokens from {pool_name} pool | TX: https://lineascan.build/tx/{tx_hash}'
             )
-
-        except Exception as ex:
-            logger.error(f'Something went wrong {ex}')
+        return tx_hash
 
     async def get_abi_name(self) -> str:
         raise NotImplementedError("Subclasses must implement get_abi_name()")
@@ -86,7 +71,7 @@ class BaseLiquidityRemove:
     async def get_contract_address(self) -> str:
         raise NotImplementedError("Subclasses must implement get_contract_address()")
 
-    async def create_liquidity_remove_tx(self, web3: Web3, contract: Contract, from_token_pair_address: str,
+    async def create_liquidity_remove_tx(self, web3: AsyncWeb3, contract: AsyncContract, from_token_pair_address: str,
                                          amount: int, account_address: Address) -> Any:
         raise NotImplementedError("Subclasses must implement create_liquidity_remove_tx()")
 
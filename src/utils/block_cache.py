@@ -0,0 +1,98 @@
+from time import monotonic
+
+from asyncio import (
+    create_task,
+    shield,
+    Task,
+)
+
+from web3 import AsyncWeb3
+
+DEFAULT_BLOCK_TIME = 2.0
+FEE_HISTORY_BLOCKS = 10
+PRIORITY_PERCENTILE = 50
+
+
+def history_priority_fee(fee_history: dict) -> int | None:
+    rewards = sorted(int(reward[0], 16) for reward in fee_history.get('reward') or [] if reward)
+    return rewards[len(rewards) // 2] if rewards else None
+
+
+class BlockState:
+    def __init__(self, block: dict, gas_price: int, fee_history: dict | None) -> None:
+        self.number = int(block['number'], 16)
+        self.timestamp = int(block['timestamp'], 16)
+        self.base_fee = int(block['baseFeePerGas'], 16) if block.get('baseFeePerGas') else None
+        self.gas_price = gas_price
+        fee_history = fee_history or {}
+        base_fees = fee_history.get('baseFeePerGas')
+        self.priority_fee = history_priority_fee(fee_history)
+        self.next_base_fee = int(base_fees[-1], 16) if base_fees else self.base_fee
+
+
+class BlockCache:
+    def __init__(self, web3: AsyncWeb3, block_time: float = DEFAULT_BLOCK_TIME) -> None:
+        self.web3 = web3
+        self.block_time = block_time
+        self.state: BlockState | None = None
+        self.expires = 0.0
+        self.refreshing: Task | None = None
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self) -> BlockState:
+        if self.state is not None and monotonic() < self.expires:
+            self.hits += 1
+            return self.state
+        if self.refreshing is None:
+            self.misses += 1
+            self.refreshing = create_task(self.refresh())
+        else:
+            self.hits += 1
+        return await shield(self.refreshing)
+
+    async def refresh(self) -> BlockState:
+        try:
+            block, gas_price, fee_history = await self.web3.provider.make_batch_request([
+                ('eth_getBlockByNumber', ['latest', False]),
+                ('eth_gasPrice', []),
+                ('eth_feeHistory', [hex(FEE_HISTORY_BLOCKS), 'latest', [PRIORITY_PERCENTILE]]),
+            ])
+            for response in (block, gas_price):
+                if 'error' in response:
+                    raise ValueError(response['error'])
+            self.state = BlockState(
+                block['result'],
+                int(gas_price['result'], 16),
+                fee_history.get('result'),
+            )
+            self.expires = monotonic() + self.block_time
+            return self.state
+        finally:
+            self.refreshing = None
+
+    def observe_block(self, number: int) -> None:
+        if self.state is not None and number > self.state.number:
+            self.expires = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __str__(self) -> str:
+        return f'hits: {self.hits}, misses: {self.misses} ({self.hit_ratio:.0%} hit ratio)'
+
+
+block_caches: dict[int, BlockCache] = {}
+
+
+def get_block_cache(web3: AsyncWeb3, block_time: float = DEFAULT_BLOCK_TIME) -> BlockCache:
+    key = getattr(web3.provider, 'chain_id', None) or id(web3)
+    if key not in block_caches:
+        block_caches[key] = BlockCache(web3, block_time)
+    return block_caches[key]
+
+
+async def get_gas_price(web3: AsyncWeb3) -> int:
+    return (await get_block_cache(web3).get()).gas_price
@@ -0,0 +1,74 @@
+from typing import Callable
+
+from eth_utils import (
+    function_signature_to_4byte_selector,
+    keccak,
+)
+from eth_abi import encode
+from web3 import AsyncWeb3
+
+
+def split_types(signature: str) -> list[str]:
+    inner = signature[signature.index('(') + 1:-1]
+    types, depth, start = [], 0, 0
+    for i, char in enumerate(inner):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            types.append(inner[start:i])
+            start = i + 1
+    if inner:
+        types.append(inner[start:])
+    return types
+
+
+def encode_call(signature: str, args: list) -> bytes:
+    return function_signature_to_4byte_selector(signature) + encode(split_types(signature), args)
+
+
+def to_word(kind: str, value: int | str) -> bytes:
+    if kind == 'address':
+        return bytes.fromhex(value[2:]).rjust(32, b'\0')
+    return value.to_bytes(32, 'big')
+
+
+class CalldataTemplate:
+    def __init__(self, build: Callable[..., bytes], fields: dict[str, str]) -> None:
+        self.fields = fields
+        sentinels = {name: int.from_bytes(keccak(text=name)[:20], 'big') for name in fields}
+        args = {name: '0x' + value.to_bytes(20, 'big').hex() if fields[name] == 'address' else value
+                for name, value in sentinels.items()}
+        self.base = build(**args)
+        self.positions = {}
+        for name, value in sentinels.items():
+            word, positions, start = value.to_bytes(32, 'big'), [], 0
+            while (position := self.base.find(word, start)) != -1:
+                positions.append(position)
+                start = position + 32
+            if not positions:
+                raise ValueError(f'Field {name} does not appear in the calldata')
+            self.positions[name] = positions
+
+    def encode(self, **values: int | str) -> bytes:
+        data = bytearray(self.base)
+        for name, positions in self.positions.items():
+            word = to_word(self.fields[name], values[name])
+            for position in positions:
+                data[position:position + 32] = word
+        return bytes(data)
+
+
+templates: dict[tuple, CalldataTemplate] = {}
+
+
+def get_template(key: tuple, build: Callable[..., bytes], fields: dict[str, str]) -> CalldataTemplate:
+    if key not in templates:
+        templates[key] = CalldataTemplate(build, fields)
+    return templates[key]
+
+
+async def build_tx(web3: AsyncWeb3, to: str, data: bytes, params: dict) -> dict:
+    chain_id = getattr(web3.provider, 'chain_id', None) or await web3.eth.chain_id
+    return {**params, 'chainId': chain_id, 'to': AsyncWeb3.to_checksum_address(to), 'data': '0x' + data.hex()}
@@ -1,37 +1,102 @@
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils.rpc import (
+    PooledHTTPProvider,
+    ConnectionStats,
+    ConnectionPool,
+    EndpointPool,
+    round_trip_stats,
+)
+
+from src.utils.block_cache import (
+    DEFAULT_BLOCK_TIME,
+    get_block_cache,
+    block_caches,
+)
+from src.utils.receipts import trackers
+
+from config import (
+    RPC_LIMIT_PER_HOST,
+    RPC_HEDGE_READS,
+    RPC_POOL_SIZE,
+)
+
+
 class Chain:
-    def __init__(self, chain_id: int, rpc: str, scan: str, code: int) -> None:
+    def __init__(self, chain_id: int, rpc: str | list[str], scan: str, code: int, pool_size: int = RPC_POOL_SIZE,
+                 limit_per_host: int = RPC_LIMIT_PER_HOST, hedge_reads: bool = RPC_HEDGE_READS,
+                 block_time: float = DEFAULT_BLOCK_TIME) -> None:
         self.chain_id = chain_id
-        self.rpc = rpc
+        self.rpcs = [rpc] if isinstance(rpc, str) else list(rpc)
+        self.rpc = self.rpcs[0]
         self.scan = scan
         self.code = code
+        self.hedge_reads = hedge_reads
+        self.block_time = block_time
+        self.endpoints = EndpointPool(self.rpcs)
+        self.pool = ConnectionPool(pool_size, limit_per_host)
+        self._w3: AsyncWeb3 | None = None
+
+    @property
+    def w3(self) -> AsyncWeb3:
+        if self._w3 is None:
+            self._w3 = AsyncWeb3(PooledHTTPProvider(self.endpoints, self.pool, self.hedge_reads,
+                                                      self.chain_id))
+            get_block_cache(self._w3, self.block_time)
+        return self._w3
+
+    @property
+    def stats(self) -> ConnectionStats:
+        return self.pool.stats
+
+    async def close(self) -> None:
+        await self.pool.close()
 
 
 ETH = Chain(
     chain_id=1,
-    rpc='https://rpc.ankr.com/eth',
+    rpc=[
+        'https://rpc.ankr.com/eth',
+        'https://eth.llamarpc.com',
+    ],
     scan='https://etherscan.io/tx',
     code=9001,
+    block_time=12,
 )
 
 LINEA = Chain(
     chain_id=59144,
-    rpc='https://rpc.linea.build/',
+    rpc=[
+        'https://rpc.linea.build/',
+        'https://linea.blockpi.network/v1/rpc/public',
+        'https://1rpc.io/linea',
+    ],
     scan='https://lineascan.build/tx',
-    code=9023
+    code=9023,
+    block_time=2,
 )
 
 OP = Chain(
     chain_id=10,
-    rpc='https://rpc.ankr.com/optimism',
+    rpc=[
+        'https://rpc.ankr.com/optimism',
+        'https://mainnet.optimism.io',
+    ],
     scan='https://optimistic.etherscan.io/tx',
-    code=9007
+    code=9007,
+    block_time=2,
 )
 
 ARB = Chain(
     chain_id=42161,
-    rpc='https://arb1.arbitrum.io/rpc',
+    rpc=[
+        'https://arb1.arbitrum.io/rpc',
+        'https://rpc.ankr.com/arbitrum',
+    ],
     scan='https://arbiscan.io/tx',
-    code=9002
+    code=9002,
+    block_time=0.25,
 )
 
 chain_mapping = {
@@ -40,3 +105,19 @@ chain_mapping = {
     'arb': ARB,
     'linea': LINEA
 }
+
+
+async def close_chains() -> None:
+    for name, chain in chain_mapping.items():
+        if chain.stats.requests:
+            logger.info(f'{name.upper()} RPC | {chain.stats}, failovers: {chain.endpoints.failovers}, '
+                        f'hedged: {chain.endpoints.hedged}, demoted: {chain.endpoints.demoted}')
+            for endpoint in chain.endpoints.endpoints:
+                logger.info(f'{name.upper()} RPC | {endpoint}')
+        if chain.chain_id in block_caches and block_caches[chain.chain_id].misses:
+            logger.info(f'{name.upper()} block cache | {block_caches[chain.chain_id]}')
+        if chain.chain_id in trackers:
+            logger.info(f'{name.upper()} receipts | {trackers[chain.chain_id]}')
+        await chain.close()
+    for line in round_trip_stats.report():
+        logger.info(f'Round trips | {line}')
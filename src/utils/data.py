@@ -1,118 +1,114 @@
-from asyncio import sleep
 import json
 
-from random import (
-    randint,
-    uniform,
-)
-
-from web3.contract import Contract
+from web3.contract import AsyncContract
 from loguru import logger
-from web3 import Web3
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
 
-from eth_typing import (
-    Address,
-    HexStr,
+from src.utils.nonce import (
+    NonceManager,
+    is_nonce_error,
+    nonces,
 )
+from src.utils.allowances import allowance_cache
+from src.utils.gas_profiles import gas_profiles
+from src.utils.receipts import get_tracker
+from src.utils.portfolio import snapshot
+
+from eth_typing import Address
+
+
+# Only these fragments are handed to web3; add a name here before calling a new function
+ABI_FRAGMENTS = {
+    'erc20': ('balanceOf', 'allowance', 'approve'),
+    'linea_swap': ('getAmountsOut', 'swapExactETHForTokens', 'swapExactTokensForETH', 'addLiquidityETH',
+                   'removeLiquidityETH'),
+    'echo_dex': ('getAmountsOut', 'swapExactETHForTokens', 'swapExactTokensForETH', 'addLiquidityETH',
+                 'removeLiquidityETH'),
+    'horizon_dex': ('swapExactInputSingle', 'multicall'),
+    'syncswap': ('swap', 'addLiquidity2', 'burnLiquidity'),
+    'main_bridge': ('sendMessage',),
+}
 
+abi_registry: dict[str, list] = {}
+contract_cache: dict[tuple[int, str, str], AsyncContract] = {}
 
-async def load_abi(name: str) -> str:
-    with open(f'./assets/abi/{name}.json') as f:
-        abi: str = json.load(f)
-    return abi
 
+def prune_abi(abi: list, fragments: tuple[str, ...]) -> list:
+    return [entry for entry in abi if entry.get('name') in fragments]
 
-async def load_contract(address: str, web3: Web3, abi_name: str) -> Contract | None:
+
+async def load_abi(name: str) -> list:
+    if name not in abi_registry:
+        with open(f'./assets/abi/{name}.json') as f:
+            abi = json.load(f)
+        abi_registry[name] = prune_abi(abi, ABI_FRAGMENTS[name]) if name in ABI_FRAGMENTS else abi
+    return abi_registry[name]
+
+
+async def load_contract(address: str, web3: AsyncWeb3, abi_name: str) -> AsyncContract | None:
     if address is None:
         return
 
-    address = web3.to_checksum_address(address)
-    return web3.eth.contract(address=address, abi=await load_abi(abi_name))
+    key = (id(web3), abi_name, address.lower())
+    if key not in contract_cache:
+        contract_cache[key] = web3.eth.contract(address=web3.to_checksum_address(address),
+                                                abi=await load_abi(abi_name))
+    return contract_cache[key]
 
 
-async def get_wallet_balance(token: str, w3: Web3, address: Address, stable_address: str,
+async def get_wallet_balance(token: str, w3: AsyncWeb3, address: Address, stable_address: str,
                              from_chain: str) -> float:
+    if from_chain.lower() == 'linea':
+        cached_balance = snapshot.balance(address, stable_address if token.lower() != 'eth' else None)
+        if cached_balance is not None:
+            return cached_balance
+
     if token.lower() != 'eth':
-        stable_contract = w3.eth.contract(address=Web3.to_checksum_address(stable_address), abi=await load_abi('erc20'))
-        balance = stable_contract.functions.balanceOf(address).call()
+        stable_contract = await load_contract(stable_address, w3, 'erc20')
+        balance = await stable_contract.functions.balanceOf(address).call()
     else:
-        balance = w3.eth.get_balance(address)
+        balance = await w3.eth.get_balance(address)
 
     return balance
 
 
-async def get_contract(web3: Web3, from_token_address: str) -> Contract:
-    return web3.eth.contract(address=web3.to_checksum_address(from_token_address),
-                             abi=await load_abi('erc20'))
+async def get_contract(web3: AsyncWeb3, from_token_address: str) -> AsyncContract:
+    return await load_contract(from_token_address, web3, 'erc20')
 
 
-async def approve_token(amount: float, private_key: str, chain: str, from_token_address: str, spender: str,
-                        address_wallet: Address, web3: Web3) -> HexStr:
+async def check_allowance(web3: AsyncWeb3, from_token_address: str, address_wallet: Address, spender: str) -> float:
     try:
-        spender = web3.to_checksum_address(spender)
-        contract = await get_contract(web3, from_token_address)
-        allowance_amount = await check_allowance(web3, from_token_address, address_wallet, spender)
-
-        if amount > allowance_amount:
-            logger.debug('Approving token...')
-            tx = contract.functions.approve(
-                spender,
-                100000000000000000000000000000000000000000000000000000000000000000000000000000
-            ).build_transaction(
-                {
-                    'chainId': web3.eth.chain_id,
-                    'from': address_wallet,
-                    'nonce': web3.eth.get_transaction_count(address_wallet),
-                    'gasPrice': 0,
-                    'gas': 0,
-                    'value': 0
-                }
-            )
-            if chain == 'bsc':
-                tx['gasPrice'] = randint(1000000000, 1050000000)
-            else:
-                gas_price = await add_gas_price(web3)
-                tx['gasPrice'] = gas_price
-
-            gas_limit = await add_gas_limit(web3, tx)
-            tx['gas'] = gas_limit
-
-            signed_tx = web3.eth.account.sign_transaction(tx, private_key=private_key)
-            raw_tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            tx_receipt = web3.eth.wait_for_transaction_receipt(raw_tx_hash)
-            while tx_receipt is None:
-                await sleep(1)
-                tx_receipt = web3.eth.get_transaction_receipt(raw_tx_hash)
-            tx_hash = web3.to_hex(raw_tx_hash)
-            logger.info(f'Token approved | Tx hash: {tx_hash}')
-            await sleep(5)
-            return tx_hash
-
-    except Exception as ex:
-        logger.error(f'Something went wrong | {ex}')
-
-
-async def check_allowance(web3: Web3, from_token_address: str, address_wallet: Address, spender: str) -> float:
-    try:
-        contract = web3.eth.contract(address=web3.to_checksum_address(from_token_address),
-                                     abi=await load_abi('erc20'))
-        amount_approved = contract.functions.allowance(address_wallet, spender).call()
+        cached_allowance = allowance_cache.get(address_wallet, from_token_address, spender)
+        if cached_allowance is not None:
+            return cached_allowance
+
+        amount_approved = snapshot.allowance(address_wallet, from_token_address, spender)
+        if amount_approved is None:
+            contract = await load_contract(from_token_address, web3, 'erc20')
+            amount_approved = await contract.functions.allowance(address_wallet, spender).call()
+        allowance_cache.set(address_wallet, from_token_address, spender, amount_approved)
         return amount_approved
 
     except Exception as ex:
         logger.error(f'Something went wrong | {ex}')
 
 
-async def add_gas_price(web3: Web3) -> int:
+async def send_tx(web3: AsyncWeb3, tx: dict, private_key: str, nonce_manager: NonceManager = nonces) -> HexBytes:
+    address = tx.get('from') or web3.eth.account.from_key(private_key).address
     try:
-        gas_price = web3.eth.gas_price
-        gas_price = int(gas_price * uniform(1.01, 1.02))
-        return gas_price
+        signed_tx = web3.eth.account.sign_transaction(tx, private_key)
+        raw_tx_hash = await web3.eth.send_raw_transaction(signed_tx.rawTransaction)
     except Exception as ex:
-        logger.error(f'Something went wrong | {ex}')
-
-
-async def add_gas_limit(web3: Web3, tx: dict) -> int:
-    tx['value'] = 0
-    gas_limit = web3.eth.estimate_gas(tx)
-    return gas_limit
+        if not is_nonce_error(ex):
+            nonce_manager.release(web3, address, tx['nonce'])
+            raise
+        logger.warning(f'Nonce {tx["nonce"]} rejected, resyncing | {ex}')
+        nonce_manager.resync(web3, address)
+        tx['nonce'] = await nonce_manager.next_nonce(web3, address)
+        signed_tx = web3.eth.account.sign_transaction(tx, private_key)
+        raw_tx_hash = await web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+    nonce_manager.mark_sent(web3, address, tx['nonce'])
+    gas_profiles.track(web3.to_hex(raw_tx_hash), gas_profiles.template(web3, tx))
+    get_tracker(web3).track(web3.to_hex(raw_tx_hash))
+    return raw_tx_hash
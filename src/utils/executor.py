@@ -0,0 +1,231 @@
+from time import monotonic
+from typing import (
+    Awaitable,
+    Callable,
+    Any,
+)
+
+from asyncio import (
+    create_task,
+    sleep,
+    Task,
+)
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils.gas_profiles import gas_profiles
+from src.utils.allowances import allowance_cache
+from src.utils.journal import current_step
+from src.utils.rpc import current_module
+
+from src.utils.fees import (
+    FeeStrategy,
+    fee_strategy,
+    bump_fees,
+)
+from src.utils.retry import (
+    RetryPolicy,
+    retry_policy,
+    retry_stats,
+    classify,
+    ALLOWANCE,
+    TRANSIENT,
+    UNDERPRICED,
+    UNKNOWN,
+    REVERT,
+    NONCE,
+    KNOWN,
+)
+from src.utils.nonce import (
+    NonceManager,
+    nonces,
+)
+from src.utils.supervisor import (
+    PendingSupervisor,
+    pending_supervisor,
+)
+from src.utils.data import (
+    check_allowance,
+    send_tx,
+)
+from src.utils.calldata import (
+    encode_call,
+    build_tx,
+)
+
+STAGES = ('nonce', 'fees', 'send', 'confirm')
+APPROVE = 'approve(address,uint256)'
+MAX_APPROVAL = 10 ** 77
+
+stage_listeners: list[Callable[[str, str, float], None]] = []
+
+
+class StageTimings:
+    def __init__(self) -> None:
+        self.durations: dict[str, list[float]] = {}
+
+    def record(self, _: str, stage: str, elapsed: float) -> None:
+        self.durations.setdefault(stage, []).append(elapsed)
+
+    def report(self) -> list[str]:
+        lines = []
+        for stage in STAGES:
+            durations = sorted(self.durations.get(stage, []))
+            if durations:
+                lines.append(f'{stage} | calls: {len(durations)}, p50: {durations[len(durations) // 2] * 1000:.1f}ms, '
+                             f'max: {durations[-1] * 1000:.1f}ms, total: {sum(durations):.1f}s')
+        return lines
+
+
+stage_timings = StageTimings()
+stage_listeners.append(stage_timings.record)
+
+
+class TxExecutor:
+    def __init__(self, web3: AsyncWeb3, private_key: str, fees: FeeStrategy = fee_strategy,
+                 gas: Callable[[AsyncWeb3, dict], int | None] = gas_profiles.limit_for,
+                 nonce_manager: NonceManager = nonces,
+                 confirm: PendingSupervisor = pending_supervisor,
+                 retry: RetryPolicy = retry_policy) -> None:
+        self.web3 = web3
+        self.private_key = private_key
+        self.address = web3.eth.account.from_key(private_key).address
+        self.fees = fees
+        self.gas = gas
+        self.nonces = nonce_manager
+        self.confirm = confirm
+        self.retry = retry
+        self.confirming: set[Task] = set()
+
+    async def stage(self, name: str, coro: Awaitable[Any]) -> Any:
+        started = monotonic()
+        try:
+            return await coro
+        finally:
+            elapsed = monotonic() - started
+            for listener in stage_listeners:
+                listener(current_module.get(), name, elapsed)
+
+    async def fill(self, tx: dict) -> None:
+        fees = await self.fees.quote(self.web3, tx, self.gas(self.web3, tx))
+        tx.update(fees.fields())
+
+    async def resend(self, tx: dict) -> str:
+        signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
+        tx_hash = self.web3.to_hex(await self.web3.eth.send_raw_transaction(signed_tx.rawTransaction))
+        gas_profiles.track(tx_hash, gas_profiles.template(self.web3, tx))
+        return tx_hash
+
+    async def confirm_in_background(self, tx: dict, tx_hash: str) -> str | None:
+        try:
+            mined = await self.stage('confirm', self.confirm.confirm(self.web3, tx, tx_hash, self.resend))
+        except Exception as ex:
+            logger.warning(f'Could not confirm {tx_hash} | {ex}')
+            return None
+        if mined is None:
+            logger.warning(f'{tx_hash} was not confirmed, transactions queued behind it may stall')
+        return mined
+
+    def demote_endpoint(self) -> None:
+        endpoints = getattr(self.web3.provider, 'endpoints', None)
+        if endpoints is not None:
+            endpoints.demote_primary()
+
+    async def recover_allowance(self, tx: dict, rebuild: Callable[[], Awaitable[dict]] | None,
+                                approval: tuple[str, str, int] | None) -> dict | None:
+        if approval is None or rebuild is None:
+            return None
+        token, spender, amount = approval
+        if not allowance_cache.invalidate(self.address, token, spender):
+            return None
+        logger.warning('Cached allowance is stale, re-checking it on-chain')
+        self.nonces.release(self.web3, self.address, tx['nonce'])
+        await self.approve(token, spender, amount)
+        return await rebuild()
+
+    async def approve(self, token: str, spender: str, amount: int) -> str | None:
+        spender = self.web3.to_checksum_address(spender)
+        allowance = await check_allowance(self.web3, token, self.address, spender)
+        if allowance is not None and amount <= allowance:
+            return None
+
+        logger.debug('Approving token...')
+        tx = await build_tx(self.web3, token, encode_call(APPROVE, [spender, MAX_APPROVAL]),
+                            {'from': self.address, 'value': 0})
+        # Dropped before sending; the Approval log in the receipt stores the new allowance
+        allowance_cache.invalidate(self.address, token, spender)
+        step = current_step.set('approve')
+        try:
+            # The caller's transaction goes out at the next nonce while this one is confirmed in the background
+            tx_hash = await self.execute(tx, wait=False)
+        finally:
+            current_step.reset(step)
+        if tx_hash:
+            logger.info(f'Token approved | Tx hash: {tx_hash}')
+        return tx_hash
+
+    async def execute(self, tx: dict, rebuild: Callable[[], Awaitable[dict]] | None = None,
+                      approval: tuple[str, str, int] | None = None, wait: bool = True) -> str | None:
+        attempt, filled, maybe_sent, tx_hash, recovered = 0, False, False, None, False
+        while True:
+            started, sending = monotonic(), False
+            try:
+                if tx_hash is None:
+                    if 'nonce' not in tx:
+                        tx['nonce'] = await self.stage('nonce', self.nonces.next_nonce(self.web3, self.address))
+                    if not filled:
+                        await self.stage('fees', self.fill(tx))
+                        filled = True
+                    sending = True
+                    raw_tx_hash = await self.stage('send', send_tx(self.web3, tx, self.private_key, self.nonces))
+                    tx_hash = self.web3.to_hex(raw_tx_hash)
+                if not wait:
+                    task = create_task(self.confirm_in_background(tx, tx_hash))
+                    self.confirming.add(task)
+                    task.add_done_callback(self.confirming.discard)
+                    return tx_hash
+                return await self.stage('confirm', self.confirm.confirm(self.web3, tx, tx_hash, self.resend))
+            except Exception as ex:
+                error = classify(ex)
+                if error == KNOWN and sending:
+                    tx_hash = self.web3.to_hex(self.web3.eth.account.sign_transaction(tx, self.private_key).hash)
+                    retry_stats.record(error, monotonic() - started, True)
+                    continue
+                if error == ALLOWANCE and recovered:
+                    # The fresh approval did not help either, so the call itself is failing
+                    error = REVERT
+                    logger.error(f'Transaction still fails after re-approving | {ex}')
+                elif error == ALLOWANCE:
+                    rebuilt = await self.recover_allowance(tx, rebuild, approval)
+                    if rebuilt is not None:
+                        attempt, recovered = attempt + 1, True
+                        retry_stats.record(error, monotonic() - started, True)
+                        tx, filled = rebuilt, False
+                        continue
+                    logger.error('Not enough money for transaction')
+                else:
+                    logger.error(f'Something went wrong {ex}')
+
+                attempt += 1
+                delay = self.retry.delay(error, attempt)
+                if tx_hash is not None and error != TRANSIENT or maybe_sent and error == NONCE:
+                    # Never re-broadcast once the first copy may have landed
+                    delay = None
+                retry_stats.record(error, monotonic() - started + (delay or 0.0), delay is not None)
+                if delay is None:
+                    if not sending and tx_hash is None and 'nonce' in tx:
+                        self.nonces.release(self.web3, self.address, tx['nonce'])
+                    return None
+
+                if error == TRANSIENT:
+                    self.demote_endpoint()
+                if sending and tx_hash is None and error in (TRANSIENT, UNKNOWN):
+                    maybe_sent = True
+                elif error == NONCE:
+                    self.nonces.resync(self.web3, self.address)
+                    tx.pop('nonce', None)
+                elif error == UNDERPRICED:
+                    bump_fees(tx)
+                logger.debug(f'Retrying after {error} error in {delay:.1f}s')
+                await sleep(delay)
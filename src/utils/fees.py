@@ -0,0 +1,123 @@
+from asyncio import gather
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils.block_cache import (
+    get_block_cache,
+    get_gas_price,
+)
+from src.utils.chains import LINEA
+
+from src.utils.rpc import (
+    batch_request,
+    to_rpc_tx,
+)
+
+BASE_FEE_MULTIPLIER = 2
+BUMP_FACTOR = 1.15
+FEE_FIELDS = ('maxFeePerGas', 'maxPriorityFeePerGas', 'gasPrice')
+LINEA_ESTIMATE_CHAINS = (LINEA.chain_id,)
+UNSUPPORTED_ERRORS = ('-32601', 'method not found', 'does not exist', 'not supported')
+
+
+def is_unsupported_error(ex: Exception) -> bool:
+    message = str(ex).lower()
+    return any(error in message for error in UNSUPPORTED_ERRORS)
+
+
+def bump_fees(tx: dict, factor: float = BUMP_FACTOR) -> None:
+    for field in FEE_FIELDS:
+        if field in tx:
+            tx[field] = int(tx[field] * factor)
+
+
+def estimate_params(tx: dict) -> dict:
+    return to_rpc_tx({key: value for key, value in tx.items() if key in ('from', 'to', 'value', 'data')})
+
+
+class Fees:
+    def __init__(self, base_fee: int, priority_fee: int, gas_limit: int | None = None) -> None:
+        self.base_fee = base_fee
+        self.priority_fee = priority_fee
+        self.gas_limit = gas_limit
+
+    def fields(self) -> dict:
+        fields = {
+            'maxFeePerGas': self.base_fee * BASE_FEE_MULTIPLIER + self.priority_fee,
+            'maxPriorityFeePerGas': self.priority_fee,
+        }
+        if self.gas_limit is not None:
+            fields['gas'] = self.gas_limit
+        return fields
+
+
+class LegacyFees:
+    def __init__(self, gas_price: int, gas_limit: int) -> None:
+        self.gas_price = gas_price
+        self.gas_limit = gas_limit
+
+    def fields(self) -> dict:
+        return {'gasPrice': self.gas_price, 'gas': self.gas_limit}
+
+
+class FeeStrategy:
+    def __init__(self) -> None:
+        self.unsupported: set[int] = set()
+        self.linea_quotes = 0
+        self.history_quotes = 0
+
+    async def linea_estimate(self, web3: AsyncWeb3, tx: dict) -> Fees | None:
+        chain_id = getattr(web3.provider, 'chain_id', None) or tx.get('chainId')
+        if chain_id not in LINEA_ESTIMATE_CHAINS or chain_id in self.unsupported:
+            return None
+        try:
+            (estimate,) = await batch_request(web3, [('linea_estimateGas', [estimate_params(tx)])])
+        except ValueError as ex:
+            if not is_unsupported_error(ex):
+                raise
+            logger.warning(f'linea_estimateGas is not available, using eth_feeHistory | {ex}')
+            self.unsupported.add(chain_id)
+            return None
+        self.linea_quotes += 1
+        return Fees(int(estimate['baseFeePerGas'], 16), int(estimate['priorityFeePerGas'], 16),
+                    int(estimate['gasLimit'], 16))
+
+    async def history(self, web3: AsyncWeb3) -> Fees:
+        block = await get_block_cache(web3).get()
+        base_fee = block.next_base_fee or 0
+        priority_fee = block.priority_fee
+        if priority_fee is None:
+            priority_fee = max(block.gas_price - base_fee, 0)
+        self.history_quotes += 1
+        return Fees(base_fee, priority_fee)
+
+    async def quote(self, web3: AsyncWeb3, tx: dict, gas_limit: int | None = None) -> Fees:
+        if gas_limit is None:
+            fees = await self.linea_estimate(web3, tx)
+            if fees is not None:
+                return fees
+            fees, (estimate,) = await gather(
+                self.history(web3),
+                batch_request(web3, [('eth_estimateGas', [estimate_params(tx), 'pending'])]),
+            )
+            fees.gas_limit = int(estimate, 16)
+            return fees
+        fees = await self.history(web3)
+        fees.gas_limit = gas_limit
+        return fees
+
+    def __str__(self) -> str:
+        return f'linea_estimateGas quotes: {self.linea_quotes}, fee history quotes: {self.history_quotes}'
+
+
+class LegacyFeeStrategy(FeeStrategy):
+    async def quote(self, web3: AsyncWeb3, tx: dict, gas_limit: int | None = None) -> LegacyFees:
+        gas_price = await get_gas_price(web3)
+        if gas_limit is None:
+            gas_limit = await web3.eth.estimate_gas(tx)
+        return LegacyFees(gas_price, gas_limit)
+
+
+fee_strategy = FeeStrategy()
+legacy_fee_strategy = LegacyFeeStrategy()
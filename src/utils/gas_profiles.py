@@ -0,0 +1,101 @@
+from collections import deque
+import json
+import os
+
+from web3 import AsyncWeb3
+
+from src.modules.swaps.tokens import tokens
+from src.utils.receipts import receipt_listeners
+from src.utils.rpc import current_module
+from config import GAS_PROFILE_PATH
+
+MIN_SAMPLES = 3
+MAX_SAMPLES = 50
+GAS_MARGIN = 1.2
+
+# Token addresses as they appear in ABI-encoded calldata, at any offset
+TOKEN_WORDS = {bytes.fromhex(address[2:]).rjust(32, b'\0'): symbol for symbol, address in tokens.items()}
+
+
+def token_path(data: str) -> str:
+    payload = bytes.fromhex(data[2:])
+    found = sorted((payload.find(word), symbol) for word, symbol in TOKEN_WORDS.items() if word in payload)
+    return '>'.join(symbol for _, symbol in found)
+
+
+def percentile(samples: list[int], share: float) -> int:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+class GasProfiles:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.samples: dict[str, deque[int]] = {}
+        self.reverted: set[str] = set()
+        self.pending: dict[str, str] = {}
+        self.served = 0
+        self.estimated = 0
+        self.dirty = False
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for template, profile in json.load(f).items():
+                    self.samples[template] = deque(profile['samples'], maxlen=MAX_SAMPLES)
+
+    @staticmethod
+    def template(web3: AsyncWeb3, tx: dict) -> str:
+        chain_id = getattr(web3.provider, 'chain_id', None) or tx.get('chainId')
+        data = tx.get('data') or '0x'
+        return (f'{chain_id}:{current_module.get()}:{str(tx.get("to")).lower()}:{data[:10]}:{token_path(data)}:'
+                f'{len(data)}')
+
+    def flush(self) -> None:
+        if not self.path or not self.dirty:
+            return
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({template: {'samples': list(samples), **self.stats(template)}
+                       for template, samples in self.samples.items()}, f, indent=2)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+    def stats(self, template: str) -> dict[str, int]:
+        samples = list(self.samples[template])
+        return {'p50': percentile(samples, 0.5), 'p99': percentile(samples, 0.99)}
+
+    def limit(self, template: str) -> int | None:
+        samples = self.samples.get(template)
+        if template in self.reverted or samples is None or len(samples) < MIN_SAMPLES:
+            self.estimated += 1
+            return None
+        self.served += 1
+        return int(percentile(list(samples), 0.99) * GAS_MARGIN)
+
+    def limit_for(self, web3: AsyncWeb3, tx: dict) -> int | None:
+        return self.limit(self.template(web3, tx))
+
+    def track(self, tx_hash: str, template: str) -> None:
+        self.pending[tx_hash.lower()] = template
+
+    def observe_receipt(self, tx_hash: str, receipt: dict) -> None:
+        template = self.pending.pop(tx_hash.lower(), None)
+        if template is None:
+            return
+        if receipt.get('status') != 1:
+            self.reverted.add(template)
+            return
+        self.reverted.discard(template)
+        self.samples.setdefault(template, deque(maxlen=MAX_SAMPLES)).append(receipt['gasUsed'])
+        self.dirty = True
+
+    def report(self) -> list[str]:
+        return [f'{template} | samples: {len(samples)}, p50: {stats["p50"]}, p99: {stats["p99"]}'
+                for template, samples in sorted(self.samples.items())
+                for stats in (self.stats(template),)]
+
+    def __str__(self) -> str:
+        return f'templates: {len(self.samples)}, limits served: {self.served}, live estimates: {self.estimated}'
+
+
+gas_profiles = GasProfiles(GAS_PROFILE_PATH)
+receipt_listeners.append(gas_profiles.observe_receipt)
@@ -0,0 +1,181 @@
+from contextvars import ContextVar
+from time import time
+import sqlite3
+
+from web3.exceptions import (
+    TransactionNotFound,
+    TimeExhausted,
+)
+from eth_utils import keccak
+from loguru import logger
+
+from src.utils.chains import chain_mapping
+
+from src.utils.receipts import (
+    receipt_listeners,
+    wait_for_receipt,
+)
+from src.utils.rpc import (
+    send_listeners,
+    current_module,
+)
+
+current_wallet: ContextVar[str | None] = ContextVar('current_wallet', default=None)
+current_step: ContextVar[str] = ContextVar('current_step', default='tx')
+
+RECEIPT_TIMEOUT = 180
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    finished REAL
+);
+CREATE TABLE IF NOT EXISTS journal (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL,
+    wallet TEXT NOT NULL,
+    module TEXT NOT NULL,
+    step TEXT NOT NULL,
+    chain_id INTEGER,
+    tx_hash TEXT,
+    status TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS journal_run ON journal (run_id);
+'''
+
+
+class RunJournal:
+    def __init__(self, path: str) -> None:
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+        self.modules = {}
+        self.txs = {}
+        self.hashes = {}
+        self.run_id = self._open_run()
+
+    def _open_run(self) -> int:
+        row = self.connection.execute(
+            'SELECT id FROM runs WHERE finished IS NULL ORDER BY id DESC LIMIT 1'
+        ).fetchone()
+        if row is None:
+            return self.connection.execute('INSERT INTO runs (started) VALUES (?)', (time(),)).lastrowid
+
+        rows = self.connection.execute(
+            'SELECT wallet, module, step, chain_id, tx_hash, status FROM journal WHERE run_id = ? ORDER BY id',
+            (row[0],)
+        ).fetchall()
+        for wallet, module, step, chain_id, tx_hash, status in rows:
+            self._apply(wallet, module, step, chain_id, tx_hash, status)
+        done = sum(1 for status in self.modules.values() if status == 'done')
+        logger.info(f'Resuming run {row[0]} | {done} completed modules, {len(self.pending())} pending transactions')
+        return row[0]
+
+    def _apply(self, wallet: str, module: str, step: str, chain_id: int | None, tx_hash: str | None,
+               status: str) -> None:
+        if step == 'cycle':
+            self.modules = {key: value for key, value in self.modules.items() if key[0] != wallet}
+            self.txs = {key: value for key, value in self.txs.items() if key[0] != wallet}
+            self.hashes = {key: value for key, value in self.hashes.items() if value[0] != wallet}
+        elif step == 'module':
+            self.modules[(wallet, module)] = status
+        else:
+            self.txs.setdefault((wallet, module), {})[tx_hash] = (step, chain_id, status)
+            self.hashes[tx_hash] = (wallet, module, step, chain_id)
+
+    def record(self, wallet: str, module: str, step: str, status: str, chain_id: int | None = None,
+               tx_hash: str | None = None) -> None:
+        self.connection.execute(
+            'INSERT INTO journal (run_id, wallet, module, step, chain_id, tx_hash, status, created) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (self.run_id, wallet, module, step, chain_id, tx_hash, status, time())
+        )
+        self._apply(wallet, module, step, chain_id, tx_hash, status)
+
+    def record_raw_tx(self, chain_id: int | None, raw_tx: str) -> None:
+        wallet = current_wallet.get()
+        if wallet is None:
+            return
+        raw_tx = raw_tx if isinstance(raw_tx, str) else raw_tx.hex()
+        tx_hash = '0x' + keccak(hexstr=raw_tx).hex()
+        self.record(wallet, current_module.get(), current_step.get(), 'pending', chain_id, tx_hash)
+
+    def record_receipt(self, tx_hash: str, receipt: dict) -> None:
+        if tx_hash in self.hashes:
+            wallet, module, step, chain_id = self.hashes[tx_hash]
+            status = 'confirmed' if receipt['status'] == 1 else 'failed'
+            self.record(wallet, module, step, status, chain_id, tx_hash)
+
+    def pending(self, wallet: str | None = None, module: str | None = None) -> list[tuple[str, str, str, int, str]]:
+        return [
+            (key[0], key[1], tx_hash, chain_id, step)
+            for key, txs in self.txs.items()
+            if (wallet is None or key[0] == wallet) and (module is None or key[1] == module)
+            for tx_hash, (step, chain_id, status) in txs.items() if status == 'pending'
+        ]
+
+    def is_done(self, wallet: str, module: str) -> bool:
+        return self.modules.get((wallet, module)) == 'done'
+
+    def start_module(self, wallet: str, module: str) -> None:
+        self.record(wallet, module, 'module', 'started')
+
+    def finish_module(self, wallet: str, module: str) -> None:
+        self.record(wallet, module, 'module', 'done')
+
+    def finish_cycle(self, wallet: str) -> None:
+        self.record(wallet, '', 'cycle', 'done')
+
+    async def reconcile(self, wallet: str, module: str) -> bool:
+        if self.is_done(wallet, module):
+            return True
+
+        landed, in_doubt = False, False
+        for _, _, tx_hash, chain_id, step in self.pending(wallet, module):
+            status = await get_tx_status(chain_id, tx_hash)
+            if status == 'dropped':
+                self.record(wallet, module, step, status, chain_id, tx_hash)
+            logger.info(f'{wallet} | {module} {step} {tx_hash} reconciled as {status}')
+            if step != 'approve':
+                landed = landed or status == 'confirmed'
+                in_doubt = in_doubt or status in ('pending', 'unknown')
+
+        if landed:
+            self.finish_module(wallet, module)
+        elif in_doubt:
+            logger.warning(f'{wallet} | {module} has an unresolved transaction, not resending it')
+        return landed or in_doubt
+
+    def finish(self) -> None:
+        self.connection.execute('UPDATE runs SET finished = ? WHERE id = ?', (time(), self.run_id))
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+async def get_tx_status(chain_id: int | None, tx_hash: str) -> str:
+    chain = next((chain for chain in chain_mapping.values() if chain.chain_id == chain_id), None)
+    if chain is None:
+        return 'unknown'
+    web3 = chain.w3
+    try:
+        await web3.eth.get_transaction(tx_hash)
+    except TransactionNotFound:
+        return 'dropped'
+    try:
+        receipt = await wait_for_receipt(web3, tx_hash, timeout=RECEIPT_TIMEOUT)
+    except TimeExhausted:
+        return 'pending'
+    return 'confirmed' if receipt['status'] == 1 else 'failed'
+
+
+def open_journal(path: str) -> RunJournal | None:
+    if not path:
+        return None
+    journal = RunJournal(path)
+    send_listeners.append(journal.record_raw_tx)
+    receipt_listeners.append(journal.record_receipt)
+    return journal
@@ -13,6 +13,7 @@ module_handlers = {
     'syncswap_liq': process_syncswap_liquidity,
     'syncswap_liq_remove': process_syncswap_liquidity_remove,
     'horizon_dex_swap': process_horizondex_swap,
+    'best_swap': process_best_swap,
     'sync_swap_liq': process_syncswap_liquidity,
     'sync_swap_liq_remove': process_syncswap_liquidity_remove
 }
@@ -0,0 +1,33 @@
+from asyncio import gather
+
+from eth_utils import function_signature_to_4byte_selector
+from eth_abi import encode, decode
+from web3 import AsyncWeb3
+
+from src.utils.rpc import batch_request
+
+MULTICALL3 = '0xcA11bde05977b3631167028862bE2a173976CA11'
+CALLS_PER_MULTICALL = 300
+MULTICALLS_PER_BATCH = 5
+
+AGGREGATE3 = function_signature_to_4byte_selector('aggregate3((address,bool,bytes)[])')
+
+
+async def multicall(web3: AsyncWeb3, calls: list[tuple[str, bytes]]) -> list[bytes | None]:
+    chunks = [calls[i:i + CALLS_PER_MULTICALL] for i in range(0, len(calls), CALLS_PER_MULTICALL)]
+    requests = [
+        ('eth_call', [{
+            'to': MULTICALL3,
+            'data': '0x' + (AGGREGATE3 + encode(['(address,bool,bytes)[]'],
+                                                [[(target, True, data) for target, data in chunk]])).hex()
+        }, 'latest'])
+        for chunk in chunks
+    ]
+    batches = [requests[i:i + MULTICALLS_PER_BATCH] for i in range(0, len(requests), MULTICALLS_PER_BATCH)]
+    results = await gather(*[batch_request(web3, batch) for batch in batches])
+
+    values = []
+    for raw_result in (result for batch in results for result in batch):
+        for success, return_data in decode(['(bool,bytes)[]'], bytes.fromhex(raw_result[2:]))[0]:
+            values.append(return_data if success and return_data else None)
+    return values
@@ -0,0 +1,52 @@
+from asyncio import Lock
+
+from web3 import AsyncWeb3
+
+# A replacement that is underpriced means the nonce is taken by our own pending tx, not that it is stale
+NONCE_ERRORS = ('nonce too low',)
+
+
+def is_nonce_error(ex: Exception) -> bool:
+    message = str(ex).lower()
+    return any(error in message for error in NONCE_ERRORS)
+
+
+class NonceManager:
+    def __init__(self) -> None:
+        self.nonces = {}
+        self.locks = {}
+
+    @staticmethod
+    def key(web3: AsyncWeb3, address: str) -> tuple[int, str]:
+        return getattr(web3.provider, 'chain_id', None) or id(web3), address.lower()
+
+    async def next_nonce(self, web3: AsyncWeb3, address: str) -> int:
+        key = self.key(web3, address)
+        async with self.locks.setdefault(key, Lock()):
+            if key not in self.nonces:
+                self.nonces[key] = await web3.eth.get_transaction_count(address, 'pending')
+            nonce = self.nonces[key]
+            self.nonces[key] += 1
+            return nonce
+
+    def release(self, web3: AsyncWeb3, address: str, nonce: int) -> None:
+        key = self.key(web3, address)
+        if self.nonces.get(key) == nonce + 1:
+            self.nonces[key] = nonce
+        else:
+            self.nonces.pop(key, None)
+
+    def mark_sent(self, web3: AsyncWeb3, address: str, nonce: int) -> None:
+        key = self.key(web3, address)
+        if key in self.nonces and self.nonces[key] <= nonce:
+            self.nonces[key] = nonce + 1
+
+    def resync(self, web3: AsyncWeb3, address: str) -> None:
+        self.nonces.pop(self.key(web3, address), None)
+
+    def reset(self, address: str) -> None:
+        address = address.lower()
+        self.nonces = {key: value for key, value in self.nonces.items() if key[1] != address}
+
+
+nonces = NonceManager()
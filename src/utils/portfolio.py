@@ -0,0 +1,159 @@
+from asyncio import gather
+
+from eth_utils import function_signature_to_4byte_selector
+from eth_abi import encode, decode
+from eth_account import Account
+from loguru import logger
+
+from src.utils.block_cache import get_gas_price
+from src.utils.rpc import send_listeners
+from src.utils.chains import LINEA
+
+from src.utils.multicall import (
+    MULTICALL3,
+    multicall,
+)
+
+from src.modules.swaps.tokens import (
+    liquidity_tokens,
+    routers,
+    tokens,
+)
+
+from config import (
+    HorizonDexSwapConfig,
+    EchoDexSwapConfig,
+    OrbiterBridgeConfig,
+    EchoDexLiqConfig,
+    SyncSwapLiqConfig,
+    LineaSwapConfig,
+    BestSwapConfig,
+    LineaLiqConfig,
+    SyncSwapConfig,
+)
+
+GET_ETH_BALANCE = function_signature_to_4byte_selector('getEthBalance(address)')
+BALANCE_OF = function_signature_to_4byte_selector('balanceOf(address)')
+ALLOWANCE = function_signature_to_4byte_selector('allowance(address,address)')
+
+# Covers an approve plus the module's own transaction
+GAS_PER_MODULE = 300000
+
+
+class PortfolioSnapshot:
+    def __init__(self) -> None:
+        self.balances = {}
+        self.allowances = {}
+
+    def balance(self, address: str, token_address: str | None) -> int | None:
+        return self.balances.get((address.lower(), token_address.lower() if token_address else None))
+
+    def allowance(self, address: str, token_address: str, spender: str) -> int | None:
+        return self.allowances.get((address.lower(), token_address.lower(), spender.lower()))
+
+    def invalidate(self, address: str) -> None:
+        address = address.lower()
+        self.balances = {key: value for key, value in self.balances.items() if key[0] != address}
+        self.allowances = {key: value for key, value in self.allowances.items() if key[0] != address}
+
+    def invalidate_raw_tx(self, _: int | None, raw_tx: str) -> None:
+        if self.balances or self.allowances:
+            self.invalidate(Account.recover_transaction(raw_tx))
+
+
+snapshot = PortfolioSnapshot()
+send_listeners.append(snapshot.invalidate_raw_tx)
+
+
+def get_snapshot_tokens() -> list[str]:
+    token_addresses = list(tokens.values())
+    for pools in liquidity_tokens.values():
+        for pairs in pools.values():
+            token_addresses.extend(pairs.values())
+    return list(dict.fromkeys(address.lower() for address in token_addresses))
+
+
+async def aggregate(calls: list[tuple[str, bytes]]) -> list[int | None]:
+    values = await multicall(LINEA.w3, calls)
+    return [decode(['uint256'], value)[0] if value is not None and len(value) >= 32 else None for value in values]
+
+
+async def take_snapshot(addresses: list[str]) -> PortfolioSnapshot:
+    token_addresses = get_snapshot_tokens()
+    keys, calls = [], []
+    for address in addresses:
+        keys.append(('balance', (address.lower(), None)))
+        calls.append((MULTICALL3, GET_ETH_BALANCE + encode(['address'], [address])))
+        for token_address in token_addresses:
+            keys.append(('balance', (address.lower(), token_address)))
+            calls.append((token_address, BALANCE_OF + encode(['address'], [address])))
+            for spender in routers.values():
+                keys.append(('allowance', (address.lower(), token_address, spender.lower())))
+                calls.append((token_address, ALLOWANCE + encode(['address', 'address'], [address, spender])))
+
+    values = await aggregate(calls)
+    snapshot.balances, snapshot.allowances = {}, {}
+    for (kind, key), value in zip(keys, values):
+        if value is None:
+            continue
+        if kind == 'balance':
+            snapshot.balances[key] = value
+        else:
+            snapshot.allowances[key] = value
+    return snapshot
+
+
+def get_required_eth(active_modules: list[str], gas_price: int) -> int:
+    required = len(active_modules) * GAS_PER_MODULE * gas_price
+    swaps = {
+        'linea_swap': LineaSwapConfig,
+        'echo_dex_swap': EchoDexSwapConfig,
+        'sync_swap': SyncSwapConfig,
+        'horizon_dex_swap': HorizonDexSwapConfig,
+        'best_swap': BestSwapConfig,
+    }
+    liquidity = {
+        'linea_liq': LineaLiqConfig,
+        'echo_dex_liq': EchoDexLiqConfig,
+        'sync_swap_liq': SyncSwapLiqConfig,
+    }
+    for module in active_modules:
+        if module in swaps and swaps[module].from_token.upper() == 'ETH':
+            required += int(swaps[module].amount_from * 10 ** 18)
+        elif module in liquidity and liquidity[module].token.upper() == 'ETH':
+            required += int(liquidity[module].amount_from * 10 ** 18)
+        elif module == 'orbiter_bridge' and OrbiterBridgeConfig.action.lower() == 'withdraw':
+            required += int(OrbiterBridgeConfig.amount_from * 10 ** 18)
+    return required
+
+
+async def preflight(private_keys: list[str], active_modules: list[str]) -> list[str]:
+    bridges_to_linea = ['main_bridge'] if OrbiterBridgeConfig.action.lower() == 'withdraw' else \
+        ['main_bridge', 'orbiter_bridge']
+    linea_modules = [module for module in active_modules if module not in bridges_to_linea]
+    if not linea_modules:
+        return private_keys
+
+    addresses = [Account.from_key(private_key).address for private_key in private_keys]
+    try:
+        _, gas_price = await gather(take_snapshot(addresses), get_gas_price(LINEA.w3))
+    except Exception as ex:
+        logger.error(f'Portfolio snapshot failed, checking balances per wallet | {ex}')
+        return private_keys
+
+    if any(module in bridges_to_linea for module in active_modules):
+        logger.info('A bridge to Linea is active, keeping every wallet regardless of its Linea balance')
+        return private_keys
+
+    required = get_required_eth(linea_modules, gas_price)
+    eligible = []
+    for private_key, address in zip(private_keys, addresses):
+        balance = snapshot.balance(address, None)
+        if balance is not None and balance < required:
+            logger.warning(f'Skipping {address} | Linea balance {balance / 10 ** 18} ETH, '
+                           f'modules need {required / 10 ** 18} ETH including gas')
+            continue
+        eligible.append(private_key)
+
+    logger.info(f'Portfolio snapshot | {len(eligible)}/{len(private_keys)} wallets can afford active modules')
+    return eligible
@@ -0,0 +1,109 @@
+from contextvars import Context
+from typing import Callable
+
+from asyncio import (
+    get_running_loop,
+    TimeoutError,
+    create_task,
+    wait_for,
+    Future,
+    shield,
+    sleep,
+    Task,
+)
+
+from web3.exceptions import TimeExhausted
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils.block_cache import get_block_cache
+from src.utils.rpc import current_module
+
+POLL_INTERVAL = 1.0
+RECEIPT_TIMEOUT = 300
+INT_FIELDS = ('status', 'blockNumber', 'gasUsed', 'cumulativeGasUsed', 'effectiveGasPrice', 'transactionIndex')
+
+receipt_listeners: list[Callable[[str, dict], None]] = []
+
+
+def parse_receipt(receipt: dict) -> dict:
+    return {key: int(value, 16) if key in INT_FIELDS and isinstance(value, str) else value
+            for key, value in receipt.items()}
+
+
+class ReceiptTracker:
+    def __init__(self, web3: AsyncWeb3, poll_interval: float = POLL_INTERVAL) -> None:
+        self.web3 = web3
+        self.poll_interval = poll_interval
+        self.pending: dict[str, Future] = {}
+        self.last_block: int | None = None
+        self.task: Task | None = None
+        self.polls = 0
+        self.resolved = 0
+
+    def track(self, tx_hash: str) -> Future:
+        tx_hash = tx_hash.lower()
+        future = self.pending.get(tx_hash)
+        if future is None:
+            future = get_running_loop().create_future()
+            self.pending[tx_hash] = future
+        if self.task is None or self.task.done():
+            # The poller outlives the module that started it, so it must not inherit its context
+            self.task = create_task(self.run(), context=Context())
+        return future
+
+    def forget(self, tx_hash: str) -> None:
+        self.pending.pop(tx_hash.lower(), None)
+
+    async def run(self) -> None:
+        current_module.set('receipts')
+        while self.pending:
+            try:
+                block_number = await self.web3.eth.block_number
+                if block_number != self.last_block:
+                    self.last_block = block_number
+                    get_block_cache(self.web3).observe_block(block_number)
+                    await self.poll()
+            except Exception as ex:
+                logger.warning(f'Receipt polling failed | {ex}')
+            if self.pending:
+                await sleep(self.poll_interval)
+
+    async def poll(self) -> None:
+        tx_hashes = list(self.pending)
+        responses = await self.web3.provider.make_batch_request(
+            [('eth_getTransactionReceipt', [tx_hash]) for tx_hash in tx_hashes]
+        )
+        self.polls += 1
+        for tx_hash, response in zip(tx_hashes, responses):
+            if response.get('result') is None:
+                continue
+            receipt = parse_receipt(response['result'])
+            future = self.pending.pop(tx_hash, None)
+            if future is not None and not future.done():
+                future.set_result(receipt)
+            self.resolved += 1
+            for listener in receipt_listeners:
+                listener(tx_hash, receipt)
+
+    def __str__(self) -> str:
+        return f'batched polls: {self.polls}, receipts resolved: {self.resolved}, pending: {len(self.pending)}'
+
+
+trackers: dict[int, ReceiptTracker] = {}
+
+
+def get_tracker(web3: AsyncWeb3) -> ReceiptTracker:
+    key = getattr(web3.provider, 'chain_id', None) or id(web3)
+    if key not in trackers:
+        trackers[key] = ReceiptTracker(web3)
+    return trackers[key]
+
+
+async def wait_for_receipt(web3: AsyncWeb3, tx_hash: str, timeout: float = RECEIPT_TIMEOUT) -> dict:
+    tracker = get_tracker(web3)
+    try:
+        return await wait_for(shield(tracker.track(tx_hash)), timeout=timeout)
+    except TimeoutError:
+        tracker.forget(tx_hash)
+        raise TimeExhausted(f'Transaction {tx_hash} is not in the chain after {timeout} seconds')
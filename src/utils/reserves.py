@@ -0,0 +1,211 @@
+from itertools import combinations
+import json
+import os
+
+from asyncio import (
+    create_task,
+    shield,
+    Task,
+)
+
+from eth_utils import function_signature_to_4byte_selector
+from eth_abi import encode, decode
+from loguru import logger
+
+from src.utils.block_cache import get_block_cache
+from config import SYNCSWAP_POOLS_PATH
+from src.utils.multicall import multicall
+from src.utils.chains import (
+    LINEA,
+    Chain,
+)
+
+from src.modules.swaps.tokens import (
+    routers,
+    tokens,
+)
+
+FACTORY = function_signature_to_4byte_selector('factory()')
+GET_PAIR = function_signature_to_4byte_selector('getPair(address,address)')
+GET_RESERVES = function_signature_to_4byte_selector('getReserves()')
+GET_POOL = function_signature_to_4byte_selector('getPool(address,address)')
+GET_SWAP_FEE = function_signature_to_4byte_selector('getSwapFee(address,address,address,address,bytes)')
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+
+V2_FEES = {
+    routers['LineaSwap']: 30,
+    routers['EchoDex']: 30,
+}
+
+SYNCSWAP_CLASSIC_FACTORY = '0x37BAc764494c8db4e54BDE72f6965beA9fa0AC2d'
+SYNCSWAP_FEE_PRECISION = 100000
+
+
+class Pair:
+    def __init__(self, address: str, token_a: str, token_b: str, fee: int, precision: int = 10000) -> None:
+        self.address = address
+        self.token0, self.token1 = sorted((token_a.lower(), token_b.lower()))
+        self.fee = fee
+        self.precision = precision
+        self.reserve0 = 0
+        self.reserve1 = 0
+
+    def reserves(self, token_in: str) -> tuple[int, int]:
+        if token_in.lower() == self.token0:
+            return self.reserve0, self.reserve1
+        return self.reserve1, self.reserve0
+
+    def amount_out(self, amount_in: int, token_in: str) -> int:
+        reserve_in, reserve_out = self.reserves(token_in)
+        amount_in_with_fee = amount_in * (self.precision - self.fee)
+        return amount_in_with_fee * reserve_out // (reserve_in * self.precision + amount_in_with_fee)
+
+
+class ReserveCache:
+    reserve_types = ['uint112', 'uint112', 'uint32']
+
+    def __init__(self, chain: Chain, fees: dict[str, int]) -> None:
+        self.chain = chain
+        self.fees = {router.lower(): fee for router, fee in fees.items()}
+        self.pairs: dict[tuple[str, str, str], Pair] = {}
+        self.discovered = False
+        self.block: int | None = None
+        self.refreshing: Task | None = None
+        self.refreshes = 0
+        self.quotes = 0
+        self.validated = 0
+        self.max_deviation_bps = 0.0
+
+    async def discover(self) -> None:
+        web3 = self.chain.w3
+        router_addresses = list(self.fees)
+        factories = await multicall(web3, [(router, FACTORY) for router in router_addresses])
+        token_pairs = list(combinations(tokens.values(), 2))
+        keys, calls = [], []
+        for router, factory in zip(router_addresses, factories):
+            if factory is None:
+                continue
+            factory_address = decode(['address'], factory)[0]
+            for token_a, token_b in token_pairs:
+                keys.append((router, token_a, token_b))
+                calls.append((factory_address, GET_PAIR + encode(['address', 'address'], [token_a, token_b])))
+
+        for (router, token_a, token_b), value in zip(keys, await multicall(web3, calls)):
+            pair_address = decode(['address'], value)[0] if value is not None else ZERO_ADDRESS
+            if pair_address == ZERO_ADDRESS:
+                continue
+            pair = Pair(pair_address, token_a, token_b, self.fees[router])
+            self.pairs[(router, pair.token0, pair.token1)] = pair
+        self.discovered = True
+        logger.debug(f'Discovered {len(self.pairs)} V2 pairs')
+
+    async def refresh(self, block_number: int) -> None:
+        try:
+            if not self.discovered:
+                await self.discover()
+            pairs = list(self.pairs.values())
+            values = await multicall(self.chain.w3, [(pair.address, GET_RESERVES) for pair in pairs])
+            for pair, value in zip(pairs, values):
+                if value is not None:
+                    pair.reserve0, pair.reserve1 = decode(self.reserve_types, value)[:2]
+            self.block = block_number
+            self.refreshes += 1
+        finally:
+            self.refreshing = None
+
+    async def get_pair(self, router: str, token_a: str, token_b: str) -> Pair | None:
+        block = await get_block_cache(self.chain.w3).get()
+        if self.block != block.number:
+            if self.refreshing is None:
+                self.refreshing = create_task(self.refresh(block.number))
+            await shield(self.refreshing)
+        return self.pairs.get((router.lower(), *sorted((token_a.lower(), token_b.lower()))))
+
+    async def quote(self, router: str, amount_in: int, token_in: str, token_out: str) -> int | None:
+        if router.lower() not in self.fees:
+            return None
+        try:
+            pair = await self.get_pair(router, token_in, token_out)
+        except Exception as ex:
+            logger.warning(f'Reserve refresh failed, quoting on-chain | {ex}')
+            return None
+        if pair is None or not pair.reserve0 or not pair.reserve1:
+            return None
+        self.quotes += 1
+        return pair.amount_out(amount_in, token_in)
+
+    def validate(self, local: int, onchain: int) -> None:
+        self.validated += 1
+        deviation = abs(local - onchain) / onchain * 10000 if onchain else 0.0
+        self.max_deviation_bps = max(self.max_deviation_bps, deviation)
+        if local != onchain:
+            logger.warning(f'Local quote {local} differs from getAmountsOut {onchain} by {deviation:.2f} bps')
+
+    def __str__(self) -> str:
+        return (f'pairs: {len(self.pairs)}, refreshes: {self.refreshes}, local quotes: {self.quotes}, '
+                f'validated: {self.validated}, max deviation: {self.max_deviation_bps:.2f} bps')
+
+
+class SyncSwapPools(ReserveCache):
+    reserve_types = ['uint256', 'uint256']
+
+    def __init__(self, chain: Chain, router: str, factory: str, path: str) -> None:
+        super().__init__(chain, {router: 0})
+        self.router = router.lower()
+        self.factory = factory
+        self.path = path
+
+    def load_index(self) -> dict:
+        if self.path and os.path.exists(self.path):
+            with open(self.path) as f:
+                index = json.load(f)
+            if index.get('factory') == self.factory:
+                return index
+        return {'factory': self.factory, 'checked': [], 'pools': []}
+
+    def save_index(self, index: dict) -> None:
+        if self.path:
+            temp_path = f'{self.path}.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(index, f, indent=2)
+            os.replace(temp_path, self.path)
+
+    async def discover(self) -> None:
+        web3 = self.chain.w3
+        index = self.load_index()
+        checked = {tuple(pair) for pair in index['checked']}
+        token_pairs = [tuple(sorted((token_a.lower(), token_b.lower())))
+                       for token_a, token_b in combinations(tokens.values(), 2)]
+        unchecked = [pair for pair in token_pairs if pair not in checked]
+
+        if unchecked:
+            values = await multicall(web3, [
+                (self.factory, GET_POOL + encode(['address', 'address'], list(pair))) for pair in unchecked
+            ])
+            found = [(decode(['address'], value)[0], pair) for pair, value in zip(unchecked, values)
+                     if value is not None and decode(['address'], value)[0] != ZERO_ADDRESS]
+            fees = await multicall(web3, [
+                (self.factory, GET_SWAP_FEE + encode(['address', 'address', 'address', 'address', 'bytes'],
+                                                     [address, ZERO_ADDRESS, token0, token1, b'']))
+                for address, (token0, token1) in found
+            ])
+            for (address, (token0, token1)), fee in zip(found, fees):
+                if fee is not None:
+                    index['pools'].append({'address': address, 'token0': token0, 'token1': token1,
+                                           'fee': decode(['uint24'], fee)[0]})
+            index['checked'] += [list(pair) for pair in unchecked]
+            self.save_index(index)
+
+        for entry in index['pools']:
+            pair = Pair(entry['address'], entry['token0'], entry['token1'], entry['fee'], SYNCSWAP_FEE_PRECISION)
+            self.pairs[(self.router, pair.token0, pair.token1)] = pair
+        self.discovered = True
+        logger.debug(f'Loaded {len(self.pairs)} SyncSwap pools, {len(unchecked)} pairs looked up on-chain')
+
+    async def get_pool_address(self, token_a: str, token_b: str) -> str | None:
+        pair = await self.get_pair(self.router, token_a, token_b)
+        return pair.address if pair is not None else None
+
+
+reserve_cache = ReserveCache(LINEA, V2_FEES)
+syncswap_pools = SyncSwapPools(LINEA, routers['SyncSwap'], SYNCSWAP_CLASSIC_FACTORY, SYNCSWAP_POOLS_PATH)
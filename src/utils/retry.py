@@ -0,0 +1,84 @@
+from asyncio import TimeoutError
+import random
+
+from web3.exceptions import ContractLogicError
+from aiohttp import ClientError
+
+from src.utils.allowances import ALLOWANCE_ERRORS
+from src.utils.nonce import NONCE_ERRORS
+
+RETRY_ATTEMPTS = 3
+BASE_DELAY = 2.0
+MAX_DELAY = 20.0
+
+TRANSIENT = 'transient'
+NONCE = 'nonce'
+UNDERPRICED = 'underpriced'
+ALLOWANCE = 'allowance'
+KNOWN = 'known'
+FUNDS = 'funds'
+REVERT = 'revert'
+UNKNOWN = 'unknown'
+
+# Checked in order: allowance messages overlap with the revert ones
+ERROR_CLASSES = (
+    (ALLOWANCE, ALLOWANCE_ERRORS),
+    (KNOWN, ('already known', 'known transaction', 'already imported')),
+    (FUNDS, ('insufficient funds',)),
+    (NONCE, NONCE_ERRORS),
+    (UNDERPRICED, ('transaction underpriced', 'replacement underpriced', 'fee too low', 'gas price too low',
+                   'less than block base fee', 'max fee per gas less than')),
+    (REVERT, ('execution reverted', 'reverted', 'invalid opcode')),
+    (TRANSIENT, ('timeout', 'timed out', 'too many requests', 'rate limit', 'header not found', '-32005',
+                 'service unavailable', 'bad gateway', 'connection')),
+)
+FAIL_FAST = (ALLOWANCE, FUNDS, REVERT)
+
+
+def classify(ex: Exception) -> str:
+    if isinstance(ex, ContractLogicError):
+        return REVERT
+    if isinstance(ex, (TimeoutError, ClientError, ConnectionError)):
+        return TRANSIENT
+    message = str(ex).lower()
+    for error, fragments in ERROR_CLASSES:
+        if any(fragment in message for fragment in fragments):
+            return error
+    return UNKNOWN
+
+
+class RetryPolicy:
+    def __init__(self, attempts: int = RETRY_ATTEMPTS, base_delay: float = BASE_DELAY,
+                 max_delay: float = MAX_DELAY) -> None:
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, error: str, attempt: int) -> float | None:
+        if error in FAIL_FAST or attempt >= self.attempts:
+            return None
+        if error in (TRANSIENT, NONCE, UNDERPRICED):
+            return 0.0
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class RetryStats:
+    def __init__(self) -> None:
+        self.failures: dict[str, int] = {}
+        self.retries: dict[str, int] = {}
+        self.lost: dict[str, float] = {}
+
+    def record(self, error: str, lost: float, retried: bool) -> None:
+        self.failures[error] = self.failures.get(error, 0) + 1
+        self.lost[error] = self.lost.get(error, 0.0) + lost
+        if retried:
+            self.retries[error] = self.retries.get(error, 0) + 1
+
+    def report(self) -> list[str]:
+        return [f'{error} | failures: {count}, retried: {self.retries.get(error, 0)}, '
+                f'time lost: {self.lost[error]:.1f}s'
+                for error, count in sorted(self.failures.items(), key=lambda item: -self.lost[item[0]])]
+
+
+retry_policy = RetryPolicy()
+retry_stats = RetryStats()
@@ -0,0 +1,86 @@
+from loguru import logger
+
+from src.utils.reserves import (
+    ReserveCache,
+    reserve_cache,
+    Pair,
+)
+
+MAX_HOPS = 3
+
+
+class PathFinder:
+    def __init__(self, cache: ReserveCache, max_hops: int = MAX_HOPS) -> None:
+        self.cache = cache
+        self.max_hops = max_hops
+        self.paths: dict[tuple[str, str, str], list[list[str]]] = {}
+        self.best: dict[tuple[str, str, str, int], tuple[list[str], int]] = {}
+        self.block: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def graph(self, router: str) -> dict[str, list[str]]:
+        graph: dict[str, list[str]] = {}
+        for (pair_router, token0, token1), pair in self.cache.pairs.items():
+            if pair_router == router:
+                graph.setdefault(token0, []).append(token1)
+                graph.setdefault(token1, []).append(token0)
+        return graph
+
+    def candidate_paths(self, router: str, token_in: str, token_out: str) -> list[list[str]]:
+        key = (router, token_in, token_out)
+        if key not in self.paths:
+            graph, paths = self.graph(router), []
+
+            def walk(path: list[str]) -> None:
+                for token in graph.get(path[-1], []):
+                    if token == token_out:
+                        paths.append(path + [token])
+                    elif token not in path and len(path) < self.max_hops:
+                        walk(path + [token])
+
+            walk([token_in])
+            self.paths[key] = paths
+        return self.paths[key]
+
+    def pair(self, router: str, token_a: str, token_b: str) -> Pair:
+        return self.cache.pairs[(router, *sorted((token_a, token_b)))]
+
+    def amount_out(self, router: str, amount_in: int, path: list[str]) -> int:
+        for token_in, token_out in zip(path, path[1:]):
+            pair = self.pair(router, token_in, token_out)
+            if not pair.reserve0 or not pair.reserve1:
+                return 0
+            amount_in = pair.amount_out(amount_in, token_in)
+        return amount_in
+
+    async def best_path(self, router: str, amount_in: int, token_in: str,
+                        token_out: str) -> tuple[list[str], int] | None:
+        router, token_in, token_out = router.lower(), token_in.lower(), token_out.lower()
+        try:
+            await self.cache.get_pair(router, token_in, token_out)
+        except Exception as ex:
+            logger.warning(f'Reserve refresh failed, routing on-chain | {ex}')
+            return None
+        if self.cache.block != self.block:
+            self.best.clear()
+            self.block = self.cache.block
+
+        key = (router, token_in, token_out, amount_in)
+        if key in self.best:
+            self.hits += 1
+            return self.best[key]
+        self.misses += 1
+        routes = [(path, self.amount_out(router, amount_in, path))
+                  for path in self.candidate_paths(router, token_in, token_out)]
+        routes = [route for route in routes if route[1] > 0]
+        if not routes:
+            return None
+        self.best[key] = max(routes, key=lambda route: route[1])
+        return self.best[key]
+
+    def __str__(self) -> str:
+        return f'candidate path sets: {len(self.paths)}, best path hits: {self.hits}, misses: {self.misses}'
+
+
+path_finder = PathFinder(reserve_cache)
@@ -0,0 +1,300 @@
+from contextvars import ContextVar
+from collections import deque
+from time import monotonic
+from typing import Any, Callable
+import json
+
+from asyncio import (
+    FIRST_COMPLETED,
+    CancelledError,
+    create_task,
+    wait,
+)
+
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3 import AsyncWeb3
+from web3.types import RPCEndpoint, RPCResponse
+from web3._utils.http import construct_user_agent
+
+from aiohttp import (
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+    TraceConfig,
+)
+
+
+current_module: ContextVar[str] = ContextVar('current_module', default='other')
+
+
+class RoundTripStats:
+    def __init__(self) -> None:
+        self.round_trips = {}
+        self.transactions = {}
+
+    def record(self, method: str) -> None:
+        module = current_module.get()
+        self.round_trips[module] = self.round_trips.get(module, 0) + 1
+        if method == 'eth_sendRawTransaction':
+            self.transactions[module] = self.transactions.get(module, 0) + 1
+
+    def report(self) -> list[str]:
+        lines = []
+        for module, round_trips in sorted(self.round_trips.items()):
+            transactions = self.transactions.get(module, 0)
+            per_tx = f'{round_trips / transactions:.1f}' if transactions else 'n/a'
+            lines.append(f'{module} | round trips: {round_trips}, transactions: {transactions}, per tx: {per_tx}')
+        return lines
+
+
+round_trip_stats = RoundTripStats()
+send_listeners: list[Callable[[int | None, str], None]] = []
+
+
+async def track_module(name: str, coro: Any) -> Any:
+    current_module.set(name)
+    return await coro
+
+
+class ConnectionStats:
+    def __init__(self) -> None:
+        self.created = 0
+        self.reused = 0
+        self.requests = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self.created + self.reused
+        return self.reused / total if total else 0.0
+
+    def __str__(self) -> str:
+        return (f'requests: {self.requests}, connections opened: {self.created}, '
+                f'reused: {self.reused} ({self.reuse_ratio:.0%})')
+
+
+ERROR_PENALTY = 5.0
+ENDPOINT_COOLDOWN = 30.0
+
+
+class Endpoint:
+    def __init__(self, uri: str, window: int = 100) -> None:
+        self.uri = uri
+        self.latencies = deque(maxlen=window)
+        self.failures = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.cooldown_until = 0.0
+
+    def record_success(self, latency: float) -> None:
+        self.requests += 1
+        self.latencies.append(latency)
+        self.failures.append(0)
+
+    def record_failure(self, latency: float) -> None:
+        self.requests += 1
+        self.errors += 1
+        self.latencies.append(latency)
+        self.failures.append(1)
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.failures) / len(self.failures) if self.failures else 0.0
+
+    @property
+    def p95(self) -> float | None:
+        if len(self.latencies) < 5:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    @property
+    def score(self) -> float:
+        if not self.latencies:
+            return 0.0
+        mean = sum(self.latencies) / len(self.latencies)
+        return mean + self.error_rate * ERROR_PENALTY
+
+    def __str__(self) -> str:
+        p95 = f'{self.p95 * 1000:.0f}ms' if self.p95 is not None else 'n/a'
+        return f'{self.uri} | requests: {self.requests}, errors: {self.errors}, p95: {p95}'
+
+
+class EndpointPool:
+    def __init__(self, uris: list[str]) -> None:
+        self.endpoints = [Endpoint(uri) for uri in uris]
+        self.failovers = 0
+        self.hedged = 0
+        self.demoted = 0
+
+    def ranked(self) -> list[Endpoint]:
+        now = monotonic()
+        return sorted(self.endpoints, key=lambda endpoint: (endpoint.cooldown_until > now, endpoint.score))
+
+    def demote_primary(self, cooldown: float = ENDPOINT_COOLDOWN) -> None:
+        if len(self.endpoints) > 1:
+            self.ranked()[0].cooldown_until = monotonic() + cooldown
+            self.demoted += 1
+
+
+class ConnectionPool:
+    def __init__(self, pool_size: int, limit_per_host: int, keepalive_timeout: float = 60,
+                 timeout: float = 30) -> None:
+        self.pool_size = pool_size
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.stats = ConnectionStats()
+        self._session: ClientSession | None = None
+
+    async def get_session(self) -> ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = ClientSession(
+                connector=TCPConnector(limit=self.pool_size,
+                                       limit_per_host=self.limit_per_host,
+                                       keepalive_timeout=self.keepalive_timeout),
+                timeout=ClientTimeout(total=self.timeout),
+                trace_configs=[self._trace_config()],
+                raise_for_status=True,
+            )
+        return self._session
+
+    def _trace_config(self) -> TraceConfig:
+        async def on_connection_create_end(*_: Any) -> None:
+            self.stats.created += 1
+
+        async def on_connection_reuseconn(*_: Any) -> None:
+            self.stats.reused += 1
+
+        async def on_request_end(*_: Any) -> None:
+            self.stats.requests += 1
+
+        trace_config = TraceConfig()
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_request_end.append(on_request_end)
+        return trace_config
+
+    async def post(self, endpoint_uri: str, data: bytes, headers: dict) -> bytes:
+        session = await self.get_session()
+        async with session.post(endpoint_uri, data=data, headers=headers) as response:
+            return await response.read()
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+HEDGED_METHODS = {'eth_call', 'eth_gasPrice', 'eth_getBalance'}
+
+
+class PooledHTTPProvider(AsyncJSONBaseProvider):
+    def __init__(self, endpoints: EndpointPool, pool: ConnectionPool, hedge_reads: bool = False,
+                 chain_id: int | None = None) -> None:
+        self.endpoints = endpoints
+        self.chain_id = chain_id
+        self.pool = pool
+        self.hedge_reads = hedge_reads
+        self.headers = {
+            'Content-Type': 'application/json',
+            'User-Agent': construct_user_agent(str(type(self))),
+        }
+        super().__init__()
+
+    def __str__(self) -> str:
+        return f'Pooled RPC connection {", ".join(endpoint.uri for endpoint in self.endpoints.endpoints)}'
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if method == 'eth_chainId' and self.chain_id is not None:
+            # web3's validation middleware asks for this before every call and estimate
+            return {'jsonrpc': '2.0', 'id': next(self.request_counter), 'result': hex(self.chain_id)}
+        round_trip_stats.record(method)
+        request_data = self.encode_rpc_request(method, params)
+        endpoints = self.endpoints.ranked()
+        if self.hedge_reads and method in HEDGED_METHODS and len(endpoints) > 1:
+            raw_response = await self._post_hedged(request_data, endpoints)
+        else:
+            raw_response = await self._post_with_failover(request_data, endpoints)
+        response = self.decode_rpc_response(raw_response)
+        if method == 'eth_sendRawTransaction' and 'error' not in response:
+            # Only a transaction the node accepted can be pending, whatever endpoint took it
+            for listener in send_listeners:
+                listener(self.chain_id, params[0])
+        return response
+
+    async def make_batch_request(self, calls: list[tuple[str, list]]) -> list[RPCResponse]:
+        round_trip_stats.record('batch')
+        requests = [
+            {'jsonrpc': '2.0', 'method': method, 'params': params, 'id': next(self.request_counter)}
+            for method, params in calls
+        ]
+        raw_response = await self._post_with_failover(json.dumps(requests).encode(), self.endpoints.ranked())
+        response = json.loads(raw_response)
+        if isinstance(response, dict):
+            # Nodes and rate limiters may answer a whole batch with a single error object
+            raise ValueError(response.get('error', response))
+        responses = {item.get('id'): item for item in response}
+        missing = [request['id'] for request in requests if request['id'] not in responses]
+        if missing:
+            raise ValueError(f'Batch response has no answer for request ids {missing}')
+        return [responses[request['id']] for request in requests]
+
+    async def _post(self, endpoint: Endpoint, data: bytes) -> bytes:
+        start = monotonic()
+        try:
+            raw_response = await self.pool.post(endpoint.uri, data, self.headers)
+        except CancelledError:
+            raise
+        except Exception:
+            endpoint.record_failure(monotonic() - start)
+            raise
+        endpoint.record_success(monotonic() - start)
+        return raw_response
+
+    async def _post_with_failover(self, data: bytes, endpoints: list[Endpoint]) -> bytes:
+        error = None
+        for endpoint in endpoints:
+            try:
+                return await self._post(endpoint, data)
+            except CancelledError:
+                raise
+            except Exception as ex:
+                error = ex
+                self.endpoints.failovers += 1
+        raise error
+
+    async def _post_hedged(self, data: bytes, endpoints: list[Endpoint]) -> bytes:
+        primary = create_task(self._post(endpoints[0], data))
+        done, _ = await wait({primary}, timeout=endpoints[0].p95)
+        if done:
+            if primary.exception() is None:
+                return primary.result()
+            self.endpoints.failovers += 1
+            return await self._post_with_failover(data, endpoints[1:])
+
+        self.endpoints.hedged += 1
+        pending = {primary, create_task(self._post(endpoints[1], data))}
+        try:
+            while pending:
+                done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        self.endpoints.failovers += 1
+        return await self._post_with_failover(data, endpoints[2:] or endpoints[:1])
+
+
+async def batch_request(web3: AsyncWeb3, calls: list[tuple[str, list]]) -> list[Any]:
+    responses = await web3.provider.make_batch_request(calls)
+    for response in responses:
+        if 'error' in response:
+            raise ValueError(response['error'])
+    return [response['result'] for response in responses]
+
+
+def to_rpc_tx(tx: dict) -> dict:
+    return {key: hex(value) if isinstance(value, int) else value for key, value in tx.items()}
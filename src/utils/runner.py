@@ -4,6 +4,7 @@ import tqdm
 from src.modules.bridges.orbiter_bridge.orbiter_bridge import OrbiterBridge
 from src.modules.bridges.main_bridge.main_bridge import MainBridge
 from src.modules.swaps.horizondex.horizondex import HorizonDexSwap
+from src.modules.swaps.best_swap.best_swap import BestSwap
 
 from src.utils.chains import chain_mapping
 from config import *
@@ -27,7 +28,7 @@ from src.modules.swaps.linea_swap.linea_swap import (
 )
 
 
-async def process_main_bridge(private_key: str, pbar: tqdm) -> None:
+async def process_main_bridge(private_key: str, pbar: tqdm) -> bool:
     amount_from = MainBridgeConfig.amount_from
     amount_to = MainBridgeConfig.amount_to
     action = MainBridgeConfig.action
@@ -40,17 +41,18 @@ async def process_main_bridge(private_key: str, pbar: tqdm) -> None:
     logger.info('Bridging on Main bridge...')
 
     if action == 'deposit':
-        await bridge.deposit()
+        tx_hash = await bridge.deposit()
     elif action == 'withdraw':
-        await bridge.withdraw()
+        tx_hash = await bridge.withdraw()
     else:
         logger.error(f'Unknown action {action}. Use only: deposit/withdraw')
-        return
+        return False
 
     pbar.update()
+    return tx_hash is not None
 
 
-async def process_orbiter_bridge(private_key: str, pbar: tqdm) -> None:
+async def process_orbiter_bridge(private_key: str, pbar: tqdm) -> bool:
     supported_chains = ['ARB']
     chain = OrbiterBridgeConfig.chain
     token = OrbiterBridgeConfig.token
@@ -59,11 +61,11 @@ async def process_orbiter_bridge(private_key: str, pbar: tqdm) -> None:
     action = OrbiterBridgeConfig.action
     if token.upper() != 'ETH':
         logger.error(f'Not supported token {token}. Use only ETH.')
-        return
+        return False
 
     if chain.upper() not in supported_chains:
         logger.error(f'Not supported chain {chain}. Use only: ARB')
-        return
+        return False
 
     if action.lower() == 'deposit':
         from_chain = chain
@@ -73,7 +75,7 @@ async def process_orbiter_bridge(private_key: str, pbar: tqdm) -> None:
         to_chain = chain
     else:
         logger.error(f'Unknown action {action}. Use only: deposit/withdraw')
-        return
+        return False
 
     bridge = OrbiterBridge(
         private_key=private_key,
@@ -81,16 +83,17 @@ async def process_orbiter_bridge(private_key: str, pbar: tqdm) -> None:
         amount_to=amount_to,
         from_chain=from_chain,
         to_chain=to_chain,
-        rpc=chain_mapping[from_chain.lower()].rpc,
+        chain=chain_mapping[from_chain.lower()],
         code=chain_mapping[to_chain.lower()].code
     )
     logger.info('Bridging on Orbiter...')
 
-    await bridge.bridge()
+    tx_hash = await bridge.bridge()
     pbar.update()
+    return tx_hash is not None
 
 
-async def process_linea_swap(private_key: str, pbar: tqdm) -> None:
+async def process_linea_swap(private_key: str, pbar: tqdm) -> bool:
     from_token = LineaSwapConfig.from_token
     to_token = LineaSwapConfig.to_token
     amount_from = LineaSwapConfig.amount_from
@@ -106,11 +109,12 @@ async def process_linea_swap(private_key: str, pbar: tqdm) -> None:
         swap_all_balance=swap_all_balance
     )
     logger.info('Swapping on LineaSwap...')
-    await linea_swap.swap()
+    tx_hash = await linea_swap.swap()
     pbar.update()
+    return tx_hash is not None
 
 
-async def process_linea_liquidity(private_key: str, pbar: tqdm) -> None:
+async def process_linea_liquidity(private_key: str, pbar: tqdm) -> bool:
     token = LineaLiqConfig.token
     token2 = LineaLiqConfig.token2
     amount_from = LineaLiqConfig.amount_from
@@ -124,11 +128,12 @@ async def process_linea_liquidity(private_key: str, pbar: tqdm) -> None:
         amount_to=amount_to,
     )
     logger.info('Adding liquidity on LineaSwap...')
-    await linea_liq.add_liquidity()
+    tx_hash = await linea_liq.add_liquidity()
     pbar.update()
+    return tx_hash is not None
 
 
-async def process_linea_liquidity_remove(private_key: str, pbar: tqdm) -> None:
+async def process_linea_liquidity_remove(private_key: str, pbar: tqdm) -> bool:
     from_token_pair = LineaLiqRemoveConfig.from_token_pair
     remove_all = LineaLiqRemoveConfig.remove_all
     removing_percentage = LineaLiqRemoveConfig.removing_percentage
@@ -140,11 +145,12 @@ async def process_linea_liquidity_remove(private_key: str, pbar: tqdm) -> None:
         removing_percentage=removing_percentage
     )
     logger.info('Removing liquidity from LineaSwap...')
-    await linea_liq_remove.remove_liquidity()
+    tx_hash = await linea_liq_remove.remove_liquidity()
     pbar.update()
+    return tx_hash is not None
 
 
-async def process_echodex_swap(private_key: str, pbar: tqdm) -> None:
+async def process_echodex_swap(private_key: str, pbar: tqdm) -> bool:
     from_token = EchoDexSwapConfig.from_token
     to_token = EchoDexSwapConfig.to_token
     amount_from = EchoDexSwapConfig.amount_from
@@ -160,11 +166,12 @@ async def process_echodex_swap(private_key: str, pbar: tqdm) -> None:
         swap_all_balance=swap_all_balance
     )
     logger.info('Swapping on EchoDex...')
-    await echo_dex_swap.swap()
+    tx_hash = await echo_dex_swap.swap()
     pbar.update()
+    return tx_hash is not None
 
 
-async def process_echodex_liquidity(private_key: str, pbar: tqdm) -> None:
+async def process_echodex_liquidity(private_key: str, pbar: tqdm) -> bool:
     token = EchoDexLiqConfig.token
     token2 = EchoDexLiqConfig.token2
     amount_from = EchoDexLiqConfig.amount_from
@@ -178,11 +185,12 @@ async def process_echodex_liquidity(private_key: str, pbar: tqdm) -> None:
         amount_to=amount_to,
     )
     logger.info('Adding liquidity on EchoDex...')
-    await echo_dex_liq.add_liquidity()
+    tx_hash = await echo_dex_liq.add_liquidity()
     pbar.update()
+    return tx_hash is not None
 
 
-async def process_echodex_liquidity_remove(private_key: str, pbar: tqdm) -> None:
+async def process_echodex_liquidity_remove(private_key: str, pbar: tqdm) -> bool:
     from_token_pair = EchoDexLiqRemoveConfig.from_token_pair
     remove_all = EchoDexLiqRemoveConfig.remove_all
     removing_percentage = EchoDexLiqRemoveConfig.removing_percentage
@@ -194,11 +202,12 @@ async def process_echodex_liquidity_remove(private_key: str, pbar: tqdm) -> None
         removing_percentage=removing_percentage
     )
     logger.info('Removing liquidity from EchoDex...')
-    await echo_dex_liq_remove.remove_liquidity()
+    tx_hash = await echo_dex_liq_remove.remove_liquidity()
     pbar.update()
+    return tx_hash is not None
 
 
-async def process_sync_swap(private_key: str, pbar: tqdm) -> None:
+async def process_sync_swap(private_key: str, pbar: tqdm) -> bool:
     from_token = SyncSwapConfig.from_token
     to_token = SyncSwapConfig.to_token
     amount_from = SyncSwapConfig.amount_from
@@ -214,41 +223,50 @@ async def process_sync_swap(private_key: str, pbar: tqdm) -> None:
         swap_all_balance=swap_all_balance
     )
     logger.info('Swapping on SyncSwap...')
-    await sync_swap.swap()
+    tx_hash = await sync_swap.swap()
     pbar.update()
+    return tx_hash is not None
 
 
-async def process_syncswap_liquidity(private_key: str, pbar: tqdm) -> None:
+async def process_syncswap_liquidity(private_key: str, pbar: tqdm) -> bool:
     token = SyncSwapLiqConfig.token
+    token2 = SyncSwapLiqConfig.token2
     amount_from = SyncSwapLiqConfig.amount_from
     amount_to = SyncSwapLiqConfig.amount_to
 
     syncswap_liq = SyncSwapLiquidity(
         private_key=private_key,
         token=token,
+        token2=token2,
         amount_from=amount_from,
         amount_to=amount_to,
     )
     logger.info('Adding liquidity on SyncSwap...')
-    await syncswap_liq.add_liquidity()
+    tx_hash = await syncswap_liq.add_liquidity()
     pbar.update()
+    return tx_hash is not None
 
 
-async def process_syncswap_liquidity_remove(private_key: str, pbar: tqdm) -> None:
+async def process_syncswap_liquidity_remove(private_key: str, pbar: tqdm) -> bool:
+    token = SyncSwapLiqRemoveConfig.token
+    token2 = SyncSwapLiqRemoveConfig.token2
     remove_all = SyncSwapLiqRemoveConfig.remove_all
     removing_percentage = SyncSwapLiqRemoveConfig.removing_percentage
 
     syncswap_liq_remove = SyncSwapLiquidityRemove(
         private_key=private_key,
+        token=token,
+        token2=token2,
         remove_all=remove_all,
         removing_percentage=removing_percentage
     )
     logger.info('Removing liquidity from SyncSwap...')
-    await syncswap_liq_remove.remove_liquidity()
+    tx_hash = await syncswap_liq_remove.remove_liquidity()
     pbar.update()
+    return tx_hash is not None
 
 
-async def process_horizondex_swap(private_key: str, pbar: tqdm) -> None:
+async def process_horizondex_swap(private_key: str, pbar: tqdm) -> bool:
     from_token = HorizonDexSwapConfig.from_token
     to_token = HorizonDexSwapConfig.to_token
     amount_from = HorizonDexSwapConfig.amount_from
@@ -264,5 +282,27 @@ async def process_horizondex_swap(private_key: str, pbar: tqdm) -> None:
         swap_all_balance=swap_all_balance
     )
     logger.info('Swapping on HorizonDex...')
-    await horizon_dex_swap.swap()
+    tx_hash = await horizon_dex_swap.swap()
+    pbar.update()
+    return tx_hash is not None
+
+
+async def process_best_swap(private_key: str, pbar: tqdm) -> bool:
+    from_token = BestSwapConfig.from_token
+    to_token = BestSwapConfig.to_token
+    amount_from = BestSwapConfig.amount_from
+    amount_to = BestSwapConfig.amount_to
+    swap_all_balance = BestSwapConfig.swap_all_balance
+
+    best_swap = BestSwap(
+        private_key=private_key,
+        from_token=from_token,
+        to_token=to_token,
+        amount_from=amount_from,
+        amount_to=amount_to,
+        swap_all_balance=swap_all_balance
+    )
+    logger.info('Swapping on the best venue...')
+    tx_hash = await best_swap.swap()
     pbar.update()
+    return tx_hash is not None
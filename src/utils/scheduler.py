@@ -0,0 +1,131 @@
+from heapq import heappush, heappop
+from time import monotonic
+from itertools import count
+import random
+
+from eth_account import Account
+from loguru import logger
+from tqdm import tqdm
+
+from asyncio import (
+    TimeoutError,
+    current_task,
+    create_task,
+    Semaphore,
+    wait_for,
+    Event,
+    Task,
+)
+
+from src.utils.allowances import allowance_cache
+from src.utils.gas_profiles import gas_profiles
+from src.utils.mappings import module_handlers
+from src.utils.rpc import track_module
+from src.utils.nonce import nonces
+
+from src.utils.journal import (
+    current_wallet,
+    RunJournal,
+)
+
+
+class WalletScheduler:
+    def __init__(self, private_keys: list[str], modules: list[str], pbar: tqdm, num_threads: int,
+                 min_pause: int, max_pause: int, randomize: bool, run_forever: bool,
+                 journal: RunJournal | None = None) -> None:
+        self.modules = modules
+        self.journal = journal
+        self.pbar = pbar
+        self.semaphore = Semaphore(num_threads)
+        self.min_pause = min_pause
+        self.max_pause = max_pause
+        self.randomize = randomize
+        self.run_forever = run_forever
+        self.queue = []
+        self.order = count()
+        self.changed = Event()
+        self.in_flight: set[Task] = set()
+        self.addresses = {private_key: Account.from_key(private_key).address for private_key in private_keys}
+        now = monotonic()
+        for wallet_num, private_key in enumerate(private_keys, start=1):
+            if modules:
+                self.push(now, wallet_num, private_key, self.get_modules(), 0)
+
+    def get_modules(self) -> list[str]:
+        modules = list(self.modules)
+        if self.randomize is True:
+            random.shuffle(modules)
+        return modules
+
+    def push(self, due: float, wallet_num: int, private_key: str, modules: list[str], index: int) -> None:
+        heappush(self.queue, (due, next(self.order), wallet_num, private_key, modules, index))
+        self.changed.set()
+
+    async def run(self) -> None:
+        while self.queue or self.in_flight:
+            if not self.queue:
+                await self.changed.wait()
+                self.changed.clear()
+                continue
+
+            delay = self.queue[0][0] - monotonic()
+            if delay > 0:
+                try:
+                    await wait_for(self.changed.wait(), timeout=delay)
+                except TimeoutError:
+                    pass
+                self.changed.clear()
+                continue
+
+            await self.semaphore.acquire()
+            _, _, wallet_num, private_key, modules, index = heappop(self.queue)
+            self.in_flight.add(create_task(self.dispatch(wallet_num, private_key, modules, index)))
+
+    async def dispatch(self, wallet_num: int, private_key: str, modules: list[str], index: int) -> None:
+        pattern = modules[index]
+        address = self.addresses[private_key]
+        skipped = False
+        try:
+            if self.journal is not None and await self.journal.reconcile(address, pattern):
+                logger.info(f'Wallet {wallet_num}: {pattern} already completed, skipping')
+                skipped = True
+            elif not await self.run_module(address, private_key, pattern):
+                logger.warning(f'Wallet {wallet_num}: {pattern} did not complete')
+            if index + 1 == len(modules) and self.run_forever and self.journal is not None:
+                self.journal.finish_cycle(address)
+        except Exception as ex:
+            logger.error(f'Wallet {wallet_num}: {pattern} failed | {ex}')
+        finally:
+            self.semaphore.release()
+
+        if index + 1 < len(modules):
+            if skipped:
+                self.push(monotonic(), wallet_num, private_key, modules, index + 1)
+            else:
+                self.schedule_next(wallet_num, private_key, modules, index + 1)
+        elif self.run_forever:
+            self.schedule_next(wallet_num, private_key, self.get_modules(), 0)
+
+        self.in_flight.discard(current_task())
+        self.changed.set()
+
+    async def run_module(self, address: str, private_key: str, pattern: str) -> bool:
+        current_wallet.set(address)
+        nonces.reset(address)
+        if self.journal is not None:
+            self.journal.start_module(address, pattern)
+        try:
+            completed = await track_module(pattern, module_handlers[pattern](private_key, self.pbar))
+        except Exception as ex:
+            logger.error(f'{address} | {pattern} failed | {ex}')
+            completed = False
+        allowance_cache.flush()
+        gas_profiles.flush()
+        if completed and self.journal is not None:
+            self.journal.finish_module(address, pattern)
+        return completed
+
+    def schedule_next(self, wallet_num: int, private_key: str, modules: list[str], index: int) -> None:
+        time_to_sleep = random.randint(self.min_pause, self.max_pause)
+        logger.info(f'Wallet {wallet_num}: {modules[index]} in {time_to_sleep} seconds...')
+        self.push(monotonic() + time_to_sleep, wallet_num, private_key, modules, index)
@@ -0,0 +1,139 @@
+from time import monotonic
+from typing import (
+    Awaitable,
+    Callable,
+)
+
+from asyncio import (
+    FIRST_COMPLETED,
+    wait,
+)
+
+from web3.exceptions import TimeExhausted
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils.block_cache import get_block_cache
+
+from src.utils.receipts import (
+    RECEIPT_TIMEOUT,
+    get_tracker,
+)
+from src.utils.fees import (
+    FeeStrategy,
+    fee_strategy,
+    bump_fees,
+)
+from src.utils.retry import (
+    classify,
+    UNDERPRICED,
+    NONCE,
+    KNOWN,
+)
+
+BUMP_AFTER_BLOCKS = 5
+MAX_FEE_BUMPS = 3
+
+
+class PendingSupervisor:
+    def __init__(self, fees: FeeStrategy = fee_strategy, bump_after: int = BUMP_AFTER_BLOCKS,
+                 max_bumps: int = MAX_FEE_BUMPS, timeout: float = RECEIPT_TIMEOUT) -> None:
+        self.fees = fees
+        self.bump_after = bump_after
+        self.max_bumps = max_bumps
+        self.timeout = timeout
+        self.history: list[dict] = []
+        self.supervised = 0
+        self.replacements_mined = 0
+
+    async def replacement(self, web3: AsyncWeb3, tx: dict) -> dict:
+        replacement = dict(tx)
+        bump_fees(replacement)
+        if 'maxFeePerGas' in replacement:
+            current = (await self.fees.history(web3)).fields()
+            for field in ('maxFeePerGas', 'maxPriorityFeePerGas'):
+                replacement[field] = max(replacement[field], current[field])
+        return replacement
+
+    async def bump(self, web3: AsyncWeb3, tx: dict, tx_hash: str, blocks: int,
+                   resend: Callable[[dict], Awaitable[str]]) -> tuple[dict, str | None]:
+        replacement = await self.replacement(web3, tx)
+        try:
+            new_hash = await resend(replacement)
+        except Exception as ex:
+            error = classify(ex)
+            if error == NONCE:
+                logger.debug(f'Nonce {tx["nonce"]} is already used, waiting for the receipt | {ex}')
+            elif error == UNDERPRICED:
+                return replacement, None
+            elif error != KNOWN:
+                logger.warning(f'Fee bump failed | {ex}')
+            return tx, None
+
+        fee_field = 'maxFeePerGas' if 'maxFeePerGas' in tx else 'gasPrice'
+        self.history.append({
+            'from': tx.get('from'),
+            'nonce': tx['nonce'],
+            'replaced': tx_hash,
+            'hash': new_hash,
+            'blocks': blocks,
+            'fee': tx[fee_field],
+            'bumped_fee': replacement[fee_field],
+        })
+        logger.warning(f'Transaction {tx_hash} is not mined after {blocks} blocks, replaced with {new_hash} | '
+                       f'{fee_field}: {tx[fee_field]} => {replacement[fee_field]}')
+        return replacement, new_hash
+
+    async def wait(self, web3: AsyncWeb3, tx: dict, tx_hash: str,
+                   resend: Callable[[dict], Awaitable[str]]) -> dict:
+        tracker = get_tracker(web3)
+        futures = {tracker.track(tx_hash): tx_hash}
+        since = (await get_block_cache(web3).get()).number
+        deadline = monotonic() + self.timeout
+        bumps = 0
+        self.supervised += 1
+        try:
+            while True:
+                done, _ = await wait(futures, timeout=tracker.poll_interval, return_when=FIRST_COMPLETED)
+                if done:
+                    future = done.pop()
+                    if futures[future] != tx_hash:
+                        self.replacements_mined += 1
+                    return future.result()
+                if monotonic() > deadline:
+                    raise TimeExhausted(f'Transaction {tx_hash} is not in the chain after {self.timeout} seconds')
+                block = tracker.last_block
+                if block is None or block - since < self.bump_after or bumps >= self.max_bumps:
+                    continue
+                bumps += 1
+                tx, new_hash = await self.bump(web3, tx, list(futures.values())[-1], block - since, resend)
+                if new_hash is not None:
+                    futures[tracker.track(new_hash)] = new_hash
+                since = block
+        finally:
+            for pending_hash in futures.values():
+                tracker.forget(pending_hash)
+
+    async def confirm(self, web3: AsyncWeb3, tx: dict, tx_hash: str,
+                      resend: Callable[[dict], Awaitable[str]]) -> str | None:
+        try:
+            receipt = await self.wait(web3, tx, tx_hash, resend)
+        except TimeExhausted as ex:
+            logger.warning(f'Transaction is still pending | {ex}')
+            return None
+        tx_hash = receipt['transactionHash']
+        if receipt['status'] != 1:
+            logger.error(f'Transaction reverted | Tx hash: {tx_hash}')
+            return None
+        return tx_hash
+
+    def report(self) -> list[str]:
+        return [f'{bump["from"]} nonce {bump["nonce"]} | {bump["replaced"]} => {bump["hash"]} after '
+                f'{bump["blocks"]} blocks, fee {bump["fee"]} => {bump["bumped_fee"]}' for bump in self.history]
+
+    def __str__(self) -> str:
+        return (f'supervised: {self.supervised}, fee bumps: {len(self.history)}, '
+                f'replacements mined: {self.replacements_mined}')
+
+
+pending_supervisor = PendingSupervisor()
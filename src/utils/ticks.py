@@ -0,0 +1,239 @@
+from itertools import combinations
+from functools import lru_cache
+from decimal import (
+    localcontext,
+    Decimal,
+)
+
+from asyncio import (
+    create_task,
+    shield,
+    Task,
+)
+
+from eth_utils import function_signature_to_4byte_selector
+from eth_abi import encode, decode
+from loguru import logger
+
+from src.utils.block_cache import get_block_cache
+from src.utils.multicall import multicall
+from src.utils.chains import (
+    LINEA,
+    Chain,
+)
+
+from src.modules.swaps.tokens import (
+    routers,
+    tokens,
+)
+
+FACTORY = function_signature_to_4byte_selector('factory()')
+GET_POOL = function_signature_to_4byte_selector('getPool(address,address,uint24)')
+GET_POOL_STATE = function_signature_to_4byte_selector('getPoolState()')
+GET_LIQUIDITY_STATE = function_signature_to_4byte_selector('getLiquidityState()')
+SWAP_FEE_UNITS = function_signature_to_4byte_selector('swapFeeUnits()')
+TICK_DISTANCE = function_signature_to_4byte_selector('tickDistance()')
+TICKS = function_signature_to_4byte_selector('ticks(int24)')
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+
+Q96 = 2 ** 96
+FEE_UNITS = 100000
+HORIZON_FEE = 300
+TICK_WINDOW = 100  # tick spacings read on each side of the current tick
+
+
+@lru_cache(maxsize=4096)
+def sqrt_price_at_tick(tick: int) -> int:
+    with localcontext() as context:
+        context.prec = 60
+        return int((Decimal('1.0001') ** tick).sqrt() * Q96)
+
+
+def div_up(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+class Pool:
+    def __init__(self, address: str, token_a: str, token_b: str, fee: int, tick_distance: int) -> None:
+        self.address = address
+        self.token0, self.token1 = sorted((token_a.lower(), token_b.lower()))
+        self.fee = fee
+        self.tick_distance = tick_distance
+        self.sqrt_p = 0
+        self.current_tick = 0
+        self.liquidity = 0
+        self.base_liquidity = 0
+        self.ticks: dict[int, int] = {}
+        self.window: tuple[int, int] | None = None
+
+    def tick_window(self, tick: int) -> tuple[int, int]:
+        center = tick // self.tick_distance * self.tick_distance
+        span = TICK_WINDOW * self.tick_distance
+        return center - span, center + span
+
+    def needs_window(self) -> bool:
+        if self.window is None:
+            return True
+        low, high = self.window
+        margin = (high - low) // 4
+        return not low + margin <= self.current_tick <= high - margin
+
+    def crossed_tick(self, previous_tick: int) -> bool:
+        low, high = sorted((previous_tick, self.current_tick))
+        return any(low < tick <= high for tick in self.ticks)
+
+    def tick_calls(self, window: tuple[int, int]) -> list[tuple[str, bytes]]:
+        low, high = window
+        return [(self.address, TICKS + encode(['int24'], [tick]))
+                for tick in range(low, high + 1, self.tick_distance)]
+
+    def set_ticks(self, window: tuple[int, int], values: list[bytes | None]) -> None:
+        ticks = {}
+        for tick, value in zip(range(window[0], window[1] + 1, self.tick_distance), values):
+            if value is None:
+                continue
+            liquidity_gross, liquidity_net = decode(['uint128', 'int128'], value[:64])
+            if liquidity_gross:
+                ticks[tick] = liquidity_net
+        self.ticks = ticks
+        self.window = window
+
+    def amount_out(self, amount_in: int, token_in: str) -> int | None:
+        zero_for_one = token_in.lower() == self.token0
+        low, high = self.window
+        if zero_for_one:
+            path = [(tick, self.ticks[tick]) for tick in sorted(self.ticks, reverse=True) if tick <= self.current_tick]
+            path.append((low, 0))
+        else:
+            path = [(tick, self.ticks[tick]) for tick in sorted(self.ticks) if tick > self.current_tick]
+            path.append((high, 0))
+
+        sqrt_p, liquidity, remaining, amount_out = self.sqrt_p, self.liquidity, amount_in, 0
+        for tick, liquidity_net in path:
+            target = sqrt_price_at_tick(tick)
+            amount_less_fee = remaining * (FEE_UNITS - self.fee) // FEE_UNITS
+            if zero_for_one:
+                needed = liquidity * Q96 * (sqrt_p - target) // (sqrt_p * target)
+                if amount_less_fee < needed:
+                    next_p = div_up(liquidity * Q96 * sqrt_p, liquidity * Q96 + amount_less_fee * sqrt_p)
+                    return amount_out + liquidity * (sqrt_p - next_p) // Q96
+                amount_out += liquidity * (sqrt_p - target) // Q96
+                liquidity -= liquidity_net
+            else:
+                needed = liquidity * (target - sqrt_p) // Q96
+                if amount_less_fee < needed:
+                    next_p = sqrt_p + amount_less_fee * Q96 // liquidity
+                    return amount_out + liquidity * Q96 * (next_p - sqrt_p) // (sqrt_p * next_p)
+                amount_out += liquidity * Q96 * (target - sqrt_p) // (sqrt_p * target)
+                liquidity += liquidity_net
+            remaining -= div_up(needed * FEE_UNITS, FEE_UNITS - self.fee)
+            sqrt_p = target
+        return None
+
+
+class TickCache:
+    def __init__(self, chain: Chain, router: str, fee: int) -> None:
+        self.chain = chain
+        self.router = router
+        self.fee = fee
+        self.pools: dict[tuple[str, str], Pool] = {}
+        self.discovered = False
+        self.block: int | None = None
+        self.refreshing: Task | None = None
+        self.refreshes = 0
+        self.window_reads = 0
+        self.quotes = 0
+
+    async def discover(self) -> None:
+        web3 = self.chain.w3
+        factory = (await multicall(web3, [(self.router, FACTORY)]))[0]
+        if factory is None:
+            raise ValueError(f'Router {self.router} has no factory')
+        factory_address = decode(['address'], factory)[0]
+        token_pairs = list(combinations(tokens.values(), 2))
+        values = await multicall(web3, [
+            (factory_address, GET_POOL + encode(['address', 'address', 'uint24'], [token_a, token_b, self.fee]))
+            for token_a, token_b in token_pairs
+        ])
+        found = [(decode(['address'], value)[0], token_a, token_b)
+                 for (token_a, token_b), value in zip(token_pairs, values) if value is not None]
+        found = [pool for pool in found if pool[0] != ZERO_ADDRESS]
+
+        calls = [call for address, _, _ in found for call in ((address, SWAP_FEE_UNITS), (address, TICK_DISTANCE))]
+        values = await multicall(web3, calls)
+        for i, (address, token_a, token_b) in enumerate(found):
+            fee_units, tick_distance = values[2 * i], values[2 * i + 1]
+            if fee_units is None or tick_distance is None:
+                continue
+            pool = Pool(address, token_a, token_b, decode(['uint24'], fee_units)[0],
+                        decode(['int24'], tick_distance)[0])
+            self.pools[(pool.token0, pool.token1)] = pool
+        self.discovered = True
+        logger.debug(f'Discovered {len(self.pools)} concentrated liquidity pools')
+
+    async def refresh(self, block_number: int) -> None:
+        try:
+            if not self.discovered:
+                await self.discover()
+            pools = list(self.pools.values())
+            values = await multicall(self.chain.w3, [
+                call for pool in pools for call in ((pool.address, GET_POOL_STATE), (pool.address, GET_LIQUIDITY_STATE))
+            ])
+            recenter = []
+            for i, pool in enumerate(pools):
+                pool_state, liquidity_state = values[2 * i], values[2 * i + 1]
+                if pool_state is None or liquidity_state is None:
+                    pool.sqrt_p = 0
+                    continue
+                previous_tick, previous_base_l = pool.current_tick, pool.base_liquidity
+                pool.sqrt_p, pool.current_tick, _, _ = decode(['uint160', 'int24', 'int24', 'bool'], pool_state)
+                base_l, reinvest_l, _ = decode(['uint128', 'uint128', 'uint128'], liquidity_state)
+                pool.liquidity = base_l + reinvest_l
+                pool.base_liquidity = base_l
+                # Ticks only change when a swap crosses one or a position is minted or burned in range
+                if pool.needs_window() or pool.crossed_tick(previous_tick) or base_l != previous_base_l:
+                    recenter.append(pool)
+
+            if recenter:
+                windows = [pool.tick_window(pool.current_tick) for pool in recenter]
+                calls = [call for pool, window in zip(recenter, windows) for call in pool.tick_calls(window)]
+                values, position = await multicall(self.chain.w3, calls), 0
+                for pool, window in zip(recenter, windows):
+                    size = len(range(window[0], window[1] + 1, pool.tick_distance))
+                    pool.set_ticks(window, values[position:position + size])
+                    position += size
+                self.window_reads += len(recenter)
+            self.block = block_number
+            self.refreshes += 1
+        finally:
+            self.refreshing = None
+
+    async def get_pool(self, token_a: str, token_b: str) -> Pool | None:
+        block = await get_block_cache(self.chain.w3).get()
+        if self.block != block.number:
+            if self.refreshing is None:
+                self.refreshing = create_task(self.refresh(block.number))
+            await shield(self.refreshing)
+        return self.pools.get(tuple(sorted((token_a.lower(), token_b.lower()))))
+
+    async def quote(self, amount_in: int, token_in: str, token_out: str) -> int | None:
+        try:
+            pool = await self.get_pool(token_in, token_out)
+        except Exception as ex:
+            logger.warning(f'Tick cache refresh failed | {ex}')
+            return None
+        if pool is None or not pool.sqrt_p or pool.window is None:
+            return None
+        amount_out = pool.amount_out(amount_in, token_in)
+        if amount_out is None:
+            logger.warning(f'Swap of {amount_in} leaves the cached tick window of pool {pool.address}')
+            return None
+        self.quotes += 1
+        return amount_out
+
+    def __str__(self) -> str:
+        return (f'pools: {len(self.pools)}, refreshes: {self.refreshes}, tick window reads: {self.window_reads}, '
+                f'local quotes: {self.quotes}')
+
+
+tick_cache = TickCache(LINEA, routers['HorizonDex'], HORIZON_FEE)
@@ -0,0 +1,143 @@
+import json
+import os
+
+from asyncio import (
+    create_task,
+    shield,
+    Task,
+)
+
+from eth_utils import function_signature_to_4byte_selector
+from eth_abi import decode
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils.multicall import multicall
+from config import TOKEN_CACHE_PATH
+
+from src.modules.swaps.tokens import (
+    liquidity_tokens,
+    tokens,
+)
+
+from src.utils.chains import (
+    chain_mapping,
+    LINEA,
+    Chain,
+)
+
+DECIMALS = function_signature_to_4byte_selector('decimals()')
+SYMBOL = function_signature_to_4byte_selector('symbol()')
+
+
+class TokenMeta:
+    def __init__(self, address: str, symbol: str, decimals: int) -> None:
+        self.address = AsyncWeb3.to_checksum_address(address)
+        self.symbol = symbol
+        self.decimals = decimals
+
+    def to_wei(self, amount: float) -> int:
+        return int(amount * 10 ** self.decimals)
+
+    def from_wei(self, amount: int) -> float:
+        return amount / 10 ** self.decimals
+
+
+def decode_symbol(value: bytes) -> str:
+    try:
+        return decode(['string'], value)[0]
+    except Exception:
+        return value[:32].rstrip(b'\0').decode(errors='ignore')
+
+
+def registry_tokens() -> list[str]:
+    addresses = list(tokens.values())
+    for pools in liquidity_tokens.values():
+        for pairs in pools.values():
+            addresses.extend(pairs.values())
+    return list(dict.fromkeys(address.lower() for address in addresses))
+
+
+class TokenRegistry:
+    def __init__(self, chain: Chain, path: str, preload: list[str] | None = None) -> None:
+        self.chain = chain
+        self.path = path
+        self.preload = preload or []
+        self.tokens: dict[str, TokenMeta] = {}
+        self.loading: Task | None = None
+        self.loaded = False
+        self.fetched = 0
+
+    def read_cache(self) -> dict:
+        if self.path and os.path.exists(self.path):
+            with open(self.path) as f:
+                return json.load(f)
+        return {}
+
+    def write_cache(self) -> None:
+        if not self.path:
+            return
+        cache = self.read_cache()
+        cache[str(self.chain.chain_id)] = {
+            address: {'address': meta.address, 'symbol': meta.symbol, 'decimals': meta.decimals}
+            for address, meta in self.tokens.items()
+        }
+        # Other chains' entries live in the same file, so a torn write would lose them too
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    async def fetch(self, addresses: list[str]) -> None:
+        calls = [call for address in addresses for call in ((address, DECIMALS), (address, SYMBOL))]
+        values = await multicall(self.chain.w3, calls)
+        for i, address in enumerate(addresses):
+            decimals, symbol = values[2 * i], values[2 * i + 1]
+            if decimals is None:
+                logger.warning(f'Token {address} has no decimals(), skipping it')
+                continue
+            self.tokens[address] = TokenMeta(address, decode_symbol(symbol) if symbol else '',
+                                             decode(['uint8'], decimals)[0])
+        self.fetched += len(addresses)
+        self.write_cache()
+
+    async def load(self, addresses: list[str]) -> None:
+        try:
+            if not self.loaded:
+                for address, entry in self.read_cache().get(str(self.chain.chain_id), {}).items():
+                    self.tokens[address] = TokenMeta(entry['address'], entry['symbol'], entry['decimals'])
+                self.loaded = True
+            missing = [address for address in dict.fromkeys(self.preload + addresses) if address not in self.tokens]
+            if missing:
+                await self.fetch(missing)
+        finally:
+            self.loading = None
+
+    async def get(self, address: str) -> TokenMeta:
+        address = address.lower()
+        if address not in self.tokens and self.loading is not None:
+            await shield(self.loading)
+        if address not in self.tokens:
+            if self.loading is None:
+                self.loading = create_task(self.load([address]))
+            await shield(self.loading)
+        if address not in self.tokens:
+            raise ValueError(f'Token {address} metadata is unavailable')
+        return self.tokens[address]
+
+    async def decimals(self, address: str) -> int:
+        return (await self.get(address)).decimals
+
+    def __str__(self) -> str:
+        return f'tokens: {len(self.tokens)}, fetched on-chain: {self.fetched}'
+
+
+registries: dict[int, TokenRegistry] = {}
+
+
+def get_registry(chain: Chain | str) -> TokenRegistry:
+    chain = chain_mapping[chain.lower()] if isinstance(chain, str) else chain
+    if chain.chain_id not in registries:
+        preload = registry_tokens() if chain is LINEA else None
+        registries[chain.chain_id] = TokenRegistry(chain, TOKEN_CACHE_PATH, preload)
+    return registries[chain.chain_id]
@@ -0,0 +1,41 @@
+import os
+
+from src.utils.allowances import AllowanceCache
+
+WALLET = '0x' + '11' * 20
+TOKEN = '0x' + '22' * 20
+SPENDER = '0x' + '33' * 20
+
+
+def test_changes_are_written_once_per_flush(tmp_path, monkeypatch):
+    path = str(tmp_path / 'allowances.json')
+    cache = AllowanceCache(path)
+    writes = []
+    real_replace = os.replace
+    monkeypatch.setattr(os, 'replace', lambda src, dst: writes.append(dst) or real_replace(src, dst))
+
+    for allowance in (5, 6, 7):
+        cache.set(WALLET, TOKEN, SPENDER, allowance)
+    assert not os.path.exists(path)
+    cache.flush()
+    assert writes == [path]
+
+    cache.set(WALLET.upper().replace('0X', '0x'), TOKEN, SPENDER, 7)
+    cache.flush()
+    assert writes == [path]
+    assert os.listdir(tmp_path) == ['allowances.json']
+
+    reloaded = AllowanceCache(path)
+    assert reloaded.get(WALLET, TOKEN, SPENDER) == 7
+
+
+def test_invalidate_is_persisted_on_flush(tmp_path):
+    path = str(tmp_path / 'allowances.json')
+    cache = AllowanceCache(path)
+    cache.set(WALLET, TOKEN, SPENDER, 5)
+    cache.flush()
+
+    assert cache.invalidate(WALLET, TOKEN, SPENDER)
+    assert not cache.invalidate(WALLET, TOKEN, SPENDER)
+    cache.flush()
+    assert AllowanceCache(path).get(WALLET, TOKEN, SPENDER) is None
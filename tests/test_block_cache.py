@@ -0,0 +1,55 @@
+import asyncio
+
+from src.utils.block_cache import BlockCache
+
+
+class FakeProvider:
+    def __init__(self) -> None:
+        self.batches = 0
+
+    async def make_batch_request(self, calls: list[tuple[str, list]]) -> list[dict]:
+        self.batches += 1
+        await asyncio.sleep(0.01)
+        return [
+            {'jsonrpc': '2.0', 'id': 0, 'result': {'number': hex(100 + self.batches), 'timestamp': '0x1',
+                                                   'baseFeePerGas': '0x7'}},
+            {'jsonrpc': '2.0', 'id': 1, 'result': hex(8)},
+            {'jsonrpc': '2.0', 'id': 2, 'result': {'baseFeePerGas': ['0x7', '0x9'], 'reward': [['0x1'], ['0x3']]}},
+        ]
+
+
+class FakeWeb3:
+    def __init__(self) -> None:
+        self.provider = FakeProvider()
+
+
+def test_concurrent_reads_share_one_refresh():
+    web3 = FakeWeb3()
+    cache = BlockCache(web3)
+
+    async def main() -> list:
+        return await asyncio.gather(*[cache.get() for _ in range(10)])
+
+    states = asyncio.run(main())
+    assert web3.provider.batches == 1
+    assert all(state is states[0] for state in states)
+    assert (cache.misses, cache.hits) == (1, 9)
+    assert (states[0].gas_price, states[0].next_base_fee, states[0].priority_fee) == (8, 9, 3)
+
+
+def test_new_block_expires_the_cached_state():
+    web3 = FakeWeb3()
+    cache = BlockCache(web3)
+
+    async def main() -> None:
+        state = await cache.get()
+        await cache.get()
+        assert web3.provider.batches == 1
+        cache.observe_block(state.number)
+        await cache.get()
+        assert web3.provider.batches == 1
+        cache.observe_block(state.number + 1)
+        await cache.get()
+        assert web3.provider.batches == 2
+
+    asyncio.run(main())
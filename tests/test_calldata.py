@@ -0,0 +1,167 @@
+from types import SimpleNamespace
+import asyncio
+import json
+import os
+import random
+
+import pytest
+from eth_abi import decode
+from web3 import Web3
+
+from src.modules.swaps.tokens import tokens
+from src.modules.swaps.linea_swap.linea_swap import LineaSwap
+from src.modules.swaps.echodex.echodex import EchoDexSwap
+from src.modules.swaps.linea_swap.utils import transaction_data as linea_swap
+from src.modules.swaps.echodex.utils import transaction_data as echo_dex
+from src.modules.swaps.horizondex.utils import transaction_data as horizon_dex
+from src.modules.swaps.sync_swap.utils import transaction_data as sync_swap
+from src.utils.calldata import split_types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POOL = Web3.to_checksum_address('0x5ec5b1e9b1bd5198343abb6e55fb695d2f7bb308')
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+CASES = 100
+
+
+def contract(abi_name: str):
+    with open(os.path.join(ROOT, 'assets', 'abi', f'{abi_name}.json')) as f:
+        return Web3().eth.contract(abi=json.load(f))
+
+
+def values(rng: random.Random) -> dict:
+    amount, amount_out_min = (rng.choice([0, 1, 2 ** 256 - 1, rng.getrandbits(rng.randint(1, 256))])
+                              for _ in range(2))
+    return {
+        'to': Web3.to_checksum_address('0x' + rng.randbytes(20).hex()),
+        'amount': amount,
+        'amount_out_min': amount_out_min,
+        'amount_token_min': rng.getrandbits(128),
+        'amount_eth_min': rng.getrandbits(128),
+        'deadline': rng.randint(0, 2 ** 40),
+    }
+
+
+def cases(seed: int):
+    rng = random.Random(seed)
+    for _ in range(CASES):
+        yield values(rng)
+
+
+def test_split_types_keeps_tuples_together():
+    assert split_types(horizon_dex.SWAP_EXACT_INPUT_SINGLE) == [
+        '(address,address,uint24,address,uint256,uint256,uint256,uint160)'
+    ]
+    assert split_types(sync_swap.SWAP) == ['((address,bytes,address,bytes)[],address,uint256)[]', 'uint256', 'uint256']
+    assert split_types('f()') == []
+
+
+def test_linea_swap_templates_match_web3():
+    router = contract('linea_swap')
+    eth, busd, avax = tokens['ETH'], tokens['BUSD'], tokens['AVAX']
+    for v in cases(1):
+        data = linea_swap.swap_template('ETH', [eth, busd]).encode(**v)
+        assert '0x' + data.hex() == router.encodeABI('swapExactETHForTokens', [
+            v['amount_out_min'], [eth, busd], v['to'], v['deadline']])
+
+        data = linea_swap.swap_template('BUSD', [busd, eth]).encode(**v)
+        assert '0x' + data.hex() == router.encodeABI('swapExactTokensForETH', [
+            v['amount'], v['amount_out_min'], [busd, eth], v['to'], v['deadline']])
+
+        data = linea_swap.swap_template('BUSD', [busd, eth, avax]).encode(**v)
+        assert '0x' + data.hex() == router.encodeABI('swapExactTokensForTokens', [
+            v['amount'], v['amount_out_min'], [busd, eth, avax], v['to'], v['deadline']])
+
+        for signature, fn_name in ((linea_swap.ADD_LIQUIDITY_ETH, 'addLiquidityETH'),
+                                   (linea_swap.REMOVE_LIQUIDITY_ETH, 'removeLiquidityETH')):
+            data = linea_swap.liquidity_template(signature, busd).encode(**v)
+            assert '0x' + data.hex() == router.encodeABI(fn_name, [
+                busd, v['amount'], v['amount_token_min'], v['amount_eth_min'], v['to'], v['deadline']])
+
+
+def test_echo_dex_templates_match_web3():
+    router = contract('echo_dex')
+    eth, busd, avax = tokens['ETH'], tokens['BUSD'], tokens['AVAX']
+    for v in cases(4):
+        data = echo_dex.swap_template('ETH', [eth, busd]).encode(**v)
+        assert '0x' + data.hex() == router.encodeABI('swapExactETHForTokens', [
+            v['amount_out_min'], [eth, busd], v['to'], v['deadline']])
+
+        data = echo_dex.swap_template('BUSD', [busd, eth]).encode(**v)
+        assert '0x' + data.hex() == router.encodeABI('swapExactTokensForETH', [
+            v['amount'], v['amount_out_min'], [busd, eth], v['to'], v['deadline']])
+
+        data = echo_dex.swap_template('BUSD', [busd, eth, avax]).encode(**v)
+        assert '0x' + data.hex() == router.encodeABI('swapExactTokensForTokens', [
+            v['amount'], v['amount_out_min'], [busd, eth, avax], v['to'], v['deadline']])
+
+        for signature, fn_name in ((echo_dex.ADD_LIQUIDITY_ETH, 'addLiquidityETH'),
+                                   (echo_dex.REMOVE_LIQUIDITY_ETH, 'removeLiquidityETH')):
+            data = echo_dex.liquidity_template(signature, busd).encode(**v)
+            assert '0x' + data.hex() == router.encodeABI(fn_name, [
+                busd, v['amount'], v['amount_token_min'], v['amount_eth_min'], v['to'], v['deadline']])
+
+
+def test_horizon_dex_templates_match_web3():
+    router = contract('horizon_dex')
+    eth, busd = tokens['ETH'], tokens['BUSD']
+    for v in cases(2):
+        data = horizon_dex.swap_template('ETH', eth, busd).encode(
+            recipient=v['to'], deadline=v['deadline'], amount=v['amount'], amount_out_min=v['amount_out_min'])
+        assert '0x' + data.hex() == router.encodeABI('swapExactInputSingle', [
+            (eth, busd, 300, v['to'], v['deadline'], v['amount'], v['amount_out_min'], 0)])
+
+        data = horizon_dex.swap_template('BUSD', busd, eth).encode(
+            recipient=v['to'], deadline=v['deadline'], amount=v['amount'], amount_out_min=v['amount_out_min'])
+        assert '0x' + data.hex() == router.encodeABI('multicall', [[
+            router.encodeABI('swapExactInputSingle', [
+                (busd, eth, 300, ZERO_ADDRESS, v['deadline'], v['amount'], v['amount_out_min'], 0)]),
+            router.encodeABI('unwrapWeth', [v['amount_out_min'], v['to']]),
+        ]])
+
+
+def test_sync_swap_templates_match_web3():
+    router = contract('syncswap')
+    eth, busd = tokens['ETH'], tokens['BUSD']
+    for v in cases(3):
+        for from_token, token_in, from_address, to_address, withdraw_mode in (
+                ('ETH', ZERO_ADDRESS, eth, busd, 2),
+                ('BUSD', busd, busd, eth, 1)):
+            data = sync_swap.swap_template(from_token, from_address, to_address, POOL).encode(
+                recipient=v['to'], amount=v['amount'], amount_out_min=v['amount_out_min'], deadline=v['deadline'])
+            swap_data = '0x' + router.w3.codec.encode(['address', 'address', 'uint8'],
+                                                      [from_address, v['to'], withdraw_mode]).hex()
+            assert '0x' + data.hex() == router.encodeABI('swap', [
+                [([(POOL, swap_data, ZERO_ADDRESS, b'')], token_in, v['amount'])],
+                v['amount_out_min'], v['deadline']])
+
+
+@pytest.mark.parametrize('swap_class, module', [(LineaSwap, linea_swap), (EchoDexSwap, echo_dex)])
+def test_swap_is_built_on_the_quoted_path(monkeypatch, swap_class, module):
+    eth, busd, avax = tokens['ETH'], tokens['BUSD'], tokens['AVAX']
+    routes = iter([([busd, avax, eth], 10 ** 15), ([busd, eth], 2 * 10 ** 15)])
+
+    async def best_path(router: str, amount: int, token_in: str, token_out: str):
+        return next(routes)
+
+    async def next_nonce(web3, address: str) -> int:
+        return 0
+
+    monkeypatch.setattr(module, 'LOCAL_QUOTES', True)
+    monkeypatch.setattr(module.path_finder, 'best_path', best_path)
+    monkeypatch.setattr(module.nonces, 'next_nonce', next_nonce)
+    swap = swap_class('0x' + '11' * 32, 'BUSD', 'ETH', 1, 1, False)
+    router = SimpleNamespace(address=Web3.to_checksum_address('0x' + '22' * 20))
+    web3 = SimpleNamespace(provider=SimpleNamespace(chain_id=59144))
+
+    async def main():
+        amount_out = await swap.get_amount_out(router, 10 ** 18, busd, eth)
+        # A second quote would now find the direct pair; the swap must still follow the quoted route
+        return amount_out, await swap.create_swap_tx('BUSD', router, amount_out, busd, eth,
+                                                     swap.account_address, 10 ** 18, web3)
+
+    amount_out, tx = asyncio.run(main())
+    _, amount_out_min, path, _, _ = decode(['uint256', 'uint256', 'address[]', 'address', 'uint256'],
+                                           bytes.fromhex(tx['data'][10:]))
+    assert amount_out == 10 ** 15
+    assert [Web3.to_checksum_address(token) for token in path] == [busd, avax, eth]
+    assert amount_out_min == int(amount_out * (1 - module.SLIPPAGE))
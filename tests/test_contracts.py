@@ -0,0 +1,55 @@
+import asyncio
+import json
+import os
+
+from web3 import AsyncWeb3
+
+from src.utils import data
+from src.utils.data import (
+    ABI_FRAGMENTS,
+    load_contract,
+    load_abi,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOKEN = '0x7d43aabc515c356145049227cee54b608342c0ad'
+
+
+def fresh_caches(monkeypatch) -> None:
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(data, 'abi_registry', {})
+    monkeypatch.setattr(data, 'contract_cache', {})
+
+
+def test_abi_is_parsed_once_and_pruned(monkeypatch):
+    fresh_caches(monkeypatch)
+    loads = []
+    real_load = json.load
+    monkeypatch.setattr(data.json, 'load', lambda f: loads.append(f.name) or real_load(f))
+
+    async def main() -> tuple[list, list]:
+        return await load_abi('erc20'), await load_abi('erc20')
+
+    first, second = asyncio.run(main())
+    assert first is second
+    assert len(loads) == 1
+    assert sorted(entry['name'] for entry in first) == sorted(ABI_FRAGMENTS['erc20'])
+
+
+def test_contracts_are_reused_per_chain_and_address(monkeypatch):
+    fresh_caches(monkeypatch)
+    web3, other_web3 = AsyncWeb3(), AsyncWeb3()
+
+    async def main() -> list:
+        return [
+            await load_contract(TOKEN, web3, 'erc20'),
+            await load_contract(TOKEN.upper().replace('0X', '0x'), web3, 'erc20'),
+            await load_contract(TOKEN, other_web3, 'erc20'),
+            await load_contract(None, web3, 'erc20'),
+        ]
+
+    contract, same_contract, other_contract, missing = asyncio.run(main())
+    assert contract is same_contract
+    assert contract is not other_contract
+    assert contract.address == AsyncWeb3.to_checksum_address(TOKEN)
+    assert missing is None
@@ -0,0 +1,177 @@
+import asyncio
+from types import SimpleNamespace
+
+from eth_account._utils.typed_transactions import TypedTransaction
+from eth_account import Account
+from web3 import Web3
+
+from src.utils import data, executor
+from src.utils.allowances import (
+    APPROVAL_TOPIC,
+    AllowanceCache,
+)
+from src.utils.executor import (
+    MAX_APPROVAL,
+    TxExecutor,
+)
+from src.utils.nonce import NonceManager
+from src.utils.retry import RetryPolicy
+from src.utils.supervisor import PendingSupervisor
+
+TOKEN = '0x' + '22' * 20
+SPENDER = Web3.to_checksum_address('0x' + '33' * 20)
+ALLOWANCE_ERROR = ValueError('execution reverted: ERC20: transfer amount exceeds allowance')
+APPROVE_SELECTOR = bytes.fromhex('095ea7b3')
+
+
+class FakeEth:
+    def __init__(self, errors: list[Exception | None]) -> None:
+        self.account = Account
+        self.errors = errors
+        self.sent = []
+
+    async def get_transaction_count(self, address: str, block: str) -> int:
+        return 0
+
+    async def send_raw_transaction(self, raw_tx: bytes) -> bytes:
+        self.sent.append(TypedTransaction.from_bytes(raw_tx).as_dict())
+        error = self.errors.pop(0) if self.errors else None
+        if error is not None:
+            raise error
+        return Web3.keccak(raw_tx)
+
+
+class FakeFees:
+    async def quote(self, web3, tx: dict, gas_limit: int | None) -> SimpleNamespace:
+        return SimpleNamespace(fields=lambda: {'maxFeePerGas': 2 * 10 ** 9, 'maxPriorityFeePerGas': 10 ** 8,
+                                               'gas': 50000})
+
+    async def history(self, web3) -> SimpleNamespace:
+        return SimpleNamespace(fields=lambda: {'maxFeePerGas': 10 ** 9, 'maxPriorityFeePerGas': 10 ** 7})
+
+
+class FakeConfirm:
+    async def confirm(self, web3, tx: dict, tx_hash: str, resend) -> str:
+        return tx_hash
+
+
+def make_executor(monkeypatch, errors: list[Exception | None],
+                  allowance: int = 10 ** 18) -> tuple[TxExecutor, FakeEth, AllowanceCache]:
+    eth = FakeEth(errors)
+    web3 = SimpleNamespace(eth=eth, provider=SimpleNamespace(chain_id=59144), to_hex=Web3.to_hex,
+                           to_checksum_address=Web3.to_checksum_address)
+    account = Account.create()
+    cache = AllowanceCache('')
+    cache.set(account.address, TOKEN, SPENDER, allowance)
+    monkeypatch.setattr(executor, 'allowance_cache', cache)
+    monkeypatch.setattr(data, 'allowance_cache', cache)
+    monkeypatch.setattr(data, 'get_tracker', lambda web3: SimpleNamespace(track=lambda tx_hash: None))
+    tx_executor = TxExecutor(web3, account.key.hex(), fees=FakeFees(), gas=lambda web3, tx: 21000,
+                             nonce_manager=NonceManager(), confirm=FakeConfirm(), retry=RetryPolicy(base_delay=0))
+    return tx_executor, eth, cache
+
+
+def run(monkeypatch, errors: list[Exception | None]) -> tuple[str | None, FakeEth, list]:
+    tx_executor, eth, cache = make_executor(monkeypatch, errors)
+    approvals = []
+
+    async def approve(self, *args) -> None:
+        approvals.append(args)
+        cache.set(tx_executor.address, TOKEN, SPENDER, 10 ** 18)
+
+    async def rebuild() -> dict:
+        return {'to': SPENDER, 'value': 0, 'gas': 21000, 'chainId': 59144, 'data': '0x'}
+
+    monkeypatch.setattr(TxExecutor, 'approve', approve)
+    tx_hash = asyncio.run(tx_executor.execute(asyncio.run(rebuild()), rebuild, (TOKEN, SPENDER, 1)))
+    return tx_hash, eth, approvals
+
+
+def test_stale_allowance_is_recovered_once(monkeypatch):
+    tx_hash, eth, approvals = run(monkeypatch, [ALLOWANCE_ERROR, None])
+    assert tx_hash is not None
+    assert (len(eth.sent), len(approvals)) == (2, 1)
+
+
+def test_second_allowance_error_gives_up(monkeypatch):
+    tx_hash, eth, approvals = run(monkeypatch, [ALLOWANCE_ERROR] * 5)
+    assert tx_hash is None
+    assert (len(eth.sent), len(approvals)) == (2, 1)
+
+
+def test_underpriced_replacement_is_resent_on_the_same_nonce_with_higher_fees(monkeypatch):
+    tx_hash, eth, approvals = run(monkeypatch, [ValueError('replacement transaction underpriced'), None])
+    assert tx_hash is not None
+    first, second = eth.sent
+    assert second['nonce'] == first['nonce']
+    assert second['maxFeePerGas'] > first['maxFeePerGas']
+    assert second['maxPriorityFeePerGas'] > first['maxPriorityFeePerGas']
+
+
+def test_swap_is_sent_while_the_approve_is_still_pending(monkeypatch):
+    tx_executor, eth, cache = make_executor(monkeypatch, [], allowance=0)
+    events = []
+    mined = asyncio.Event()
+
+    async def confirm(web3, tx: dict, tx_hash: str, resend) -> str:
+        if tx['nonce'] == 0:
+            await mined.wait()
+            cache.observe_receipt(tx_hash, {'status': 1, 'from': tx_executor.address, 'logs': [{
+                'address': TOKEN,
+                'topics': [APPROVAL_TOPIC, '0x' + tx_executor.address[2:].rjust(64, '0'),
+                           '0x' + SPENDER[2:].rjust(64, '0')],
+                'data': hex(MAX_APPROVAL),
+            }]})
+        events.append(('confirmed', tx['nonce']))
+        return tx_hash
+
+    tx_executor.confirm = SimpleNamespace(confirm=confirm)
+
+    async def main() -> str:
+        approve_hash = await tx_executor.approve(TOKEN, SPENDER, 10)
+        events.append(('approve returned', len(eth.sent)))
+        swap = {'to': SPENDER, 'value': 0, 'chainId': 59144, 'data': '0x'}
+        swap_task = asyncio.create_task(tx_executor.execute(swap))
+        await asyncio.sleep(0.01)
+        events.append(('swap sent', len(eth.sent)))
+        mined.set()
+        await swap_task
+        await asyncio.gather(*tx_executor.confirming)
+        return approve_hash
+
+    approve_hash = asyncio.run(main())
+    assert approve_hash is not None
+    assert events[:3] == [('approve returned', 1), ('confirmed', 1), ('swap sent', 2)]
+    approve, swap = eth.sent
+    assert bytes(approve['data'])[:4] == APPROVE_SELECTOR
+    assert Web3.to_checksum_address(approve['to']) == Web3.to_checksum_address(TOKEN)
+    assert (approve['nonce'], swap['nonce']) == (0, 1)
+    assert cache.get(tx_executor.address, TOKEN, SPENDER) == MAX_APPROVAL
+
+
+def test_approve_is_skipped_when_the_allowance_covers_the_amount(monkeypatch):
+    tx_executor, eth, cache = make_executor(monkeypatch, [], allowance=10)
+    assert asyncio.run(tx_executor.approve(TOKEN, SPENDER, 10)) is None
+    assert eth.sent == []
+
+
+def test_underpriced_fee_bumps_compound():
+    supervisor = PendingSupervisor(fees=FakeFees())
+    tx = {'nonce': 3, 'maxFeePerGas': 2 * 10 ** 9, 'maxPriorityFeePerGas': 10 ** 8}
+    resent = []
+
+    async def resend(replacement: dict) -> str:
+        resent.append(replacement)
+        raise ValueError('replacement transaction underpriced')
+
+    async def main() -> dict:
+        bumped = tx
+        for _ in range(2):
+            bumped, new_hash = await supervisor.bump(None, bumped, '0x01', 5, resend)
+            assert new_hash is None
+        return bumped
+
+    bumped = asyncio.run(main())
+    assert resent[1]['maxFeePerGas'] > resent[0]['maxFeePerGas'] > tx['maxFeePerGas']
+    assert bumped['maxFeePerGas'] == resent[1]['maxFeePerGas']
+    assert bumped['nonce'] == tx['nonce']
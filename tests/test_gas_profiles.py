@@ -0,0 +1,50 @@
+import os
+from types import SimpleNamespace
+
+from src.utils.gas_profiles import (
+    MIN_SAMPLES,
+    GAS_MARGIN,
+    GasProfiles,
+)
+from src.modules.swaps.linea_swap.utils.transaction_data import swap_template
+from src.modules.swaps.tokens import tokens
+
+ROUTER = '0x3228d205a96409a07a44d39916b6ea7b765d61f4'
+TEMPLATE = '59144:linea_swap:0x3228d205a96409a07a44d39916b6ea7b765d61f4:0x7ff36ab5:ETH>BUSD:458'
+
+
+def observe(profiles: GasProfiles, tx_hash: str, gas_used: int) -> None:
+    profiles.track(tx_hash, TEMPLATE)
+    profiles.observe_receipt(tx_hash, {'status': 1, 'gasUsed': gas_used})
+
+
+def test_receipts_are_written_once_per_flush(tmp_path, monkeypatch):
+    path = str(tmp_path / 'gas_profiles.json')
+    profiles = GasProfiles(path)
+    writes = []
+    real_replace = os.replace
+    monkeypatch.setattr(os, 'replace', lambda src, dst: writes.append(dst) or real_replace(src, dst))
+
+    for i in range(MIN_SAMPLES):
+        observe(profiles, f'0x{i:064x}', 100000 + i)
+    assert not os.path.exists(path)
+    profiles.flush()
+    profiles.flush()
+    assert writes == [path]
+    assert os.listdir(tmp_path) == ['gas_profiles.json']
+
+    reloaded = GasProfiles(path)
+    assert reloaded.limit(TEMPLATE) == int((100000 + MIN_SAMPLES - 1) * GAS_MARGIN)
+
+
+def test_token_pairs_through_one_router_get_their_own_profile():
+    web3 = SimpleNamespace(provider=SimpleNamespace(chain_id=59144))
+    to = '0x' + '11' * 20
+    templates = [
+        GasProfiles.template(web3, {'to': ROUTER, 'data': '0x' + swap_template(token, [tokens[token], tokens['ETH']])
+                                    .encode(amount=1, amount_out_min=2, to=to, deadline=3).hex()})
+        for token in ('BUSD', 'AVAX')
+    ]
+    assert templates[0] != templates[1]
+    assert templates[0].endswith(':BUSD>ETH:522')
+    assert templates[1].endswith(':AVAX>ETH:522')
@@ -0,0 +1,57 @@
+import asyncio
+
+from eth_abi import encode, decode
+
+from src.utils import multicall as multicall_module
+from src.utils.multicall import (
+    AGGREGATE3,
+    MULTICALL3,
+    multicall,
+)
+
+
+class FakeProvider:
+    def __init__(self, fail: set[int]) -> None:
+        self.fail = fail
+        self.batches = []
+
+    async def make_batch_request(self, calls: list[tuple[str, list]]) -> list[dict]:
+        self.batches.append(calls)
+        responses = []
+        for i, (_, (call, _)) in enumerate(calls):
+            assert call['to'] == MULTICALL3
+            data = bytes.fromhex(call['data'][2:])
+            assert data[:4] == AGGREGATE3
+            results = [(int.from_bytes(payload, 'big') not in self.fail, payload)
+                       for _, _, payload in decode(['(address,bool,bytes)[]'], data[4:])[0]]
+            responses.append({'jsonrpc': '2.0', 'id': i,
+                              'result': '0x' + encode(['(bool,bytes)[]'], [results]).hex()})
+        return responses
+
+
+class FakeWeb3:
+    def __init__(self, provider: FakeProvider) -> None:
+        self.provider = provider
+
+
+def calls(count: int) -> list[tuple[str, bytes]]:
+    return [('0x' + '11' * 20, i.to_bytes(32, 'big')) for i in range(count)]
+
+
+def test_failed_calls_come_back_as_none():
+    web3 = FakeWeb3(FakeProvider(fail={1, 3}))
+
+    values = asyncio.run(multicall(web3, calls(5)))
+
+    assert [None if value is None else int.from_bytes(value, 'big') for value in values] == [0, None, 2, None, 4]
+
+
+def test_results_keep_call_order_across_chunks_and_batches(monkeypatch):
+    monkeypatch.setattr(multicall_module, 'CALLS_PER_MULTICALL', 3)
+    monkeypatch.setattr(multicall_module, 'MULTICALLS_PER_BATCH', 2)
+    provider = FakeProvider(fail=set())
+
+    values = asyncio.run(multicall(FakeWeb3(provider), calls(11)))
+
+    assert [int.from_bytes(value, 'big') for value in values] == list(range(11))
+    assert [len(batch) for batch in provider.batches] == [2, 2]
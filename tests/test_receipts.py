@@ -0,0 +1,38 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.utils.receipts import ReceiptTracker
+from src.utils.rpc import (
+    current_module,
+    track_module,
+)
+
+TX_HASH = '0x' + 'ab' * 32
+
+
+class FakeProvider:
+    def __init__(self) -> None:
+        self.modules = []
+
+    async def make_batch_request(self, calls: list[tuple[str, list]]) -> list[dict]:
+        self.modules.append(current_module.get())
+        return [{'jsonrpc': '2.0', 'id': i, 'result': {'transactionHash': tx_hash, 'status': '0x1'}}
+                for i, (_, (tx_hash,)) in enumerate(calls)]
+
+
+class FakeEth:
+    @property
+    async def block_number(self) -> int:
+        return 1
+
+
+def test_polls_are_not_attributed_to_the_module_that_started_the_tracker():
+    provider = FakeProvider()
+    tracker = ReceiptTracker(SimpleNamespace(provider=provider, eth=FakeEth()), poll_interval=0)
+
+    async def swap() -> dict:
+        return await tracker.track(TX_HASH)
+
+    receipt = asyncio.run(track_module('linea_swap', swap()))
+    assert receipt['status'] == 1
+    assert provider.modules == ['receipts']
@@ -0,0 +1,56 @@
+from asyncio import TimeoutError
+
+import pytest
+from web3.exceptions import ContractLogicError
+from aiohttp import ClientError
+
+from src.utils.nonce import is_nonce_error
+from src.utils.retry import (
+    ERROR_CLASSES,
+    RetryPolicy,
+    classify,
+    ALLOWANCE,
+    TRANSIENT,
+    UNDERPRICED,
+    UNKNOWN,
+    REVERT,
+    NONCE,
+)
+
+
+@pytest.mark.parametrize('error, fragment', [
+    (error, fragment) for error, fragments in ERROR_CLASSES for fragment in fragments
+])
+def test_every_fragment_is_classified_as_its_class(error, fragment):
+    assert classify(ValueError({'code': -32000, 'message': fragment.upper()})) == error
+
+
+@pytest.mark.parametrize('message, error', [
+    ('replacement transaction underpriced', UNDERPRICED),
+    ('replacement underpriced', UNDERPRICED),
+    ('nonce too low: next nonce 7, tx nonce 6', NONCE),
+    ('execution reverted: ERC20: transfer amount exceeds allowance', ALLOWANCE),
+    ('execution reverted: UniswapV2Router: EXPIRED', REVERT),
+    ('something unexpected', UNKNOWN),
+])
+def test_node_messages(message, error):
+    assert classify(ValueError(message)) == error
+
+
+def test_exception_types():
+    assert classify(ContractLogicError('execution reverted')) == REVERT
+    assert classify(TimeoutError()) == TRANSIENT
+    assert classify(ClientError()) == TRANSIENT
+    assert classify(ConnectionError()) == TRANSIENT
+
+
+def test_replacement_underpriced_does_not_resync_the_nonce():
+    assert not is_nonce_error(ValueError('replacement transaction underpriced'))
+    assert is_nonce_error(ValueError('nonce too low'))
+
+
+def test_underpriced_is_retried_immediately_until_attempts_run_out():
+    policy = RetryPolicy(attempts=3)
+    assert policy.delay(UNDERPRICED, 1) == 0.0
+    assert policy.delay(UNDERPRICED, 3) is None
+    assert policy.delay(REVERT, 1) is None
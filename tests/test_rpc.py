@@ -0,0 +1,183 @@
+import asyncio
+import json
+
+from src.utils.rpc import (
+    PooledHTTPProvider,
+    EndpointPool,
+    round_trip_stats,
+    send_listeners,
+    batch_request,
+)
+
+
+class FakePool:
+    def __init__(self, respond) -> None:
+        self.respond = respond
+        self.posts = []
+
+    async def post(self, endpoint_uri: str, data: bytes, headers: dict) -> bytes:
+        request = json.loads(data)
+        self.posts.append((endpoint_uri, request))
+        return json.dumps(self.respond(endpoint_uri, request)).encode()
+
+
+def result_for(request: dict) -> dict:
+    return {'jsonrpc': '2.0', 'id': request['id'], 'result': request['method']}
+
+
+def provider(respond, uris=('http://a/',), chain_id=59144) -> tuple[PooledHTTPProvider, FakePool]:
+    pool = FakePool(respond)
+    return PooledHTTPProvider(EndpointPool(list(uris)), pool, chain_id=chain_id), pool
+
+
+def test_chain_id_is_answered_locally():
+    rpc, pool = provider(lambda uri, request: result_for(request))
+    before = sum(round_trip_stats.round_trips.values())
+
+    response = asyncio.run(rpc.make_request('eth_chainId', []))
+
+    assert response['result'] == hex(59144)
+    assert pool.posts == []
+    assert sum(round_trip_stats.round_trips.values()) == before
+
+
+def test_chain_id_goes_to_the_node_when_unknown():
+    rpc, pool = provider(lambda uri, request: result_for(request), chain_id=None)
+
+    asyncio.run(rpc.make_request('eth_chainId', []))
+
+    assert [request['method'] for _, request in pool.posts] == ['eth_chainId']
+
+
+class DelayedPool(FakePool):
+    def __init__(self, respond, delays: dict[str, float]) -> None:
+        super().__init__(respond)
+        self.delays = delays
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def post(self, endpoint_uri: str, data: bytes, headers: dict) -> bytes:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(endpoint_uri, 0.0))
+            return await super().post(endpoint_uri, data, headers)
+        finally:
+            self.in_flight -= 1
+
+
+def test_concurrent_requests_are_in_flight_together():
+    pool = DelayedPool(lambda uri, request: result_for(request), {'http://a/': 0.05})
+    rpc = PooledHTTPProvider(EndpointPool(['http://a/']), pool, chain_id=59144)
+
+    async def run():
+        return await asyncio.gather(*[rpc.make_request('eth_getBalance', ['0x' + '11' * 20, 'latest'])
+                                      for _ in range(50)])
+
+    responses = asyncio.run(run())
+
+    assert len(responses) == 50
+    assert pool.max_in_flight == 50
+
+
+def test_failover_moves_to_the_next_endpoint():
+    def respond(uri, request):
+        if uri == 'http://a/':
+            raise ConnectionError('endpoint down')
+        return result_for(request)
+
+    rpc, pool = provider(respond, uris=('http://a/', 'http://b/'))
+
+    response = asyncio.run(rpc.make_request('eth_blockNumber', []))
+
+    assert response['result'] == 'eth_blockNumber'
+    assert [uri for uri, _ in pool.posts] == ['http://a/', 'http://b/']
+    assert rpc.endpoints.failovers == 1
+    assert [endpoint.uri for endpoint in rpc.endpoints.ranked()] == ['http://b/', 'http://a/']
+
+
+def test_slow_read_is_hedged_to_the_second_endpoint():
+    pool = DelayedPool(lambda uri, request: result_for(request), {'http://a/': 0.5})
+    endpoints = EndpointPool(['http://a/', 'http://b/'])
+    rpc = PooledHTTPProvider(endpoints, pool, hedge_reads=True, chain_id=59144)
+    for endpoint in endpoints.endpoints:
+        for _ in range(5):
+            endpoint.record_success(0.01)
+
+    response = asyncio.run(rpc.make_request('eth_call', [{'to': '0x' + '11' * 20}, 'latest']))
+
+    assert response['result'] == 'eth_call'
+    assert endpoints.hedged == 1
+    assert 'http://b/' in [uri for uri, _ in pool.posts]
+
+
+def test_batch_responses_follow_request_order():
+    def respond(uri, requests):
+        return list(reversed([result_for(request) for request in requests]))
+
+    rpc, _ = provider(respond)
+    calls = [('eth_blockNumber', []), ('eth_gasPrice', []), ('eth_getTransactionCount', ['0x' + '11' * 20])]
+
+    responses = asyncio.run(rpc.make_batch_request(calls))
+
+    assert [response['result'] for response in responses] == [method for method, _ in calls]
+
+
+def test_batch_request_raises_on_an_error_response():
+    def respond(uri, requests):
+        return [result_for(requests[0]), {'jsonrpc': '2.0', 'id': requests[1]['id'],
+                                          'error': {'code': 3, 'message': 'execution reverted'}}]
+
+    rpc, _ = provider(respond)
+    web3 = type('Web3', (), {'provider': rpc})()
+
+    try:
+        asyncio.run(batch_request(web3, [('eth_gasPrice', []), ('eth_estimateGas', [{}])]))
+    except ValueError as ex:
+        assert 'execution reverted' in str(ex)
+    else:
+        raise AssertionError('batch_request did not raise')
+
+
+def test_batch_answered_with_a_single_error_raises_it():
+    rpc, _ = provider(lambda uri, requests: {'jsonrpc': '2.0', 'id': None,
+                                             'error': {'code': -32005, 'message': 'rate limit exceeded'}})
+
+    try:
+        asyncio.run(rpc.make_batch_request([('eth_gasPrice', []), ('eth_blockNumber', [])]))
+    except ValueError as ex:
+        assert 'rate limit exceeded' in str(ex)
+    else:
+        raise AssertionError('make_batch_request did not raise')
+
+
+def test_batch_response_missing_an_id_raises():
+    rpc, _ = provider(lambda uri, requests: [result_for(requests[0])])
+
+    try:
+        asyncio.run(rpc.make_batch_request([('eth_gasPrice', []), ('eth_blockNumber', [])]))
+    except ValueError as ex:
+        assert 'no answer' in str(ex)
+    else:
+        raise AssertionError('make_batch_request did not raise')
+
+
+def test_send_listeners_hear_only_accepted_transactions():
+    def respond(uri, request):
+        if uri == 'http://a/':
+            raise ConnectionError('endpoint down')
+        if request['params'] == ['0x02']:
+            return {'jsonrpc': '2.0', 'id': request['id'], 'error': {'code': -32000, 'message': 'nonce too low'}}
+        return result_for(request)
+
+    rpc, pool = provider(respond, uris=('http://a/', 'http://b/'))
+    heard = []
+    send_listeners.append(lambda chain_id, raw_tx: heard.append(raw_tx))
+    try:
+        asyncio.run(rpc.make_request('eth_sendRawTransaction', ['0x01']))
+        asyncio.run(rpc.make_request('eth_sendRawTransaction', ['0x02']))
+    finally:
+        send_listeners.pop()
+
+    assert [uri for uri, _ in pool.posts] == ['http://a/', 'http://b/', 'http://b/']
+    assert heard == ['0x01']
@@ -0,0 +1,57 @@
+import asyncio
+
+from eth_account import Account
+
+from src.utils import scheduler
+from src.utils.scheduler import WalletScheduler
+
+
+class FakeJournal:
+    def __init__(self) -> None:
+        self.records = []
+
+    async def reconcile(self, wallet: str, module: str) -> bool:
+        return False
+
+    def start_module(self, wallet: str, module: str) -> None:
+        self.records.append((module, 'started'))
+
+    def finish_module(self, wallet: str, module: str) -> None:
+        self.records.append((module, 'done'))
+
+    def finish_cycle(self, wallet: str) -> None:
+        self.records.append(('', 'cycle'))
+
+
+def run_one_cycle(monkeypatch, handlers: dict) -> list:
+    monkeypatch.setattr(scheduler, 'module_handlers', handlers)
+    journal = FakeJournal()
+    wallets = WalletScheduler([Account.create().key.hex()], list(handlers), None, 1, 0, 0, False, True, journal)
+
+    async def main() -> None:
+        task = asyncio.create_task(wallets.run())
+        while ('', 'cycle') not in journal.records:
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(main())
+    return journal.records[:journal.records.index(('', 'cycle')) + 1]
+
+
+def test_only_completed_modules_are_journaled_as_done(monkeypatch):
+    async def completed(private_key, pbar):
+        return True
+
+    async def failed(private_key, pbar):
+        return False
+
+    async def raised(private_key, pbar):
+        raise ValueError('execution reverted')
+
+    records = run_one_cycle(monkeypatch, {'ok': completed, 'failed': failed, 'raised': raised})
+    assert records == [
+        ('ok', 'started'), ('ok', 'done'),
+        ('failed', 'started'),
+        ('raised', 'started'),
+        ('', 'cycle'),
+    ]
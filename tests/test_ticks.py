@@ -0,0 +1,96 @@
+import asyncio
+from types import SimpleNamespace
+
+from eth_abi import encode, decode
+
+from src.modules.swaps.horizondex.horizondex import HorizonDexSwap
+from src.utils import ticks
+from src.utils.ticks import (
+    GET_LIQUIDITY_STATE,
+    GET_POOL_STATE,
+    TICKS,
+    TickCache,
+    Pool,
+)
+
+POOL = '0x5ec5b1e9b1bd5198343abb6e55fb695d2f7bb308'
+TICK_DISTANCE = 8
+
+
+class FakePool:
+    def __init__(self) -> None:
+        self.tick = 0
+        self.base_l = 10 ** 18
+        self.initialised = {-80: 10 ** 17, 80: -10 ** 17}
+        self.tick_reads = 0
+
+    async def multicall(self, web3, calls: list[tuple[str, bytes]]) -> list[bytes]:
+        values = []
+        for _, data in calls:
+            if data == GET_POOL_STATE:
+                values.append(encode(['uint160', 'int24', 'int24', 'bool'],
+                                     [ticks.sqrt_price_at_tick(self.tick), self.tick, 0, False]))
+            elif data == GET_LIQUIDITY_STATE:
+                values.append(encode(['uint128', 'uint128', 'uint128'], [self.base_l, 0, 0]))
+            else:
+                assert data[:4] == TICKS
+                self.tick_reads += 1
+                tick = decode(['int24'], data[4:])[0]
+                net = self.initialised.get(tick, 0)
+                values.append(encode(['uint128', 'int128'], [abs(net), net]))
+        return values
+
+
+def cache_with(monkeypatch, fake: FakePool) -> TickCache:
+    monkeypatch.setattr(ticks, 'multicall', fake.multicall)
+    cache = TickCache(SimpleNamespace(w3=None), POOL, ticks.HORIZON_FEE)
+    pool = Pool(POOL, '0x' + '11' * 20, '0x' + '22' * 20, ticks.HORIZON_FEE, TICK_DISTANCE)
+    cache.pools[(pool.token0, pool.token1)] = pool
+    cache.discovered = True
+    return cache
+
+
+def test_ticks_are_read_only_when_the_window_may_be_stale(monkeypatch):
+    fake = FakePool()
+    cache = cache_with(monkeypatch, fake)
+    window_size = 2 * ticks.TICK_WINDOW + 1
+
+    async def main() -> None:
+        await cache.refresh(1)
+        assert fake.tick_reads == window_size
+
+        fake.tick = 40
+        await cache.refresh(2)
+        assert fake.tick_reads == window_size
+
+        fake.tick, fake.base_l = 90, fake.base_l - 10 ** 17
+        await cache.refresh(3)
+        assert fake.tick_reads == 2 * window_size
+
+        fake.base_l += 10 ** 16
+        await cache.refresh(4)
+        assert fake.tick_reads == 3 * window_size
+
+        fake.tick = TICK_DISTANCE * ticks.TICK_WINDOW
+        fake.initialised = {}
+        await cache.refresh(5)
+        assert fake.tick_reads == 4 * window_size
+
+    asyncio.run(main())
+    assert cache.window_reads == 4
+    assert cache.refreshes == 5
+
+
+def test_horizondex_swap_is_skipped_without_a_pool_quote(monkeypatch):
+    async def no_quote(amount_in: int, token_in: str, token_out: str) -> None:
+        return None
+
+    monkeypatch.setattr(ticks.tick_cache, 'quote', no_quote)
+    swap = HorizonDexSwap('0x' + '11' * 32, 'BUSD', 'ETH', 1, 1, False)
+
+    async def never(*args, **kwargs) -> None:
+        raise AssertionError('a swap was built without a HorizonDex quote')
+
+    monkeypatch.setattr(swap, 'create_swap_tx', never)
+    monkeypatch.setattr(swap.executor, 'approve', never)
+    assert asyncio.run(swap.swap_amount(10 ** 18)) is None